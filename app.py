@@ -1,12 +1,10 @@
 import os
 import sys
+import time
 import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-from tensorflow.keras.models import load_model
 
 # --- Setup ---
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
@@ -14,23 +12,17 @@ sys.path.append(PROJECT_ROOT)
 
 # (Try/Except block to ensure code runs even if local modules are missing during copy-paste testing)
 try:
-    from src.data_utils import load_data, filter_store_product
-    from src.preprocessing import scale_series, create_sequences
-    from src.regional_insights import (
-        region_store_summary, region_profitability_analysis,
-        region_growth_analysis, region_demand_volatility, region_stock_efficiency
+    from src.data_utils import load_data, file_version
+    from src.pricing_engine import suggest_optimal_price
+    from src.what_if_simulation import simulate_price_change, simulate_price_change_model
+    from src.dashboard_snapshot import (
+        load_dashboard_snapshot, snapshot_view, global_analytics, summary_section,
+        forecast_section, model_performance_section, seasonality_section,
+        pricing_section, regional_section, demand_segment, sku_context, view_recommendations, segment_z
     )
-    from src.seasonality_analysis import (
-        monthly_seasonal_pattern, seasonality_strength,
-        category_decomposition, long_cycle_trend
-    )
-    from src.promotion_analysis import promotion_uplift_analysis, holiday_impact_analysis
-    from src.pricing_engine import estimate_price_elasticity, suggest_optimal_price, competitor_price_alert
-    from src.recommendation_engine import generate_recommendations
-    from src.category_analysis import category_profitability
-    from src.demand_segmentation import product_volatility_classification
-    from src.model_comparison import compare_models
-    from src.what_if_simulation import simulate_price_change
+    from src.background_tasks import BackgroundTaskPool
+    from src.forecast_cache import get_forecast_cache, forecast_key
+    from src.instrumentation import METRICS, peak_memory_mb, timer
 except ImportError:
     pass
 
@@ -272,27 +264,123 @@ def show_landing_page():
 
 
 # =========================================================
-# 5. VIEW: DASHBOARD (Your specific latest code)
+# 5. DATA & COMPUTE CACHE
 # =========================================================
-def show_dashboard():
-    # --- Load Data & Models ---
-    DATA_PATH  = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
-    MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+# Keys are (store, product, file versions) — never the DataFrame itself,
+# so cache lookups stay cheap and entries expire when the files change.
+DATA_PATH     = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+MODEL_PATH    = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+EXOG_MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_exog_model.keras")
+SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, "outputs", "snapshot", "dashboard_snapshot.pkl")
+
+@st.cache_data(show_spinner=False)
+def load_app_data(path, data_ver): return load_data(path)
+
+@st.cache_resource(show_spinner=False)
+def load_app_model(path, model_ver):
+    # TensorFlow takes seconds to import; only live (non-snapshot) views need it
+    from src.model_registry import load_model_cached
+    return load_model_cached(path)
+
+@st.cache_resource(show_spinner=False)
+def load_app_snapshot(path, snapshot_ver): return load_dashboard_snapshot(path)
+
+@st.cache_data(show_spinner=False)
+def cached_catalog(data_ver):
+    df = load_app_data(DATA_PATH, data_ver)
+    return {store: list(df[df["Store ID"] == store]["Product ID"].unique()) for store in df["Store ID"].unique()}
+
+@st.cache_data(show_spinner=False)
+def cached_analytics(data_ver):
+    return global_analytics(load_app_data(DATA_PATH, data_ver))
+
+# One pool per server process: forecasts and model comparisons run off the
+# script thread, and identical jobs from different sessions are shared.
+@st.cache_resource(show_spinner=False)
+def get_task_pool(): return BackgroundTaskPool(max_workers=4)
+
+def start_job(key, fn, *args):
+    """Submit fn(df, model, *args) unless the same job is already running, done or failed."""
+    pool = get_task_pool()
+    if pool.pending(key) or pool.result_if_ready(key) is not None or pool.error(key) is not None:
+        return
+    pool.submit(key, fn, load_app_data(DATA_PATH, file_version(DATA_PATH)),
+                load_app_model(MODEL_PATH, file_version(MODEL_PATH)), *args)
+
+def forecast_job(df, model, store_id, product_id, forecast_days, key):
+    """Compute a forecast and publish it to the shared forecast cache."""
+    result = forecast_section(df, model, store_id, product_id, forecast_days)
+    get_forecast_cache().put(key, result)
+    return result
+
+@st.cache_data(show_spinner=False)
+def cached_segment(store_id, product_id, data_ver):
+    return sku_context(cached_analytics(data_ver), store_id, product_id)["segment"]
+
+@st.cache_data(show_spinner=False)
+def cached_summary(store_id, product_id, data_ver):
+    return summary_section(load_app_data(DATA_PATH, data_ver), store_id, product_id)
+
+@st.cache_data(show_spinner=False)
+def cached_seasonality(store_id, product_id, data_ver):
+    return seasonality_section(load_app_data(DATA_PATH, data_ver), store_id, product_id,
+                               cached_analytics(data_ver)["rollup"])
+
+@st.cache_data(show_spinner=False)
+def cached_pricing(store_id, product_id, data_ver):
+    return pricing_section(load_app_data(DATA_PATH, data_ver), store_id, product_id)
+
+@st.cache_data(show_spinner=False)
+def cached_model_what_if(store_id, product_id, price_change, data_ver, exog_ver):
+    # price change through the exogenous-feature LSTM (notebook 23 trains it)
+    model = load_app_model(EXOG_MODEL_PATH, exog_ver)
+    return simulate_price_change_model(model, load_app_data(DATA_PATH, data_ver),
+                                       store_id, product_id, price_change)
+
+@st.cache_data(show_spinner=False)
+def cached_regional(product_id, data_ver):
+    return regional_section(load_app_data(DATA_PATH, data_ver), product_id, cached_analytics(data_ver)["rollup"])
+
+@st.cache_data(show_spinner=False)
+def cached_recommendations(store_id, product_id, forecast, residual_std, current_inventory, data_ver):
+    analytics = cached_analytics(data_ver)
+    view = {"forecast": np.array(forecast), "residual_std": residual_std}
+    view.update(cached_seasonality(store_id, product_id, data_ver))
+    view.update(cached_pricing(store_id, product_id, data_ver))
+    view["demand_segment"] = demand_segment(analytics["segmentation"], product_id)
+    view.update(sku_context(analytics, store_id, product_id))
+    return view_recommendations(view, analytics, current_inventory)
 
-    @st.cache_data
-    def load_app_data(path): return load_data(path)
 
-    @st.cache_resource
-    def load_app_model(path): return load_model(path)
+# =========================================================
+# 6. VIEW: DASHBOARD (Your specific latest code)
+# =========================================================
+def show_dashboard():
+    import plotly.graph_objects as go
 
-    # Simple loader
-    with st.spinner("🔄 Initializing AI Engine..."):
-        try:
-            df = load_app_data(DATA_PATH)
-            model = load_app_model(MODEL_PATH)
-        except Exception as e:
-            st.error(f"System Error: Could not load data resources. {e}")
-            return
+    # --- Load Data & Models ---
+    data_ver  = file_version(DATA_PATH)
+    model_ver = file_version(MODEL_PATH)
+
+    def load_live_resources():
+        with st.spinner("🔄 Initializing AI Engine..."):
+            try:
+                load_app_data(DATA_PATH, data_ver)
+                load_app_model(MODEL_PATH, model_ver)
+                return True
+            except Exception as e:
+                st.error(f"System Error: Could not load data resources. {e}")
+                return False
+
+    # Snapshot mode skips loading the CSV and the model entirely
+    snapshot = load_app_snapshot(SNAPSHOT_PATH, file_version(SNAPSHOT_PATH))
+
+    if snapshot is not None:
+        catalog = snapshot["stores"]
+    elif load_live_resources():
+        catalog = cached_catalog(data_ver)
+    else:
+        return
 
     # --- Dashboard Banner (Hero) ---
     st.markdown(f"""
@@ -322,11 +410,11 @@ def show_dashboard():
 
     with cc1:
         st.markdown('<span class="ctrl-label">🏪 Select Store</span>', unsafe_allow_html=True)
-        store_id = st.selectbox("Store", df["Store ID"].unique(), label_visibility="collapsed", key="store")
+        store_id = st.selectbox("Store", list(catalog), label_visibility="collapsed", key="store")
 
     with cc2:
         st.markdown('<span class="ctrl-label">📦 Select Product</span>', unsafe_allow_html=True)
-        products = df[df["Store ID"] == store_id]["Product ID"].unique()
+        products = catalog[store_id]
         product_id = st.selectbox("Product", products, label_visibility="collapsed", key="product")
 
     with cc3:
@@ -355,19 +443,41 @@ def show_dashboard():
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # Filter Data
-    ts_df = filter_store_product(df, store_id, product_id)
+    # --- Resolve View (snapshot lookup, live computation as fallback) ---
+    view = snapshot_view(snapshot, store_id, product_id, forecast_days, current_inventory) if snapshot is not None else None
+
+    if view is None and snapshot is not None and not load_live_resources():
+        return
+
+    # --- Background Jobs (live mode) ---
+    # Forecasts go through the process-wide LRU cache (shared with the batch
+    # pipeline); the pool only deduplicates jobs that are still running.
+    pool      = get_task_pool()
+    cache     = get_forecast_cache(MODEL_PATH, DATA_PATH)
+    cache_key = forecast_key(store_id, product_id, forecast_days, MODEL_PATH, DATA_PATH)
+    fc_key    = ("forecast",) + cache_key
+    perf_key  = ("model_performance", store_id, product_id, data_ver, model_ver)
+    fc        = view
+
+    if view is None:
+        if not pool.pending(fc_key):
+            fc = cache.get(cache_key) or pool.result_if_ready(fc_key)
+        if fc is None:
+            start_job(fc_key, forecast_job, store_id, product_id, forecast_days, cache_key)
+        start_job(perf_key, model_performance_section, store_id, product_id)
+
+    summary = view or cached_summary(store_id, product_id, data_ver)
 
     # --- Executive Dashboard ---
     st.markdown('''<div class="sec-hdr"><span class="sec-icon">📊</span><h2 class="sec-title">Executive Dashboard</h2></div>''', unsafe_allow_html=True)
 
-    total_revenue  = (ts_df["Units Sold"] * ts_df["Price"] * (1 - ts_df["Discount"]/100)).sum()
-    estimated_cost = (ts_df["Units Sold"] * ts_df["Price"] * 0.6).sum()
-    total_profit   = total_revenue - estimated_cost
-    profit_margin  = (total_profit / total_revenue * 100) if total_revenue else 0
-    overall_growth = region_growth_analysis(ts_df)["Growth Rate %"].mean()
-    overall_vol    = ts_df["Units Sold"].std()
-    overall_eff    = ts_df["Units Sold"].sum() / ts_df["Inventory Level"].sum()
+    kpis           = summary["kpis"]
+    total_revenue  = kpis["Revenue"]
+    total_profit   = kpis["Profit"]
+    profit_margin  = kpis["Margin %"]
+    overall_growth = kpis["Growth %"]
+    overall_vol    = kpis["Volatility"]
+    overall_eff    = kpis["Efficiency"]
 
     k1,k2,k3,k4,k5,k6 = st.columns(6)
     k1.metric("💰 Revenue",    f"₹{total_revenue/1000:.0f}K", delta=f"{overall_growth:.1f}%")
@@ -380,78 +490,73 @@ def show_dashboard():
     # --- AI Forecasting ---
     st.markdown('''<div class="sec-hdr"><span class="sec-icon">🔮</span><h2 class="sec-title">AI Forecasting Engine</h2></div>''', unsafe_allow_html=True)
 
-    WINDOW = 30
-    demand         = ts_df["Units Sold"].values.reshape(-1, 1)
-    scaled, scaler = scale_series(demand)
-    seq            = scaled[-WINDOW:].copy()
-    preds          = []
-
-    prog = st.progress(0); stat = st.empty()
-    for i in range(forecast_days):
-        p = model.predict(seq.reshape(1, WINDOW, 1), verbose=0)
-        preds.append(p[0][0])
-        seq = np.append(seq[1:], p)
-        prog.progress((i+1)/forecast_days)
-        stat.text(f"Forecasting day {i+1}/{forecast_days}…")
-    prog.empty(); stat.empty()
-
-    preds      = np.array(preds).reshape(-1, 1)
-    fut_demand = scaler.inverse_transform(preds)
-    fc_total   = np.sum(fut_demand)
-
-    X, y     = create_sequences(scaled, WINDOW)
-    yps      = model.predict(X[-50:], verbose=0)
-    yp       = scaler.inverse_transform(yps)
-    ya       = scaler.inverse_transform(y[-50:])
-    res_std  = np.std(ya - yp)
-    safety   = 1.96 * res_std
-    ci_up    = fut_demand.flatten() + 1.96 * res_std
-    ci_dn    = fut_demand.flatten() - 1.96 * res_std
-    d_hist   = pd.date_range(end=pd.Timestamp.now(), periods=60, freq='D')
-    d_fut    = pd.date_range(start=pd.Timestamp.now()+pd.Timedelta(days=1), periods=forecast_days, freq='D')
+    history    = summary["history"]
+    d_hist     = pd.date_range(end=pd.Timestamp.now(), periods=len(history), freq='D')
+    d_fut      = pd.date_range(start=pd.Timestamp.now()+pd.Timedelta(days=1), periods=forecast_days, freq='D')
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=d_hist, y=demand[-60:].flatten(), name='Historical',
+    fig.add_trace(go.Scatter(x=d_hist, y=history, name='Historical',
         mode='lines', line=dict(color='#00d4ff', width=3),
         fill='tozeroy', fillcolor='rgba(0,212,255,0.1)'))
-    fig.add_trace(go.Scatter(x=d_fut, y=fut_demand.flatten(), name='Forecast',
-        mode='lines+markers', line=dict(color='#7c3aed', width=3, dash='dash'),
-        marker=dict(size=9, symbol='diamond')))
-    fig.add_trace(go.Scatter(
-        x=d_fut.tolist()+d_fut.tolist()[::-1],
-        y=ci_up.tolist()+ci_dn.tolist()[::-1],
-        fill='toself', fillcolor='rgba(124,58,237,0.18)',
-        line=dict(color='rgba(0,0,0,0)'), name='95% CI'))
+
+    if fc is not None:
+        fut_demand = fc["forecast"]
+        fc_total   = np.sum(fut_demand)
+        res_std    = fc["residual_std"]
+        # ABC service level, as in the API and the batch CLI
+        segment    = view["segment"] if view else cached_segment(store_id, product_id, data_ver)
+        z          = segment_z(segment)
+        abc        = (segment or {}).get("ABC", "unclassified")
+        safety     = z * res_std
+        ci_up      = fut_demand + z * res_std
+        ci_dn      = fut_demand - z * res_std
+
+        fig.add_trace(go.Scatter(x=d_fut, y=fut_demand, name='Forecast',
+            mode='lines+markers', line=dict(color='#7c3aed', width=3, dash='dash'),
+            marker=dict(size=9, symbol='diamond')))
+        fig.add_trace(go.Scatter(
+            x=d_fut.tolist()+d_fut.tolist()[::-1],
+            y=ci_up.tolist()+ci_dn.tolist()[::-1],
+            fill='toself', fillcolor='rgba(124,58,237,0.18)',
+            line=dict(color='rgba(0,0,0,0)'), name=f'±{z:.2f}σ band'))
     fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)', title='📈 AI-Powered Demand Forecast',
         xaxis_title='Date', yaxis_title='Units Sold', hovermode='x unified', height=480)
     st.plotly_chart(fig, use_container_width=True)
 
-    rec_order  = max(0, fc_total + safety - current_inventory)
-    stock_days = current_inventory / (fc_total / forecast_days) if fc_total > 0 else 0
-    fc1,fc2,fc3,fc4 = st.columns(4)
-    with fc1: st.markdown(f'<div class="icard"><div class="icard-title">📈 Total Forecast</div><div class="icard-val">{fc_total:.0f}</div><div class="icard-sub">Units over {forecast_days} days</div></div>', unsafe_allow_html=True)
-    with fc2: st.markdown(f'<div class="icard"><div class="icard-title">🛡️ Safety Stock</div><div class="icard-val">{safety:.0f}</div><div class="icard-sub">95% confidence buffer</div></div>', unsafe_allow_html=True)
-    with fc3: st.markdown(f'<div class="icard"><div class="icard-title">📦 Recommended Order</div><div class="icard-val">{rec_order:.0f}</div><div class="icard-sub">Units to reorder</div></div>', unsafe_allow_html=True)
-    with fc4: st.markdown(f'<div class="icard"><div class="icard-title">⏱️ Stock Coverage</div><div class="icard-val">{stock_days:.1f}d</div><div class="icard-sub">Days remaining</div></div>', unsafe_allow_html=True)
+    if fc is None and pool.error(fc_key) is not None:
+        st.error(f"❌ Forecast failed: {pool.error(fc_key)}")
+        if st.button("🔄 Retry forecast", key="retry_forecast"):
+            pool.discard(fc_key)
+            st.rerun()
+    elif fc is None:
+        st.info("⏳ Forecast is running in the background — results will appear automatically.")
+    else:
+        rec_order  = max(0, fc_total + safety - current_inventory)
+        stock_days = current_inventory / (fc_total / forecast_days) if fc_total > 0 else 0
+        fc1,fc2,fc3,fc4 = st.columns(4)
+        with fc1: st.markdown(f'<div class="icard"><div class="icard-title">📈 Total Forecast</div><div class="icard-val">{fc_total:.0f}</div><div class="icard-sub">Units over {forecast_days} days</div></div>', unsafe_allow_html=True)
+        with fc2: st.markdown(f'<div class="icard"><div class="icard-title">🛡️ Safety Stock</div><div class="icard-val">{safety:.0f}</div><div class="icard-sub">z = {z:.2f} (ABC class {abc})</div></div>', unsafe_allow_html=True)
+        with fc3: st.markdown(f'<div class="icard"><div class="icard-title">📦 Recommended Order</div><div class="icard-val">{rec_order:.0f}</div><div class="icard-sub">Units to reorder</div></div>', unsafe_allow_html=True)
+        with fc4: st.markdown(f'<div class="icard"><div class="icard-title">⏱️ Stock Coverage</div><div class="icard-val">{stock_days:.1f}d</div><div class="icard-sub">Days remaining</div></div>', unsafe_allow_html=True)
 
     # --- Analytics Suite ---
     st.markdown('''<div class="sec-hdr"><span class="sec-icon">📊</span><h2 class="sec-title">Analytics Suite</h2></div>''', unsafe_allow_html=True)
 
-    try:
-        model_results, best_model = compare_models(model, X[:-50], y[:-50], X[-50:], y[-50:], scaler, demand)
-        if isinstance(model_results, dict):
+    # Only the selected tab is computed (st.tabs would run all four on every rerun)
+    TABS = ["🤖 Model Performance","🌡️ Seasonality","💰 Pricing","🌍 Regional"]
+    tab  = st.radio("Analytics", TABS, horizontal=True, label_visibility="collapsed", key="analytics_tab")
+
+    if tab == TABS[0]:
+        st.markdown("### Model Comparison & Performance")
+        perf          = view or pool.result_if_ready(perf_key) or {"model_results": None, "best_model": "LSTM"}
+        model_results = perf["model_results"]
+        best_model    = perf["best_model"]
+        if isinstance(model_results, dict) and model_results:
             model_results = pd.DataFrame([model_results])
         elif not isinstance(model_results, pd.DataFrame):
             model_results = pd.DataFrame()
-    except Exception:
-        model_results = pd.DataFrame()
-        best_model    = "LSTM"
-
-    tab1,tab2,tab3,tab4 = st.tabs(["🤖 Model Performance","🌡️ Seasonality","💰 Pricing","🌍 Regional"])
 
-    with tab1:
-        st.markdown("### Model Comparison & Performance")
         has_data = isinstance(model_results, pd.DataFrame) and not model_results.empty
         if has_data:
             c1,c2 = st.columns([2,1])
@@ -474,12 +579,19 @@ def show_dashboard():
                         if 'RMSE' in model_results.columns: st.metric("RMSE", f"{row['RMSE']:.2f}")
                         if 'MAE'  in model_results.columns: st.metric("MAE",  f"{row['MAE']:.2f}")
                 except Exception: pass
+        elif pool.pending(perf_key):
+            st.info("⏳ Model comparison is running in the background…")
+        elif pool.error(perf_key) is not None:
+            st.error(f"❌ Model comparison failed: {pool.error(perf_key)}")
+            if st.button("🔄 Retry model comparison", key="retry_model_performance"):
+                pool.discard(perf_key)
+                st.rerun()
         else:
             st.info("Model comparison data will appear here.")
 
-    with tab2:
+    elif tab == TABS[1]:
         st.markdown("### Seasonal Demand Analysis")
-        mp   = monthly_seasonal_pattern(df)
+        mp   = view["monthly_pattern"] if view else cached_analytics(data_ver)["monthly_pattern"]
         fig  = go.Figure(data=go.Heatmap(z=mp["Units Sold"].values.reshape(1,-1), x=mp["Month"].values, y=['Units Sold'],
             colorscale=[[0,'#1e293b'],[0.5,'#7c3aed'],[1,'#00d4ff']],
             text=mp["Units Sold"].values.reshape(1,-1), texttemplate='%{text:.0f}', textfont={"size":14,"color":"white"}))
@@ -487,19 +599,20 @@ def show_dashboard():
             title='🌡️ Monthly Demand Heatmap', height=240)
         st.plotly_chart(fig, use_container_width=True)
 
-        cat    = ts_df["Category"].iloc[0]
-        decomp = category_decomposition(df, cat)
-        s_str  = seasonality_strength(decomp)
+        seas   = view or cached_seasonality(store_id, product_id, data_ver)
+        cat    = seas["category"]
+        s_str  = seas["seasonality_strength"]
         sa1,sa2,sa3 = st.columns(3)
         sa1.metric("🌊 Seasonality Strength", f"{s_str:.1%}")
         sa2.metric("📦 Category", cat)
         sa3.metric("📈 Trend Strength", f"{(1-s_str):.1%}")
 
-    with tab3:
+    elif tab == TABS[2]:
         st.markdown("### Dynamic Pricing Strategy")
-        elasticity        = estimate_price_elasticity(df, store_id, product_id)
-        avg_price         = ts_df["Price"].mean()
-        avg_comp          = ts_df["Competitor Pricing"].mean()
+        pricing           = view or cached_pricing(store_id, product_id, data_ver)
+        elasticity        = pricing["elasticity"]
+        avg_price         = pricing["avg_price"]
+        avg_comp          = pricing["avg_competitor_price"]
         price_suggestion = suggest_optimal_price(avg_price, elasticity, avg_comp)
 
         p1,p2 = st.columns(2)
@@ -515,7 +628,7 @@ def show_dashboard():
             st.metric("Elasticity Coefficient", f"{elasticity:.3f}")
         with p2:
             pr  = np.linspace(avg_price*.8, avg_price*1.2, 25)
-            dc  = ts_df["Units Sold"].mean() * ((pr/avg_price) ** elasticity)
+            dc  = pricing["avg_units"] * ((pr/avg_price) ** elasticity)
             fig2= go.Figure()
             fig2.add_trace(go.Scatter(x=pr, y=dc, mode='lines+markers',
                 line=dict(color='#00d4ff', width=3), fill='tozeroy', fillcolor='rgba(0,212,255,0.1)'))
@@ -531,15 +644,24 @@ def show_dashboard():
 
         if price_change != 0:
             st.markdown("#### 🎮 What-If Price Analysis")
-            sim  = simulate_price_change(avg_price, elasticity, price_change)
+            if os.path.exists(EXOG_MODEL_PATH):
+                sim = cached_model_what_if(store_id, product_id, price_change,
+                                           data_ver, file_version(EXOG_MODEL_PATH))
+                source = "Exogenous-feature LSTM forecast"
+            else:
+                sim = simulate_price_change(avg_price, elasticity, price_change)
+                source = "Price elasticity estimate"
+            demand_change  = sim["Estimated Demand Change %"]
+            revenue_change = ((1 + price_change/100) * (1 + demand_change/100) - 1) * 100
             w1,w2,w3 = st.columns(3)
-            w1.metric("New Price",       f"₹{sim.get('new_price', avg_price):.2f}", delta=f"{price_change}%")
-            w2.metric("Demand Impact",   f"{sim.get('demand_change', 0):.1f}%")
-            w3.metric("Revenue Impact",  f"{sim.get('revenue_change', 0):.1f}%")
+            w1.metric("New Price",       f"₹{sim['New Price']:.2f}", delta=f"{price_change}%")
+            w2.metric("Demand Impact",   f"{demand_change:.1f}%")
+            w3.metric("Revenue Impact",  f"{revenue_change:.1f}%")
+            st.caption(source)
 
-    with tab4:
+    elif tab == TABS[3]:
         st.markdown("### Regional Performance")
-        rp = region_profitability_analysis(df[df["Product ID"]==product_id])
+        rp = (view or cached_regional(product_id, data_ver))["regional_profitability"]
         if not rp.empty:
             regions = rp['Region'].values if 'Region' in rp.columns else rp.index
             margins = rp['Profit Margin %'].values
@@ -554,31 +676,49 @@ def show_dashboard():
     # --- AI Recommendations ---
     st.markdown('''<div class="sec-hdr"><span class="sec-icon">🧠</span><h2 class="sec-title">AI-Powered Recommendations</h2></div>''', unsafe_allow_html=True)
 
-    promo_uplift = promotion_uplift_analysis(df)
-    hol_impact   = holiday_impact_analysis(df)
-    growth_data  = region_growth_analysis(df)
-    cat_profit   = category_profitability(df)
-    reg_vol      = region_demand_volatility(df)
-    reg_eff      = region_stock_efficiency(df)
-    long_trend   = long_cycle_trend(df)
-    segmentation = product_volatility_classification(df)
-    comp_alerts  = competitor_price_alert(df)
-
-    seg_rows = segmentation[segmentation["Product ID"]==product_id]
-    cur_seg  = seg_rows["Demand Segment"].values[0] if len(seg_rows)>0 else "Unknown"
-
-    recs = generate_recommendations(
-        fc_total, safety, current_inventory, elasticity, comp_alerts,
-        growth_data, hol_impact, promo_uplift, cat_profit, reg_vol,
-        reg_eff, s_str, long_trend, cur_seg
-    )
+    if view:
+        recs = view["recommendations"]
+    elif fc is not None:
+        recs = cached_recommendations(store_id, product_id, tuple(fc["forecast"]), fc["residual_std"],
+                                      current_inventory, data_ver)
+    elif pool.error(fc_key) is not None:
+        recs = []
+        st.info("Recommendations need a forecast — retry it above.")
+    else:
+        recs = []
+        st.info("⏳ Recommendations will appear once the forecast completes.")
 
     icons = ["🎯","💡","⚡","🚀","💰","📊","🔔","⭐","🔍","🌟"]
     r1,r2 = st.columns(2)
     for i, rec in enumerate(recs):
         with (r1 if i%2==0 else r2):
             st.info(f"{icons[i%len(icons)]} **Insight #{i+1}**\n\n{rec}")
-            
+
+    # --- Performance Panel (optional) ---
+    if st.toggle("⏱️ Performance panel", key="perf_panel"):
+        perf = METRICS.stage_table()
+        if perf.empty:
+            st.caption("No stages timed yet in this process.")
+        else:
+            top = perf.head(15).iloc[::-1]
+            fig = go.Figure([
+                go.Bar(y=top["Stage"], x=top["P50 ms"], name="p50", orientation="h", marker_color="#00d4ff"),
+                go.Bar(y=top["Stage"], x=top["P95 ms"], name="p95", orientation="h", marker_color="#7c3aed")
+            ])
+            fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                barmode='group', title='Stage latency (ms, slowest total first)', height=420)
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(perf.round(3), use_container_width=True, hide_index=True)
+            if METRICS.counters:
+                st.caption(" • ".join(f"{event}: {value:,}" for event, value in sorted(METRICS.counters.items())))
+        peak = peak_memory_mb()
+        st.caption("Process-wide since start or reset; cached results skip their stages. "
+                   "Out MB: arrays produced by the stage (scaled data path is float32)."
+                   + (f" Peak RSS: {peak:,.0f} MB." if peak is not None else ""))
+        if st.button("Reset metrics", key="perf_reset"):
+            METRICS.reset()
+            st.rerun()
+
     # --- Footer ---
     st.markdown("---")
     st.markdown(f"""
@@ -588,11 +728,17 @@ def show_dashboard():
     </div>
     """, unsafe_allow_html=True)
 
+    # Poll until the background jobs for this view have finished
+    if pool.pending(fc_key) or pool.pending(perf_key):
+        time.sleep(0.5)
+        st.rerun()
+
 # =========================================================
-# 6. ROUTER
+# 7. ROUTER
 # =========================================================
 if st.session_state.page == 'landing':
     show_landing_page()
 else:
-    show_dashboard()
+    with timer("dashboard"):
+        show_dashboard()
 
@@ -0,0 +1,109 @@
+"""
+Exact vs approximate (sketch) analytics on a CSV file.
+
+Exact mode loads the whole file and runs region_demand_volatility,
+category_demand_share and monthly_seasonal_pattern on the DataFrame.
+Approximate mode streams the file in chunks into an AnalyticsSketch
+(src/sketches.py) and runs the same functions on the sketch.
+Reports wall time, peak traced memory and the error of every output.
+
+Usage:
+    python benchmarks/approximate_analytics.py [--data data/raw/retail_store_inventory.csv]
+                                               [--chunksize 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.sketches import sketch_csv
+from src.category_analysis import category_demand_share
+from src.regional_insights import region_demand_volatility
+from src.seasonality_analysis import monthly_seasonal_pattern
+
+
+def measure(fn):
+    """
+    (result, seconds, peak traced MB): timed untraced, then run
+    again under tracemalloc for the memory peak.
+    """
+
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, seconds, peak / 1e6
+
+
+def analytics(source):
+    return {
+        "region_demand_volatility": region_demand_volatility(source),
+        "category_demand_share": category_demand_share(source),
+        "monthly_seasonal_pattern": monthly_seasonal_pattern(source),
+    }
+
+
+def max_error(exact, approximate, key, column):
+    merged = exact.merge(approximate, on=key, suffixes=("", " approx"))
+    return float((merged[column] - merged[f"{column} approx"]).abs().max())
+
+
+def quantile_rank_error(values, sketch, quantiles=(0.5, 0.9, 0.99)):
+    """
+    Largest |rank of the estimate - q| over quantiles (fraction of rows).
+    """
+
+    values = np.sort(values)
+    estimates = sketch.demand_quantiles(quantiles).loc["All"].values
+
+    ranks = np.searchsorted(values, estimates, side="right") / len(values)
+
+    return float(np.abs(ranks - np.array(quantiles)).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv"))
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    args = parser.parse_args()
+
+    exact, exact_seconds, exact_mb = measure(lambda: analytics(pd.read_csv(args.data)))
+
+    sketch, sketch_seconds, sketch_mb = measure(lambda: sketch_csv(args.data, chunksize=args.chunksize))
+    approximate = analytics(sketch)
+
+    print(f"{'mode':<14}{'seconds':>10}{'peak MB':>10}")
+    print(f"{'exact':<14}{exact_seconds:>10.2f}{exact_mb:>10.1f}")
+    print(f"{'approximate':<14}{sketch_seconds:>10.2f}{sketch_mb:>10.1f}   ({sketch.n_rows} rows, chunks of {args.chunksize})")
+
+    print()
+    print("max absolute error")
+    print(f"  region volatility      {max_error(exact['region_demand_volatility'], approximate['region_demand_volatility'], 'Region', 'Demand Volatility'):.2e}")
+    print(f"  category share (pp)    {max_error(exact['category_demand_share'], approximate['category_demand_share'], 'Category', 'Demand Share %'):.2e}")
+    print(f"  monthly pattern        {max_error(exact['monthly_seasonal_pattern'], approximate['monthly_seasonal_pattern'], 'Month', 'Units Sold'):.2e}")
+
+    units = pd.read_csv(args.data, usecols=["Units Sold"])["Units Sold"].values
+    print(f"  quantile rank error    {quantile_rank_error(units, sketch):.2e}")
+
+    print()
+    print("documented bounds")
+    for name, bound in sketch.error_bounds().items():
+        print(f"  {name:<26}{bound}")
+
+
+if __name__ == "__main__":
+    main()
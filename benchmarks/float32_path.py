@@ -0,0 +1,172 @@
+"""
+float32 vs float64 scaled data path: memory and decision parity.
+
+Runs the batched catalogue forecast (scale → windows → predict →
+inverse transform → residual std → reorder decision) and the per-series
+forecast_with_uncertainty once per dtype, each in a fresh interpreter
+so peak RSS is not shared. Reports output memory per stage, peak RSS
+and the largest difference in forecasts and decisions; exits 1 when a
+reorder status differs or a quantity is outside the tolerance.
+
+Usage:
+    python benchmarks/float32_path.py [--data data/raw/retail_store_inventory.csv]
+    python benchmarks/float32_path.py --stores 20 --products 50 --days 730
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+WINDOW_SIZE = 30
+MEMORY_STAGES = ["scale", "sequence_build", "forecast_inputs", "predict", "inverse_transform"]
+
+
+def catalog_series(args):
+
+    if args.data:
+        from src.data_utils import load_data
+        df = load_data(args.data)
+    else:
+        from src.synthetic_data import generate_retail_data
+        df = generate_retail_data(args.stores, args.products, args.days, seed=args.seed)
+
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    return [
+        ts.sort_values("Date")["Units Sold"].values.reshape(-1, 1)
+        for _, ts in df.groupby(["Store ID", "Product ID"], sort=True)
+        if len(ts) > WINDOW_SIZE + 50
+    ]
+
+
+def run_path(args):
+    """
+    One dtype, in this process: writes forecasts / decisions to args.result
+    and prints the memory report as JSON.
+    """
+
+    from src.instrumentation import METRICS, peak_memory_mb
+    from src.model_registry import load_model_cached
+    from src.preprocessing import prepare_forecast_inputs
+    from src.decision_engine import (
+        forecast_demand_batch, residual_std_batch, forecast_with_uncertainty, inventory_decision
+    )
+
+    dtype = np.dtype(args.worker)
+    series = catalog_series(args)
+    model = load_model_cached(args.model)
+
+    METRICS.reset()
+
+    inputs = prepare_forecast_inputs(series, WINDOW_SIZE, dtype=dtype)
+    scaled = forecast_demand_batch(model, inputs["windows"], args.horizon)
+    forecast = scaled * inputs["ranges"][:, None] + inputs["mins"][:, None]
+    residual_std = residual_std_batch(model, inputs["residual_X"], inputs["residual_y"], inputs["scalers"])
+
+    decisions = [inventory_decision(np.sum(f), s, args.inventory) for f, s in zip(forecast, residual_std)]
+
+    single = [forecast_with_uncertainty(model, demand, WINDOW_SIZE, args.horizon, dtype=dtype)
+              for demand in series[:args.single]]
+
+    np.savez(
+        args.result,
+        forecast=forecast.astype(np.float64),
+        residual_std=residual_std.astype(np.float64),
+        reorder_quantity=np.array([d["reorder_quantity"] for d in decisions]),
+        reorder_point=np.array([d["reorder_point"] for d in decisions]),
+        status=np.array([d["status"] for d in decisions]),
+        single_forecast=np.array([s["forecast"] for s in single], dtype=np.float64),
+        single_residual_std=np.array([s["residual_std"] for s in single])
+    )
+
+    memory = METRICS.stage_table().set_index("Stage")["Max Out MB"]
+
+    print(json.dumps({
+        "dtype": str(dtype),
+        "series": len(series),
+        "stages_mb": {stage: float(memory[stage]) for stage in MEMORY_STAGES if stage in memory.index},
+        "peak_rss_mb": peak_memory_mb()
+    }))
+
+
+def spawn(args, dtype, result):
+
+    command = [sys.executable, os.path.abspath(__file__), "--worker", dtype, "--result", result,
+               "--horizon", str(args.horizon), "--inventory", str(args.inventory), "--single", str(args.single),
+               "--model", args.model, "--stores", str(args.stores), "--products", str(args.products),
+               "--days", str(args.days), "--seed", str(args.seed)]
+    if args.data:
+        command += ["--data", args.data]
+
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", help="CSV / Parquet (default: synthetic dataset)")
+    parser.add_argument("--stores", type=int, default=10)
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default=os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras"))
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--inventory", type=float, default=500)
+    parser.add_argument("--single", type=int, default=5, help="series also run through forecast_with_uncertainty")
+    parser.add_argument("--rtol", type=float, default=1e-4, help="relative tolerance on forecasts and decisions")
+    parser.add_argument("--atol", type=float, default=1e-2, help="absolute tolerance (units)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_path(args)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reports, results = {}, {}
+        for dtype in ["float64", "float32"]:
+            path = os.path.join(tmp, f"{dtype}.npz")
+            reports[dtype] = spawn(args, dtype, path)
+            results[dtype] = dict(np.load(path))
+
+    print(f"{reports['float32']['series']} series, horizon {args.horizon}\n")
+    print(f"{'output MB':<20}{'float64':>10}{'float32':>10}")
+    for stage in MEMORY_STAGES:
+        before = reports["float64"]["stages_mb"].get(stage)
+        after = reports["float32"]["stages_mb"].get(stage)
+        if before is not None and after is not None:
+            print(f"{stage:<20}{before:>10.3f}{after:>10.3f}")
+    if reports["float32"]["peak_rss_mb"] is not None:
+        print(f"{'peak RSS':<20}{reports['float64']['peak_rss_mb']:>10.1f}{reports['float32']['peak_rss_mb']:>10.1f}")
+
+    reference, candidate = results["float64"], results["float32"]
+
+    print(f"\n{'max difference':<24}{'absolute':>12}{'relative':>12}")
+    within = True
+    for key in ["forecast", "residual_std", "reorder_point", "reorder_quantity", "single_forecast", "single_residual_std"]:
+        diff = np.abs(candidate[key] - reference[key])
+        relative = diff / np.maximum(np.abs(reference[key]), 1e-12)
+        ok = np.allclose(candidate[key], reference[key], rtol=args.rtol, atol=args.atol)
+        within &= ok
+        print(f"{key:<24}{diff.max(initial=0):>12.2e}{relative.max(initial=0):>12.2e}   {'ok' if ok else 'OUT OF TOLERANCE'}")
+
+    mismatched = int((candidate["status"] != reference["status"]).sum())
+    print(f"\nreorder status mismatches: {mismatched} of {len(reference['status'])}")
+
+    return 0 if within and not mismatched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Cold-start import time of each entry point.
+
+Every entry point is imported in a fresh interpreter so nothing is
+shared between measurements. Besides wall time, the benchmark reports
+which heavy libraries (TensorFlow, statsmodels, plotly) ended up loaded.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = ["tensorflow", "statsmodels", "plotly", "sklearn.ensemble"]
+
+# name -> code executed in the fresh interpreter
+ENTRY_POINTS = {
+    "app (landing page)": "import runpy; runpy.run_path('app.py', run_name='__main__')",
+    "src.dashboard_snapshot": "import src.dashboard_snapshot",
+    "src.decision_engine": "import src.decision_engine",
+    "src.multi_product_pipeline": "import src.multi_product_pipeline",
+    "src.model_comparison": "import src.model_comparison",
+    "src.seasonality_analysis": "import src.seasonality_analysis",
+}
+
+PROBE = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print("__RESULT__" + json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(code):
+    """
+    Import time (seconds) and loaded heavy modules for one cold start.
+    """
+
+    probe = PROBE.format(code=code, heavy=HEAVY_MODULES)
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+
+    for line in out.stdout.splitlines():
+        if line.startswith("__RESULT__"):
+            return json.loads(line[len("__RESULT__"):])
+
+    raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else "no result")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Entry point':<30}{'best (s)':>10}{'mean (s)':>10}  heavy modules loaded")
+
+    for name, code in ENTRY_POINTS.items():
+        try:
+            runs = [measure(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<30}{'failed':>10}  {e}")
+            continue
+
+        times = [r["seconds"] for r in runs]
+        heavy = ", ".join(runs[0]["heavy"]) or "-"
+        print(f"{name:<30}{min(times):>10.2f}{sum(times) / len(times):>10.2f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
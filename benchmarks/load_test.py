@@ -0,0 +1,114 @@
+"""
+Local load test for the forecasting service (service.py).
+
+Fires concurrent single-SKU requests at a running service and reports
+latency percentiles, throughput and the micro-batching achieved.
+
+Usage:
+    uvicorn service:app --port 8000
+    python benchmarks/load_test.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import http.client
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+
+def get_json(url, path):
+
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+    conn.request("GET", path)
+    data = json.loads(conn.getresponse().read())
+    conn.close()
+
+    return data
+
+
+def worker(url, endpoint, skus, n_requests, forecast_days, seed):
+    """
+    Send n_requests over one keep-alive connection.
+    Returns (latencies in seconds, error count).
+    """
+
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+    latencies, errors = [], 0
+
+    for _ in range(n_requests):
+        store_id, product_id = rng.choice(skus)
+        body = json.dumps({
+            "store_id": store_id,
+            "product_id": product_id,
+            "forecast_days": forecast_days,
+            "current_inventory": 500
+        })
+
+        start = time.perf_counter()
+        try:
+            conn.request("POST", f"/{endpoint}", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+        latencies.append(time.perf_counter() - start)
+
+    conn.close()
+
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the forecasting service")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="forecast", choices=["forecast", "decision", "elasticity"])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--forecast-days", type=int, default=7)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    skus = [(s, p) for s, products in get_json(url, "/catalog").items() for p in products]
+    before = get_json(url, "/health")
+
+    per_worker = [args.requests // args.concurrency] * args.concurrency
+    for i in range(args.requests % args.concurrency):
+        per_worker[i] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda i: worker(url, args.endpoint, skus, per_worker[i], args.forecast_days, i),
+            range(args.concurrency)
+        ))
+    elapsed = time.perf_counter() - start
+
+    after = get_json(url, "/health")
+
+    latencies = np.array([l for lat, _ in results for l in lat]) * 1000
+    errors = sum(e for _, e in results)
+    batches = after["batches"] - before["batches"]
+    batched = after["batched_items"] - before["batched_items"]
+
+    print(f"endpoint      /{args.endpoint}  ({len(skus)} SKUs, concurrency {args.concurrency})")
+    print(f"requests      {len(latencies)}  errors {errors}")
+    print(f"throughput    {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency ms    p50 {np.percentile(latencies, 50):.1f}  "
+          f"p90 {np.percentile(latencies, 90):.1f}  "
+          f"p99 {np.percentile(latencies, 99):.1f}  "
+          f"max {latencies.max():.1f}")
+    if batches:
+        print(f"micro-batch   {batches} model batches, {batched / batches:.1f} requests/batch")
+
+
+if __name__ == "__main__":
+    main()
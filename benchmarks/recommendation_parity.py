@@ -0,0 +1,278 @@
+"""
+Rule engine vs the original if-chain: recommendation parity.
+
+Builds the real inputs (elasticity, competitor alerts, regional, category,
+promotion, holiday, seasonality and trend tables) for a few SKUs, with
+inventory levels either side of the reorder point, and runs both the
+original generate_recommendations if-chain (kept below as legacy) and the
+rule engine: once per SKU through generate_recommendations and once for
+all of them through recommendation_features / evaluate_rules. Prints
+every SKU whose messages or message order differ and exits 1 on any
+mismatch.
+
+The legacy side gets the original long_cycle_trend (kept below); the
+engine gets the trend global_analytics hands the dashboard, so the
+long-term-trend direction is checked as well.
+
+Usage:
+    python benchmarks/recommendation_parity.py [--data data/raw/retail_store_inventory.csv]
+    python benchmarks/recommendation_parity.py --stores 5 --products 20 --skus 25
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.recommendation_engine import generate_recommendations, recommendation_features, evaluate_rules
+from src.pricing_engine import estimate_price_elasticity, competitor_price_alert
+from src.promotion_analysis import promotion_uplift_analysis, holiday_impact_analysis
+from src.regional_insights import region_growth_analysis, region_demand_volatility, region_stock_efficiency
+from src.category_analysis import category_profitability
+from src.seasonality_analysis import time_series_decomposition, seasonality_strength
+from src.dashboard_snapshot import global_analytics
+
+
+def legacy_recommendations(
+    forecast_total,
+    safety_stock,
+    current_inventory,
+    elasticity,
+    competitor_alerts,
+    region_growth_data,
+    holiday_impact,
+    promotion_uplift,
+    category_profitability=None,
+    region_volatility=None,
+    region_efficiency=None,
+    seasonality_strength_score=None,
+    long_term_trend=None
+):
+    """
+    The if-chain generate_recommendations replaced by the rule engine
+    (its demand-segment branch sat after the return and never ran).
+    """
+
+    recommendations = []
+
+    reorder_point = forecast_total + safety_stock
+
+    if current_inventory < reorder_point:
+        recommendations.append(
+            f"Increase inventory by {int(reorder_point - current_inventory)} units to avoid stockout."
+        )
+
+    if elasticity < -1:
+        recommendations.append(
+            "Demand is highly price sensitive. Consider reducing price slightly to increase volume."
+        )
+    elif -1 < elasticity < 0:
+        recommendations.append(
+            "Demand is relatively inelastic. Consider small price increase to improve margins."
+        )
+
+    if competitor_alerts is not None and len(competitor_alerts) > 0:
+        recommendations.append(
+            "Competitor undercut detected. Review pricing strategy immediately."
+        )
+
+    if region_growth_data is not None:
+        declining_regions = region_growth_data[region_growth_data["Growth Rate %"] < 0]
+        if len(declining_regions) > 0:
+            recommendations.append(
+                "Some regions show declining growth. Consider targeted regional campaigns."
+            )
+
+    if holiday_impact and holiday_impact.get("Holiday Impact %", 0) > 15:
+        recommendations.append(
+            "Holiday demand impact is strong. Increase stock before major holidays."
+        )
+
+    if promotion_uplift and promotion_uplift.get("Uplift %", 0) > 10:
+        recommendations.append(
+            "Promotions significantly boost demand. Plan strategic future campaigns."
+        )
+
+    if category_profitability is not None:
+        low_margin_categories = category_profitability[category_profitability["Profit Margin %"] < 10]
+        if len(low_margin_categories) > 0:
+            recommendations.append(
+                "Some categories have low margins. Consider price optimization or cost reduction."
+            )
+
+    if region_volatility is not None:
+        high_vol_regions = region_volatility[
+            region_volatility["Demand Volatility"] > region_volatility["Demand Volatility"].mean()
+        ]
+        if len(high_vol_regions) > 0:
+            recommendations.append(
+                "High demand volatility detected in some regions. Maintain higher safety stock."
+            )
+
+    if region_efficiency is not None:
+        low_eff_regions = region_efficiency[
+            region_efficiency["Stock Efficiency"] < region_efficiency["Stock Efficiency"].mean()
+        ]
+        if len(low_eff_regions) > 0:
+            recommendations.append(
+                "Low stock efficiency observed. Consider redistributing inventory."
+            )
+
+    if seasonality_strength_score is not None and seasonality_strength_score > 0.3:
+        recommendations.append(
+            "Strong seasonality detected. Align inventory and promotions with seasonal peaks."
+        )
+
+    if long_term_trend is not None:
+        if long_term_trend.iloc[-1] > long_term_trend.mean():
+            recommendations.append(
+                "Long-term demand trend is upward. Consider expansion strategy."
+            )
+        else:
+            recommendations.append(
+                "Long-term demand trend is weakening. Monitor demand carefully."
+            )
+
+    if len(recommendations) == 0:
+        recommendations.append("System stable. No immediate action required.")
+
+    return recommendations
+
+
+def legacy_long_cycle_trend(df, window=90):
+    """
+    The original long_cycle_trend: rolling mean over raw rows in date order.
+    """
+
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values("Date")
+
+    ts = df.set_index("Date")["Units Sold"]
+
+    return ts.rolling(window=window).mean()
+
+
+def trend_direction(long_term_trend):
+    return "up" if long_term_trend.iloc[-1] > long_term_trend.mean() else "down"
+
+
+def sku_inputs(df, skus, seed):
+    """
+    Per-SKU arguments (forecast, safety stock, inventory, elasticity,
+    competitor alerts, seasonality strength) plus the tables shared by
+    every SKU. Inventory is drawn either side of the reorder point and
+    holiday / promotion effects alternate with and without their dict,
+    so every rule fires for some SKUs and not for others.
+    """
+
+    rng = np.random.default_rng(seed)
+    alerts = competitor_price_alert(df.copy())
+
+    shared = {
+        "region_growth_data": region_growth_analysis(df),
+        "category_profitability": category_profitability(df),
+        "region_volatility": region_demand_volatility(df),
+        "region_efficiency": region_stock_efficiency(df),
+        "long_term_trend": global_analytics(df)["long_trend"],
+    }
+    holiday = holiday_impact_analysis(df)
+    promotion = promotion_uplift_analysis(df)
+
+    rows = []
+    for i, (store_id, product_id) in enumerate(skus):
+        forecast_total = float(rng.uniform(100, 1000))
+        safety_stock = float(rng.uniform(10, 150))
+        decomposition = time_series_decomposition(df, store_id, product_id)
+
+        rows.append({
+            "forecast_total": forecast_total,
+            "safety_stock": safety_stock,
+            "current_inventory": float((forecast_total + safety_stock) * rng.uniform(0.5, 1.5)),
+            "elasticity": estimate_price_elasticity(df, store_id, product_id),
+            "competitor_alerts": alerts[(alerts["Store ID"] == store_id) & (alerts["Product ID"] == product_id)],
+            "holiday_impact": holiday if i % 2 == 0 else None,
+            "promotion_uplift": promotion if i % 3 != 2 else None,
+            "seasonality_strength_score": seasonality_strength(decomposition) if i % 4 != 3 else None,
+        })
+
+    return rows, shared
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", help="CSV / Parquet (default: synthetic dataset)")
+    parser.add_argument("--stores", type=int, default=3)
+    parser.add_argument("--products", type=int, default=5)
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--skus", type=int, default=10, help="store × product series compared")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.data:
+        from src.data_utils import load_data
+        df = load_data(args.data)
+    else:
+        from src.synthetic_data import generate_retail_data
+        df = generate_retail_data(args.stores, args.products, args.days, seed=args.seed)
+
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    skus = list(df[["Store ID", "Product ID"]].drop_duplicates().itertuples(index=False, name=None))[:args.skus]
+    rows, shared = sku_inputs(df, skus, args.seed)
+
+    catalog = evaluate_rules(recommendation_features(
+        np.array([r["forecast_total"] for r in rows]),
+        np.array([r["safety_stock"] for r in rows]),
+        np.array([r["current_inventory"] for r in rows]),
+        np.array([r["elasticity"] for r in rows]),
+        competitor_alert=np.array([len(r["competitor_alerts"]) > 0 for r in rows]),
+        region_growth_data=shared["region_growth_data"],
+        holiday_impact=np.array([(r["holiday_impact"] or {}).get("Holiday Impact %", np.nan) for r in rows]),
+        promotion_uplift=np.array([(r["promotion_uplift"] or {}).get("Uplift %", np.nan) for r in rows]),
+        category_profitability=shared["category_profitability"],
+        region_volatility=shared["region_volatility"],
+        region_efficiency=shared["region_efficiency"],
+        seasonality_strength_score=np.array([
+            np.nan if r["seasonality_strength_score"] is None else r["seasonality_strength_score"] for r in rows
+        ]),
+        long_term_trend=shared["long_term_trend"],
+        keys=skus
+    ))
+
+    legacy_shared = {**shared, "long_term_trend": legacy_long_cycle_trend(df.copy())}
+
+    legacy_direction = trend_direction(legacy_shared["long_term_trend"])
+    direction = trend_direction(shared["long_term_trend"])
+    trend_ok = direction == legacy_direction
+    print(f"long-term trend: {direction} (if-chain input: {legacy_direction})  {'ok' if trend_ok else 'MISMATCH'}")
+
+    mismatched = 0
+    for i, (key, row) in enumerate(zip(skus, rows)):
+        expected = legacy_recommendations(**row, **legacy_shared)
+        single = generate_recommendations(**row, **shared)
+        batched = catalog.loc[catalog["Row"] == i, "Recommendation"].tolist()
+
+        if single == expected and batched == expected:
+            print(f"{key[0]} {key[1]}  ok ({len(expected)} messages)")
+            continue
+
+        mismatched += 1
+        print(f"{key[0]} {key[1]}  MISMATCH")
+        for name, messages in [("if-chain", expected), ("single", single), ("catalog", batched)]:
+            print(f"  {name}:")
+            for message in messages:
+                print(f"    {message}")
+
+    print(f"\n{mismatched} of {len(skus)} SKUs differ from the if-chain")
+
+    return 1 if mismatched or not trend_ok else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
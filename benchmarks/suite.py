@@ -0,0 +1,319 @@
+"""
+Benchmark suite for the forecasting and analytics hot paths.
+
+Generates a synthetic dataset with the retail_store_inventory.csv schema
+(src/synthetic_data.py) at a chosen scale, then times:
+
+    preprocessing      create_sequences, prepare_forecast_inputs
+    forecasting        recursive forecast loop (single series and batched),
+                       compare_models (statsmodels and fast ARIMA)
+    analytics          every regional_insights / category_analysis /
+                       seasonality_analysis function, on raw rows and
+                       on the rollup cube
+    dashboard          global_analytics and the full compute_dashboard_view path
+
+Every case gets one warm-up run and --repeat timed runs; results
+(median / min / mean seconds plus environment and scale) are written
+as JSON. --compare prints the ratio against an earlier result file
+and, with --fail-on-regression, exits 1 when a case got slower than
+--threshold.
+
+Usage:
+    python benchmarks/suite.py --stores 5 --products 20 --days 730
+    python benchmarks/suite.py --only regional_insights --repeat 10
+    python benchmarks/suite.py --compare outputs/benchmarks/<earlier>.json --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.synthetic_data import generate_retail_data
+from src.preprocessing import scale_series, create_sequences, prepare_forecast_inputs
+from src.rollup_cube import build_rollup_cube
+from src import category_analysis, regional_insights, seasonality_analysis
+
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "outputs", "benchmarks")
+WINDOW_SIZE = 30
+
+
+def git_revision():
+    """
+    (short commit, working tree has changes) or (None, None) outside git.
+    """
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+    return commit, bool(status)
+
+
+def load_benchmark_model(path):
+    """
+    The trained model when path exists, otherwise the same architecture
+    with seeded random weights (same cost per call, meaningless forecasts).
+    """
+
+    if os.path.exists(path):
+        from src.model_registry import load_model_cached
+        return load_model_cached(path), "trained"
+
+    import keras
+    from src.lstm_model import build_lstm_model
+
+    keras.utils.set_random_seed(0)
+
+    return build_lstm_model(WINDOW_SIZE, compile=False), "untrained"
+
+
+# CASES
+# =========================================================
+def analytics_cases(df, cube):
+    """
+    Every public regional / category / seasonality function on raw rows,
+    plus "[cube]" variants where the function also accepts the rollup cube.
+    """
+
+    store_id, product_id = df["Store ID"].iloc[0], df["Product ID"].iloc[0]
+    category, region = df["Category"].iloc[0], df["Region"].iloc[0]
+    decomposition = seasonality_analysis.time_series_decomposition(df, store_id, product_id)
+
+    cube_functions = {
+        regional_insights: [
+            "region_store_summary", "region_demand_heatmap", "region_growth_analysis",
+            "region_profitability_analysis", "region_demand_volatility", "region_stock_efficiency",
+            "region_category_matrix", "region_seasonal_index", "region_growth_momentum"
+        ],
+        category_analysis: [
+            "category_demand_share", "category_growth_rate", "category_profitability", "category_seasonal_index"
+        ],
+        seasonality_analysis: ["monthly_seasonal_pattern", "quarterly_trend_analysis", "long_cycle_trend"],
+    }
+
+    cases = {}
+
+    for module, names in cube_functions.items():
+        prefix = module.__name__.rsplit(".", 1)[-1]
+        for name in names:
+            fn = getattr(module, name)
+            cases[f"{prefix}.{name}"] = lambda fn=fn: fn(df)
+            cases[f"{prefix}.{name}[cube]"] = lambda fn=fn: fn(cube)
+
+    cases.update({
+        "regional_insights.suggest_inventory_redistribution":
+            lambda: regional_insights.suggest_inventory_redistribution(df),
+        "seasonality_analysis.time_series_decomposition":
+            lambda: seasonality_analysis.time_series_decomposition(df, store_id, product_id),
+        "seasonality_analysis.seasonality_strength":
+            lambda: seasonality_analysis.seasonality_strength(decomposition),
+        "seasonality_analysis.category_decomposition":
+            lambda: seasonality_analysis.category_decomposition(df, category),
+        "seasonality_analysis.category_decomposition[cube]":
+            lambda: seasonality_analysis.category_decomposition(cube, category),
+        "seasonality_analysis.region_decomposition":
+            lambda: seasonality_analysis.region_decomposition(df, region),
+        "seasonality_analysis.region_decomposition[cube]":
+            lambda: seasonality_analysis.region_decomposition(cube, region),
+        "rollup_cube.build_rollup_cube": lambda: build_rollup_cube(df),
+    })
+
+    return cases
+
+
+def model_cases(df, model):
+
+    from src.decision_engine import forecast_demand, forecast_demand_batch, residual_std_batch
+    from src.model_comparison import compare_models
+    from src.dashboard_snapshot import global_analytics, compute_dashboard_view
+
+    store_id, product_id = df["Store ID"].iloc[0], df["Product ID"].iloc[0]
+    series = [ts["Units Sold"].values.reshape(-1, 1)
+              for _, ts in df.groupby(["Store ID", "Product ID"], sort=True)]
+
+    demand = series[0]
+    scaled, scaler = scale_series(demand)
+    X, y = create_sequences(scaled, WINDOW_SIZE)
+    split = len(X) - 50
+
+    inputs = prepare_forecast_inputs(series, WINDOW_SIZE)
+    analytics = global_analytics(df)
+
+    return {
+        "preprocessing.create_sequences": lambda: create_sequences(scaled, WINDOW_SIZE),
+        "preprocessing.prepare_forecast_inputs[catalog]": lambda: prepare_forecast_inputs(series, WINDOW_SIZE),
+        "decision_engine.forecast_demand[7d]": lambda: forecast_demand(model, scaled, scaler, WINDOW_SIZE, 7),
+        "decision_engine.forecast_demand_batch[catalog,7d]":
+            lambda: forecast_demand_batch(model, inputs["windows"], 7),
+        "decision_engine.residual_std_batch[catalog]":
+            lambda: residual_std_batch(model, inputs["residual_X"], inputs["residual_y"], inputs["scalers"]),
+        "model_comparison.compare_models":
+            lambda: compare_models(model, X[:split], y[:split], X[split:], y[split:], scaler, demand),
+        "model_comparison.compare_models[fast]":
+            lambda: compare_models(model, X[:split], y[:split], X[split:], y[split:], scaler, demand, fast=True),
+        "dashboard_snapshot.global_analytics": lambda: global_analytics(df),
+        "dashboard_snapshot.compute_dashboard_view":
+            lambda: compute_dashboard_view(df, model, store_id, product_id, analytics=analytics),
+        "dashboard_snapshot.compute_dashboard_view[+analytics]":
+            lambda: compute_dashboard_view(df, model, store_id, product_id),
+    }
+
+
+# RUN + COMPARE
+# =========================================================
+def time_case(fn, repeat, warmup=1):
+
+    for _ in range(warmup):
+        fn()
+
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+
+    return {
+        "median_s": statistics.median(runs),
+        "min_s": min(runs),
+        "mean_s": statistics.fmean(runs),
+        "runs": runs
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Median ratio current / baseline per case present in both files.
+    Returns (table, names of cases slower than 1 + threshold).
+    """
+
+    rows = []
+
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        rows.append({
+            "case": name,
+            "baseline s": before["median_s"],
+            "current s": result["median_s"],
+            "ratio": result["median_s"] / before["median_s"]
+        })
+
+    table = pd.DataFrame(rows, columns=["case", "baseline s", "current s", "ratio"])
+    regressions = table.loc[table["ratio"] > 1 + threshold, "case"].tolist()
+
+    return table, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stores", type=int, default=5)
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (after one warm-up)")
+    parser.add_argument("--only", nargs="+", help="run cases whose name contains any of these strings")
+    parser.add_argument("--model", default=os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras"))
+    parser.add_argument("--output", help="result JSON (default outputs/benchmarks/<commit>-<scale>.json)")
+    parser.add_argument("--save-data", help="also write the synthetic dataset to this CSV")
+    parser.add_argument("--compare", help="earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown counted as a regression (0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    df = generate_retail_data(args.stores, args.products, args.days, seed=args.seed)
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    if args.save_data:
+        df.to_csv(args.save_data, index=False)
+
+    def selected(name):
+        return not args.only or any(part in name for part in args.only)
+
+    cases = {name: fn for name, fn in analytics_cases(df, build_rollup_cube(df)).items() if selected(name)}
+
+    model_kind = None
+    if any(selected(name) for name in ["preprocessing", "decision_engine", "model_comparison", "dashboard_snapshot"]):
+        model, model_kind = load_benchmark_model(args.model)
+        cases.update({name: fn for name, fn in model_cases(df, model).items() if selected(name)})
+
+    commit, dirty = git_revision()
+    scale = f"{args.stores}x{args.products}x{args.days}"
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = time_case(fn, args.repeat)
+        print(f"{name:<58}{results[name]['median_s'] * 1000:>12.2f} ms", flush=True)
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "stores": args.stores,
+            "products": args.products,
+            "days": args.days,
+            "rows": len(df),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "model": model_kind
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'nogit'}{'-dirty' if dirty else ''}-{scale}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{len(results)} cases → {output}")
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+
+    for key in ["stores", "products", "days", "seed", "model"]:
+        if baseline["meta"].get(key) != report["meta"][key]:
+            print(f"warning: {key} differs from the baseline "
+                  f"({baseline['meta'].get(key)} vs {report['meta'][key]})")
+
+    table, regressions = compare(baseline, report, args.threshold)
+
+    print(f"\nvs {baseline['meta'].get('commit')} ({args.compare})")
+    print(table.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower by more than {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+CSV ingest command line.
+
+Reads a retail inventory export in chunks with an explicit schema
+(categorical IDs, int32 / float32 numbers, parsed dates), rejects
+invalid rows and writes a typed Parquet store that load_data() and
+src.ingest.load_store() read back without re-parsing.
+
+Usage:
+    python ingest.py --data data/raw/retail_store_inventory.csv \\
+                     --output data/processed/retail_store_inventory.parquet
+    python ingest.py --data export.csv --chunksize 500000 --rejects rejects.csv
+"""
+
+import argparse
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(PROJECT_ROOT)
+
+from src.ingest import DEFAULT_CHUNKSIZE, ingest_csv
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+STORE_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "retail_store_inventory.parquet")
+
+
+def print_progress(report):
+    print(f"  chunk {report['chunks']:>4}: {report['rows_read']:>12,} rows read, "
+          f"{report['rows_rejected']:,} rejected", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked, validated CSV ingest into a Parquet store")
+    parser.add_argument("--data", default=DATA_PATH, help="retail inventory CSV")
+    parser.add_argument("--output", default=STORE_PATH, help="Parquet store to write")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk (bounds memory)")
+    parser.add_argument("--rejects", help="CSV for rejected rows (with a Reason column)")
+    parser.add_argument("--date-format", default="ISO8601", help="strftime format of the Date column")
+    args = parser.parse_args()
+
+    report = ingest_csv(args.data, args.output, args.chunksize, args.rejects,
+                        progress=print_progress, date_format=args.date_format)
+
+    print(f"\nIngested {report['rows_written']:,} of {report['rows_read']:,} rows "
+          f"({report['chunks']} chunks) → {args.output}")
+
+    for reason, count in sorted(report["reasons"].items(), key=lambda item: -item[1]):
+        print(f"  rejected {count:>10,}  {reason}")
+
+    print(f"\n{'seconds':<16}{report['seconds']:>12.2f}")
+    print(f"{'rows / second':<16}{report['rows_per_second']:>12,.0f}")
+    if report["peak_memory_mb"] is not None:
+        print(f"{'peak memory MB':<16}{report['peak_memory_mb']:>12.1f}")
+    print(f"{'CSV MB':<16}{report['csv_mb']:>12.1f}")
+    print(f"{'store MB':<16}{report['store_mb']:>12.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
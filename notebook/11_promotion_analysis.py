@@ -8,7 +8,8 @@ from src.data_utils import load_data
 from src.promotion_analysis import (
     promotion_uplift_analysis,
     promotion_effectiveness_score,
-    holiday_impact_analysis
+    holiday_impact_analysis,
+    promotion_uplift_table
 )
 
 DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
@@ -24,3 +25,6 @@ promotion_effectiveness_score(df)
 holiday_impact_analysis(df)
 
 
+#Uplift, holiday impact and promotion forecast error per level
+promo_table = promotion_uplift_table(df)
+print(promo_table.round(2).to_string())
@@ -9,6 +9,7 @@ from src.data_utils import load_data
 from src.pricing_engine import estimate_price_elasticity, competitor_price_alert
 from src.promotion_analysis import promotion_uplift_analysis, holiday_impact_analysis
 from src.regional_insights import region_growth_analysis
+from src.dashboard_snapshot import load_dashboard_snapshot, catalog_recommendations
 
 DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
 df = load_data(DATA_PATH)
@@ -38,3 +39,10 @@ generate_recommendations(
 )
 
 
+#Whole catalog in one rule-engine pass (needs the snapshot from notebook 17)
+SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, "outputs", "snapshot", "dashboard_snapshot.pkl")
+snapshot = load_dashboard_snapshot(SNAPSHOT_PATH)
+
+if snapshot is not None:
+    catalog = catalog_recommendations(snapshot, forecast_days=7, current_inventory=current_inventory)
+    print(catalog[catalog["Rank"] <= 3].to_string(index=False))
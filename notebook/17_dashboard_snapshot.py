@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.dashboard_snapshot import (
+    build_dashboard_snapshot,
+    save_dashboard_snapshot,
+    load_dashboard_snapshot,
+    snapshot_view
+)
+from tensorflow.keras.models import load_model
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, "outputs", "snapshot", "dashboard_snapshot.pkl")
+
+
+df = load_data(DATA_PATH)
+model = load_model(MODEL_PATH)
+
+
+#Precompute every store × product (forecast horizon covers the dashboard slider)
+start = time.perf_counter()
+snapshot = build_dashboard_snapshot(df, model, window_size=30, horizon=30)
+print(f"Snapshot built for {len(snapshot['index'])} series in {time.perf_counter() - start:.1f}s")
+
+save_dashboard_snapshot(snapshot, SNAPSHOT_PATH)
+
+
+
+#Check lookup latency
+snapshot = load_dashboard_snapshot(SNAPSHOT_PATH)
+store_id, product_id = next(iter(snapshot["index"]))
+
+start = time.perf_counter()
+view = snapshot_view(snapshot, store_id, product_id, forecast_days=7, current_inventory=500)
+print(f"Lookup: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+start = time.perf_counter()
+view = snapshot_view(snapshot, store_id, product_id, forecast_days=14, current_inventory=800)
+print(f"What-if lookup: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+print(view["recommendations"])
@@ -0,0 +1,39 @@
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.model_comparison import compare_catalog
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "outputs", "model_comparison")
+
+#Fraction of store × product series to evaluate (1.0 = full catalog)
+SAMPLE_FRAC = 0.25
+
+
+#Worker processes are spawned, so the run must sit under a main guard
+if __name__ == "__main__":
+
+    df = load_data(DATA_PATH)
+
+    start = time.perf_counter()
+    results, board = compare_catalog(df, MODEL_PATH, window_size=30, sample_frac=SAMPLE_FRAC)
+    print(f"Evaluated {results[['Store ID', 'Product ID']].drop_duplicates().shape[0]} series "
+          f"in {time.perf_counter() - start:.1f}s\n")
+
+    print(board.to_string(index=False))
+
+    failed = results[results["Error"].notna()]
+    if len(failed):
+        print(f"\n{len(failed)} failed fits:")
+        print(failed[["Store ID", "Product ID", "Model", "Error"]].to_string(index=False))
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(os.path.join(OUTPUT_DIR, "series_results.csv"), index=False)
+    board.to_csv(os.path.join(OUTPUT_DIR, "leaderboard.csv"), index=False)
@@ -0,0 +1,38 @@
+import sys
+import os
+import time
+import matplotlib.pyplot as plt
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.backtesting import backtest, error_by_horizon, backtest_summary
+from tensorflow.keras.models import load_model
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+
+
+df = load_data(DATA_PATH)
+model = load_model(MODEL_PATH)
+
+
+#Rolling-origin backtest: 8 cutoffs, one week apart, 7-day horizon
+start = time.perf_counter()
+results = backtest(df, model, window_size=30, horizon=7, step=7, n_cutoffs=8)
+print(f"Backtest: {len(results)} forecast points in {time.perf_counter() - start:.1f}s\n")
+
+print(backtest_summary(results).to_string(index=False))
+
+
+#Error by horizon day
+mae_by_horizon = error_by_horizon(results, "MAE")
+print(mae_by_horizon.round(2))
+
+mae_by_horizon.T.plot(marker="o", figsize=(10, 4))
+plt.xlabel("Days ahead")
+plt.ylabel("MAE")
+plt.title("Backtest Error by Horizon")
+plt.show()
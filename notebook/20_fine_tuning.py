@@ -0,0 +1,34 @@
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.fine_tuning import run_fine_tuning_job
+from src.model_registry import version_metadata, load_manifest
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+
+#Set True to fine-tune even when the drift monitor is quiet
+FORCE = False
+
+
+df = load_data(DATA_PATH)
+
+production = version_metadata()
+print("Production watermark:", production["watermark"] if production else None)
+
+
+#Drift check → warm-start fine-tuning on windows since the watermark (+ replay sample)
+start = time.perf_counter()
+result = run_fine_tuning_job(df, MODEL_PATH, force=FORCE, epochs=3, replay_fraction=0.2)
+print(f"Job finished in {time.perf_counter() - start:.1f}s")
+
+for key, value in result.items():
+    print(f"{key}: {value}")
+
+print("Registered versions:", list(load_manifest().get("lstm", {}).get("versions", {})))
@@ -0,0 +1,29 @@
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.model_registry import load_model_cached
+from src.forecast_router import route_catalog, route_accuracy
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+
+
+df = load_data(DATA_PATH)
+model = load_model_cached()
+
+
+#Route per store × product
+routes = route_catalog(df)
+print(routes.to_string(index=False))
+print()
+print(routes["Route"].value_counts())
+
+
+#Routed forecasts vs LSTM everywhere on the last 7 days
+report = route_accuracy(df, model, horizon=7)
+print()
+print(report.round(4).to_string(index=False))
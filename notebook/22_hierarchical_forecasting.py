@@ -0,0 +1,30 @@
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.model_registry import load_model_cached
+from src.hierarchical_forecast import hierarchical_forecast, hierarchy_accuracy
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+
+
+df = load_data(DATA_PATH)
+model = load_model_cached()
+
+
+#Reconciliation methods on the last 7 days (MAE per level)
+report = hierarchy_accuracy(df, model, horizon=7)
+print(report.round(2).to_string(index=False))
+
+
+#Coherent 7-day forecasts at every level (MinT)
+forecast = hierarchical_forecast(df, model, horizon=7, method="mint_shrink")
+
+for level in ["Total", "Region", "Category", "Store"]:
+    print()
+    print(forecast.loc[forecast["Level"] == level, ["Node", "Total Forecast", "Base Total"]]
+          .round(1).to_string(index=False))
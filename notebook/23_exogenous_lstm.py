@@ -0,0 +1,29 @@
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.exogenous_model import train_exogenous_model
+from src.what_if_simulation import simulate_price_change_model
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+
+
+df = load_data(DATA_PATH)
+
+
+#Train the exogenous-feature LSTM on all store × product series
+model, test_mse, version = train_exogenous_model(df, window_size=30, epochs=10)
+print(f"Registered lstm_exog/{version}  test MSE (scaled): {test_mse:.5f}")
+
+
+#Price what-if through the model
+store_id, product_id = df["Store ID"].iloc[0], df["Product ID"].iloc[0]
+
+for change in [-20, -10, -5, 5, 10, 20]:
+    sim = simulate_price_change_model(model, df, store_id, product_id, change)
+    print(f"Price {change:+d}%  →  new price {sim['New Price']:.2f}, "
+          f"demand {sim['Estimated Demand Change %']:+.2f}%")
@@ -0,0 +1,28 @@
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.demand_segmentation import segment_catalog
+
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv")
+
+
+df = load_data(DATA_PATH)
+
+
+#ABC / XYZ / demand pattern per store × product
+segments = segment_catalog(df)
+print(segments.round(3).to_string())
+
+
+#Catalog mix
+print()
+print(segments["Demand Pattern"].value_counts())
+print()
+print(segments.groupby("ABC", observed=True)["Revenue"].agg(["size", "sum"]))
+print()
+print(segments["Segment"].value_counts())
@@ -0,0 +1,290 @@
+"""
+Headless forecasting REST service (ASGI).
+
+Run:
+    uvicorn service:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+    GET  /health
+    GET  /metrics                 per-stage latencies and counters (Prometheus text format)
+    GET  /catalog                 stores → products
+    POST /forecast                {"store_id", "product_id", "forecast_days"}
+    POST /decision                {"store_id", "product_id", "forecast_days", "current_inventory"}
+    POST /elasticity              {"store_id", "product_id", "current_price" (optional)}
+    GET  /alerts                  current competitor price alerts (?store_id=S001 for one store)
+    GET  /alerts/events           alert / cleared events (?after=<sequence> to poll)
+    POST /prices                  {"rows": [{"date", "store_id", "product_id", "price",
+                                             "competitor_price", "category" (optional)}]}
+
+Concurrent /forecast and /decision requests are coalesced by a
+micro-batcher into one batched LSTM call.
+
+Environment:
+    FORECAST_DATA_PATH, FORECAST_MODEL_PATH   override default paths
+    FORECAST_MAX_BATCH                        max requests per batch (64)
+    FORECAST_MAX_WAIT_MS                      batching window in ms (5)
+    PIPELINE_METRICS_LOG                      also append every timing / counter as JSON lines
+"""
+
+import os
+import sys
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(PROJECT_ROOT)
+
+from src.data_utils import load_data
+from src.forecast_service import ForecastService, MAX_FORECAST_DAYS
+from src.instrumentation import METRICS
+from src.micro_batcher import MicroBatcher
+from src.model_registry import load_model_cached
+
+
+DATA_PATH = os.environ.get(
+    "FORECAST_DATA_PATH", os.path.join(PROJECT_ROOT, "data", "raw", "retail_store_inventory.csv"))
+MODEL_PATH = os.environ.get(
+    "FORECAST_MODEL_PATH", os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras"))
+MAX_BATCH = int(os.environ.get("FORECAST_MAX_BATCH", 64))
+MAX_WAIT_MS = float(os.environ.get("FORECAST_MAX_WAIT_MS", 5))
+
+
+class RequestError(Exception):
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def load_service():
+    return ForecastService(load_data(DATA_PATH), load_model_cached(MODEL_PATH))
+
+
+async def parse_request(request, forecast=True):
+    """
+    Validate the JSON body; returns (store_id, product_id, forecast_days, body).
+    """
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise RequestError("Body must be JSON")
+
+    if not isinstance(body, dict) or "store_id" not in body or "product_id" not in body:
+        raise RequestError("store_id and product_id are required")
+
+    store_id, product_id = body["store_id"], body["product_id"]
+
+    if not isinstance(store_id, str) or not isinstance(product_id, str):
+        raise RequestError("store_id and product_id must be strings")
+
+    if not request.app.state.service.has(store_id, product_id):
+        raise RequestError(f"Unknown store/product: {store_id}/{product_id}", 404)
+
+    forecast_days = body.get("forecast_days", 7)
+
+    if forecast and (isinstance(forecast_days, bool) or not isinstance(forecast_days, int)
+                     or not 1 <= forecast_days <= MAX_FORECAST_DAYS):
+        raise RequestError(f"forecast_days must be an integer between 1 and {MAX_FORECAST_DAYS}")
+
+    return store_id, product_id, forecast_days, body
+
+
+def error_response(e):
+    return JSONResponse({"error": str(e)}, status_code=e.status_code)
+
+
+# ENDPOINTS
+# =========================================================
+async def health(request):
+
+    service = request.app.state.service
+
+    return JSONResponse({
+        "status": "ok",
+        "series": len(service.index),
+        **request.app.state.batcher.stats()
+    })
+
+
+async def metrics(request):
+    return PlainTextResponse(METRICS.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def catalog(request):
+    return JSONResponse(request.app.state.service.stores)
+
+
+async def forecast(request):
+
+    try:
+        store_id, product_id, forecast_days, _ = await parse_request(request)
+    except RequestError as e:
+        return error_response(e)
+
+    result = await request.app.state.batcher.submit((store_id, product_id, forecast_days))
+
+    return JSONResponse({
+        "store_id": store_id,
+        "product_id": product_id,
+        "forecast_days": forecast_days,
+        "forecast": result["forecast"].tolist(),
+        "total_forecast": float(result["forecast"].sum()),
+        "residual_std": result["residual_std"]
+    })
+
+
+async def decision(request):
+
+    try:
+        store_id, product_id, forecast_days, body = await parse_request(request)
+        current_inventory = float(body.get("current_inventory", 500))
+    except RequestError as e:
+        return error_response(e)
+    except (TypeError, ValueError):
+        return error_response(RequestError("current_inventory must be a number"))
+
+    service = request.app.state.service
+    result = await request.app.state.batcher.submit((store_id, product_id, forecast_days))
+    segment = service.segment(store_id, product_id)
+
+    return JSONResponse({
+        "store_id": store_id,
+        "product_id": product_id,
+        "forecast_days": forecast_days,
+        **segment,
+        **service.decision(result, current_inventory, segment["abc_class"])
+    })
+
+
+async def elasticity(request):
+
+    try:
+        store_id, product_id, _, body = await parse_request(request, forecast=False)
+        current_price = body.get("current_price")
+        current_price = None if current_price is None else float(current_price)
+    except RequestError as e:
+        return error_response(e)
+    except (TypeError, ValueError):
+        return error_response(RequestError("current_price must be a number"))
+
+    result = await run_in_threadpool(request.app.state.service.elasticity, store_id, product_id, current_price)
+
+    return JSONResponse({"store_id": store_id, "product_id": product_id, **result})
+
+
+def alert_json(alert):
+    return {
+        "store_id": alert["Store ID"],
+        "product_id": alert["Product ID"],
+        "category": alert["Category"],
+        "date": str(alert["Date"].date()),
+        "price": alert["Price"],
+        "competitor_price": alert["Competitor Pricing"],
+        "price_gap_percent": alert["Price Gap %"] if np.isfinite(alert["Price Gap %"]) else None,
+        "threshold_percent": alert["Threshold %"],
+        **({"event": alert["Event"], "sequence": alert["Sequence"]} if "Event" in alert else {})
+    }
+
+
+async def alerts(request):
+
+    index = request.app.state.service.alerts
+    store_id = request.query_params.get("store_id")
+
+    if store_id is not None:
+        current = index.current_alerts(store_id)
+    else:
+        current = [alert for store in list(index.by_store) for alert in index.current_alerts(store)]
+
+    return JSONResponse({"alerts": [alert_json(alert) for alert in current]})
+
+
+async def alert_events(request):
+
+    try:
+        after = int(request.query_params.get("after", 0))
+    except ValueError:
+        return error_response(RequestError("after must be an integer"))
+
+    events = request.app.state.service.alerts.events_after(after)
+
+    return JSONResponse({"events": [alert_json(event) for event in events]})
+
+
+async def prices(request):
+    """
+    Ingest new price observations; returns the alert events they trigger.
+    """
+
+    index = request.app.state.service.alerts
+
+    try:
+        body = await request.json()
+        rows = body["rows"]
+        if not isinstance(rows, list) or not all(
+                isinstance(row, dict) and isinstance(row.get("store_id"), str)
+                and isinstance(row.get("product_id"), str) for row in rows):
+            raise TypeError("rows must be objects with string store_id and product_id")
+        frame = pd.DataFrame({
+            "Date": pd.to_datetime([row["date"] for row in rows]),
+            "Store ID": [row["store_id"] for row in rows],
+            "Product ID": [row["product_id"] for row in rows],
+            "Category": [
+                row.get("category") or index.latest.get((row["store_id"], row["product_id"]), {}).get("Category")
+                for row in rows
+            ],
+            "Price": [float(row["price"]) for row in rows],
+            "Competitor Pricing": [float(row["competitor_price"]) for row in rows]
+        })
+    except (ValueError, KeyError, TypeError):
+        return error_response(RequestError(
+            "Body must be JSON with rows of date, store_id, product_id, price, competitor_price"))
+
+    price_values = frame[["Price", "Competitor Pricing"]].values
+    if not (np.isfinite(price_values) & (price_values > 0)).all():
+        return error_response(RequestError("price and competitor_price must be positive numbers"))
+
+    events = index.ingest(frame)
+
+    return JSONResponse({"ingested": len(frame), "events": [alert_json(event) for event in events]})
+
+
+# APP
+# =========================================================
+@contextlib.asynccontextmanager
+async def lifespan(app):
+
+    service = await run_in_threadpool(load_service)
+    batcher = MicroBatcher(service.forecast_batch, max_batch_size=MAX_BATCH, max_wait_ms=MAX_WAIT_MS)
+    await batcher.start()
+
+    app.state.service = service
+    app.state.batcher = batcher
+
+    yield
+
+    await batcher.stop()
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health),
+        Route("/metrics", metrics),
+        Route("/catalog", catalog),
+        Route("/forecast", forecast, methods=["POST"]),
+        Route("/decision", decision, methods=["POST"]),
+        Route("/elasticity", elasticity, methods=["POST"]),
+        Route("/alerts", alerts),
+        Route("/alerts/events", alert_events),
+        Route("/prices", prices, methods=["POST"]),
+    ],
+    lifespan=lifespan
+)
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundTaskPool:
+    """
+    Shared executor for dashboard computations.
+
+    Jobs are identified by a hashable key, e.g.
+    ("forecast", store_id, product_id, forecast_days, data_ver, model_ver).
+    Submitting a key that is already running (or finished) returns the
+    existing future, so identical requests from several sessions share one
+    computation. The most recent finished results are kept for reuse.
+    """
+
+    def __init__(self, max_workers=4, max_finished=256):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        Return the future for key, starting fn(*args, **kwargs) if needed.
+        Failed jobs are retried on the next submit.
+        """
+
+        with self._lock:
+            future = self._futures.get(key)
+
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._futures.move_to_end(key)
+                return future
+
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._futures[key] = future
+            self._evict()
+
+            return future
+
+    def result_if_ready(self, key):
+        """
+        Result for key if its job has finished successfully, else None.
+        """
+
+        with self._lock:
+            future = self._futures.get(key)
+
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+
+        return future.result()
+
+    def error(self, key):
+        """
+        Exception raised by key's job if it finished with one, else None.
+        """
+
+        with self._lock:
+            future = self._futures.get(key)
+
+        if future is None or not future.done():
+            return None
+
+        return future.exception()
+
+    def discard(self, key):
+        """
+        Forget key's job, e.g. a failed one the user chose to retry.
+        """
+
+        with self._lock:
+            self._futures.pop(key, None)
+
+    def pending(self, key):
+
+        with self._lock:
+            future = self._futures.get(key)
+
+        return future is not None and not future.done()
+
+    def _evict(self):
+
+        finished = [k for k, f in self._futures.items() if f.done()]
+
+        for key in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._futures[key]
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import scale_series
+from src.decision_engine import forecast_demand_batch
+
+
+BACKTEST_MODELS = ["LSTM", "Naive", "Moving Average", "Seasonal Naive"]
+SEASON = 7
+MA_WINDOW = 7
+
+
+def rolling_origins(n, window_size=30, horizon=7, step=7, n_cutoffs=8):
+    """
+    Forecast origins (index of the first forecast day), oldest first.
+    The latest origin leaves exactly `horizon` days to score;
+    earlier ones step back by `step` days.
+    """
+
+    cutoffs = np.arange(n - horizon, window_size - 1, -step)
+
+    if n_cutoffs:
+        cutoffs = cutoffs[:n_cutoffs]
+
+    return cutoffs[::-1]
+
+
+def baseline_paths(windows, horizon, name):
+    """
+    Multi-day baseline forecasts from raw windows of shape (n, window_size).
+    Returns shape (n, horizon).
+    """
+
+    if name == "Naive":
+        return np.repeat(windows[:, -1:], horizon, axis=1)
+
+    if name == "Moving Average":
+        return np.repeat(windows[:, -MA_WINDOW:].mean(axis=1, keepdims=True), horizon, axis=1)
+
+    if name == "Seasonal Naive":
+        return windows[:, -SEASON + np.arange(horizon) % SEASON]
+
+    raise ValueError(f"Unknown baseline: {name}")
+
+
+def backtest(df, model=None, window_size=30, horizon=7, step=7, n_cutoffs=8, models=BACKTEST_MODELS):
+    """
+    Rolling-origin evaluation over every store × product.
+
+    Each series is windowed once (sliding_window_view, no copies); windows
+    for all cutoffs of all series are stacked so the LSTM runs one batched
+    recursive forecast (one model call per horizon day) and baselines are
+    plain array operations.
+
+    Returns one row per series × model × cutoff × horizon day.
+    """
+
+    if model is None:
+        models = [m for m in models if m != "LSTM"]
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values(["Store ID", "Product ID", "Date"])
+
+    keys, cutoff_dates = [], []
+    raw_windows, scaled_windows, actuals, mins, ranges = [], [], [], [], []
+
+    for (store_id, product_id), group in df.groupby(["Store ID", "Product ID"], sort=False):
+
+        demand = group["Units Sold"].values.astype(np.float32)
+        cutoffs = rolling_origins(len(demand), window_size, horizon, step, n_cutoffs)
+
+        if len(cutoffs) == 0:
+            continue
+
+        scaled, scaler = scale_series(demand.reshape(-1, 1))
+
+        # window ending the day before cutoff c starts at c - window_size
+        window_view = np.lib.stride_tricks.sliding_window_view(demand, window_size)
+        scaled_view = np.lib.stride_tricks.sliding_window_view(scaled[:, 0], window_size)
+        target_view = np.lib.stride_tricks.sliding_window_view(demand, horizon)
+
+        raw_windows.append(window_view[cutoffs - window_size])
+        scaled_windows.append(scaled_view[cutoffs - window_size])
+        actuals.append(target_view[cutoffs])
+        mins.append(np.full(len(cutoffs), scaler.data_min_[0], dtype=np.float32))
+        ranges.append(np.full(len(cutoffs), scaler.data_range_[0], dtype=np.float32))
+
+        keys.extend([(store_id, product_id)] * len(cutoffs))
+        cutoff_dates.append(group["Date"].values[cutoffs])
+
+    if not keys:
+        return pd.DataFrame(columns=["Store ID", "Product ID", "Model", "Cutoff", "Horizon",
+                                     "Actual", "Forecast", "Error"])
+
+    raw_windows = np.concatenate(raw_windows)
+    actual = np.concatenate(actuals)
+    cutoff_dates = np.concatenate(cutoff_dates)
+
+    forecasts = {}
+
+    for name in models:
+        if name == "LSTM":
+            scaled_pred = forecast_demand_batch(model, np.concatenate(scaled_windows), horizon)
+            forecasts[name] = scaled_pred * np.concatenate(ranges)[:, None] + np.concatenate(mins)[:, None]
+        else:
+            forecasts[name] = baseline_paths(raw_windows, horizon, name)
+
+    n_rows = len(keys)
+    stores = np.array([k[0] for k in keys], dtype=object)
+    products = np.array([k[1] for k in keys], dtype=object)
+    horizons = np.tile(np.arange(1, horizon + 1), n_rows)
+
+    frames = []
+
+    for name, forecast in forecasts.items():
+        frames.append(pd.DataFrame({
+            "Store ID": np.repeat(stores, horizon),
+            "Product ID": np.repeat(products, horizon),
+            "Model": name,
+            "Cutoff": np.repeat(cutoff_dates, horizon),
+            "Horizon": horizons,
+            "Actual": actual.ravel(),
+            "Forecast": forecast.ravel(),
+        }))
+
+    results = pd.concat(frames, ignore_index=True)
+    results["Error"] = results["Forecast"] - results["Actual"]
+
+    return results
+
+
+def error_by_horizon(results, metric="MAE"):
+    """
+    Model × horizon-day error table (MAE or RMSE).
+    """
+
+    errors = results["Error"].abs() if metric == "MAE" else results["Error"] ** 2
+    table = errors.groupby([results["Model"], results["Horizon"]]).mean().unstack("Horizon")
+
+    return np.sqrt(table) if metric == "RMSE" else table
+
+
+def backtest_summary(results):
+    """
+    Overall MAE / RMSE / MAPE per model across cutoffs and horizons.
+    """
+
+    nonzero = results["Actual"] != 0
+
+    summary = pd.DataFrame({
+        "MAE": results["Error"].abs().groupby(results["Model"]).mean(),
+        "RMSE": np.sqrt((results["Error"] ** 2).groupby(results["Model"]).mean()),
+        "MAPE": (results.loc[nonzero, "Error"].abs() / results.loc[nonzero, "Actual"])
+                .groupby(results.loc[nonzero, "Model"]).mean() * 100,
+        "Cutoffs": results.groupby("Model")["Cutoff"].nunique()
+    })
+
+    return summary.sort_values("MAE").reset_index()
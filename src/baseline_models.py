@@ -0,0 +1,81 @@
+import numpy as np
+
+
+def naive_forecast(X):
+    """
+    Tomorrow = today. X: sequences of shape (n, window_size, 1).
+    Returns predictions of shape (n, 1).
+    """
+
+    return X[:, -1, 0].reshape(-1, 1)
+
+
+def moving_average_forecast(X, window=7):
+    """
+    Mean of the last `window` days of each sequence.
+    """
+
+    return X[:, -window:, 0].mean(axis=1).reshape(-1, 1)
+
+
+def seasonal_naive_forecast(X, season=7):
+    """
+    Same day last week (value `season` days back).
+    """
+
+    return X[:, -season, 0].reshape(-1, 1)
+
+
+def exponential_smoothing_forecast(X, alpha=0.3):
+    """
+    Simple exponential smoothing level after the last day
+    (flat forecast). Smooths all sequences at once, one step per day.
+    """
+
+    level = X[:, 0, 0].astype(float)
+
+    for t in range(1, X.shape[1]):
+        level = alpha * X[:, t, 0] + (1 - alpha) * level
+
+    return level.reshape(-1, 1)
+
+
+def croston_forecast(X, alpha=0.1):
+    """
+    Croston's method for intermittent demand: smoothed non-zero demand size
+    divided by smoothed interval between non-zero days (flat forecast).
+    """
+
+    values = X[:, :, 0].astype(float)
+    n, T = values.shape
+
+    size = np.zeros(n)
+    interval = np.ones(n)
+    since_last = np.ones(n)
+    seen = np.zeros(n, dtype=bool)
+
+    for t in range(T):
+        demand = values[:, t]
+        hit = demand > 0
+
+        first = hit & ~seen
+        update = hit & seen
+
+        size[first] = demand[first]
+        interval[first] = since_last[first]
+        size[update] += alpha * (demand[update] - size[update])
+        interval[update] += alpha * (since_last[update] - interval[update])
+
+        seen |= hit
+        since_last = np.where(hit, 1, since_last + 1)
+
+    return np.where(seen, size / interval, 0.0).reshape(-1, 1)
+
+
+BASELINES = {
+    "Naive": naive_forecast,
+    "Moving Average": moving_average_forecast,
+    "Seasonal Naive": seasonal_naive_forecast,
+    "Exponential Smoothing": exponential_smoothing_forecast,
+    "Croston": croston_forecast
+}
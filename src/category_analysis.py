@@ -1,14 +1,24 @@
-import pandas as pd
-import numpy as np
+from src.rollup_cube import rollup_table, rollup_totals
+from src.sketches import AnalyticsSketch
+from src.instrumentation import timed
+
+
+# All functions take raw rows or a RollupCube (rollup_cube.build_rollup_cube);
+# with a cube they only read its small Category tables.
+# category_demand_share also takes an AnalyticsSketch (approximate mode, src/sketches.py).
 
 
 # 1️⃣ Category Demand Contribution
+@timed()
 def category_demand_share(df):
     """
     Compute percentage contribution of each category to total sales.
     """
 
-    category_sales = df.groupby("Category")["Units Sold"].sum().reset_index()
+    if isinstance(df, AnalyticsSketch):
+        return df.category_demand_share()
+
+    category_sales = rollup_totals(df, ("Category",))[["Category", "Units Sold"]]
     total_sales = category_sales["Units Sold"].sum()
 
     category_sales["Demand Share %"] = (
@@ -19,15 +29,14 @@ def category_demand_share(df):
 
 
 # 2️⃣ Category Growth Rate (Monthly)
+@timed()
 def category_growth_rate(df):
     """
     Compute monthly growth rate per category.
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["YearMonth"] = df["Date"].dt.to_period("M")
-
-    monthly_sales = df.groupby(["Category", "YearMonth"])["Units Sold"].sum().reset_index()
+    monthly_sales = rollup_table(df, ("Category",), "M")["Units Sold"].reset_index()
+    monthly_sales.insert(1, "YearMonth", monthly_sales.pop("Date").dt.to_period("M"))
 
     monthly_sales["Growth %"] = (
         monthly_sales.groupby("Category")["Units Sold"]
@@ -38,21 +47,16 @@ def category_growth_rate(df):
 
 
 # 3️⃣ Category Profitability
+@timed()
 def category_profitability(df):
     """
-    Estimate profit per category.
+    Estimate profit per category
+    (revenue after discount, cost = 60% of the list price).
     """
 
-    df["Effective Price"] = df["Price"] * (1 - df["Discount"] / 100)
-    df["Revenue"] = df["Units Sold"] * df["Effective Price"]
-    df["Estimated Cost"] = df["Units Sold"] * (df["Price"] * 0.6)
-    df["Estimated Profit"] = df["Revenue"] - df["Estimated Cost"]
-
-    category_profit = df.groupby("Category").agg({
-        "Revenue": "sum",
-        "Estimated Profit": "sum",
-        "Units Sold": "sum"
-    }).reset_index()
+    category_profit = rollup_totals(df, ("Category",))[
+        ["Category", "Revenue", "Estimated Profit", "Units Sold"]
+    ]
 
     category_profit["Profit Margin %"] = (
         category_profit["Estimated Profit"] /
@@ -63,18 +67,21 @@ def category_profitability(df):
 
 
 # 4️⃣ Category Seasonal Index
+@timed()
 def category_seasonal_index(df):
     """
     Compute seasonal index per category (monthly).
+    Averages are per raw row, as before: Units Sold / Rows.
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.month
+    monthly = rollup_table(df, ("Category",), "M").reset_index()
+    monthly["Month"] = monthly["Date"].dt.month
 
-    overall_avg = df.groupby("Category")["Units Sold"].mean().reset_index()
-    overall_avg.columns = ["Category", "Overall Avg"]
+    totals = monthly.groupby("Category")[["Units Sold", "Rows"]].sum()
+    overall_avg = (totals["Units Sold"] / totals["Rows"]).rename("Overall Avg").reset_index()
 
-    monthly_avg = df.groupby(["Category", "Month"])["Units Sold"].mean().reset_index()
+    month_totals = monthly.groupby(["Category", "Month"])[["Units Sold", "Rows"]].sum()
+    monthly_avg = (month_totals["Units Sold"] / month_totals["Rows"]).rename("Units Sold").reset_index()
 
     seasonal_index = monthly_avg.merge(overall_avg, on="Category")
 
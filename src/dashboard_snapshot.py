@@ -0,0 +1,492 @@
+import os
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.data_utils import filter_store_product
+from src.preprocessing import scale_series, create_sequences
+from src.decision_engine import (
+    forecast_demand_batch, forecast_with_uncertainty, residual_std_batch, service_level_z
+)
+from src.regional_insights import (
+    region_growth_analysis, region_profitability_analysis,
+    region_demand_volatility, region_stock_efficiency
+)
+from src.seasonality_analysis import (
+    monthly_seasonal_pattern, seasonality_strength,
+    category_decomposition, long_cycle_trend
+)
+from src.promotion_analysis import (
+    promotion_uplift_analysis, holiday_impact_analysis, promotion_uplift_table, promotion_lookup
+)
+from src.pricing_engine import estimate_price_elasticity
+from src.price_alerts import build_alert_index
+from src.recommendation_engine import generate_recommendations, recommendation_features, evaluate_rules
+from src.category_analysis import category_profitability
+from src.rollup_cube import build_rollup_cube
+from src.demand_segmentation import product_volatility_classification, segment_catalog, segment_lookup
+from src.model_comparison import compare_models
+from src.instrumentation import timed
+
+
+SNAPSHOT_VERSION = 8
+HISTORY_DAYS = 60
+RESIDUAL_WINDOWS = 50
+
+
+def sku_kpis(ts_df):
+    """
+    Executive KPIs for a single store × product series.
+    """
+
+    total_revenue = (ts_df["Units Sold"] * ts_df["Price"] * (1 - ts_df["Discount"] / 100)).sum()
+    estimated_cost = (ts_df["Units Sold"] * ts_df["Price"] * 0.6).sum()
+    total_profit = total_revenue - estimated_cost
+
+    return {
+        "Revenue": float(total_revenue),
+        "Profit": float(total_profit),
+        "Margin %": float(total_profit / total_revenue * 100) if total_revenue else 0.0,
+        "Growth %": float(region_growth_analysis(ts_df.copy())["Growth Rate %"].mean()),
+        "Volatility": float(ts_df["Units Sold"].std()),
+        "Efficiency": float(ts_df["Units Sold"].sum() / ts_df["Inventory Level"].sum())
+    }
+
+
+@timed()
+def global_analytics(df):
+    """
+    Dataset-wide analytics shared by every store × product view
+    (inputs to the recommendation engine and the seasonality heatmap).
+    """
+
+    df = df.copy()
+
+    # daily / monthly aggregates per category, region and store:
+    # every category / region table below reads the cube, not raw rows
+    rollup = build_rollup_cube(df)
+
+    return {
+        "rollup": rollup,
+        "monthly_pattern": monthly_seasonal_pattern(rollup),
+        "promotion_uplift": promotion_uplift_analysis(df),
+        "promotion_table": promotion_uplift_table(df),
+        "holiday_impact": holiday_impact_analysis(df),
+        "region_growth": region_growth_analysis(rollup),
+        "category_profitability": category_profitability(rollup),
+        "region_volatility": region_demand_volatility(rollup),
+        "region_efficiency": region_stock_efficiency(rollup),
+        # raw rows: the row-order trend the recommendation rules were written for
+        "long_trend": long_cycle_trend(df),
+        "segmentation": product_volatility_classification(df),
+        "segment_table": segment_catalog(df),
+        # latest price gap per store × product; views look up their own alert
+        "alert_index": build_alert_index(df)
+    }
+
+
+def sku_context(analytics, store_id, product_id):
+    """
+    Store × product rows of the catalog-wide lookup tables
+    (promotion effects, competitor alert, ABC / demand pattern segment).
+    """
+
+    return {
+        "promotion": promotion_lookup(analytics["promotion_table"], store_id, product_id),
+        "competitor_alert": analytics["alert_index"].alert(store_id, product_id),
+        "segment": segment_lookup(analytics["segment_table"], store_id, product_id)
+    }
+
+
+def segment_z(segment):
+    """
+    Safety-stock z of a segment row (sku_context()["segment"]):
+    the ABC service level, 1.96 when the series is not segmented.
+    """
+
+    return service_level_z((segment or {}).get("ABC"))
+
+
+def demand_segment(segmentation, product_id):
+
+    seg_rows = segmentation[segmentation["Product ID"] == product_id]
+
+    return seg_rows["Demand Segment"].values[0] if len(seg_rows) > 0 else "Unknown"
+
+
+def view_recommendations(view, analytics, current_inventory):
+    """
+    Run the recommendation engine for a dashboard view.
+    """
+
+    fc_total = float(np.sum(view["forecast"]))
+    safety = segment_z(view.get("segment")) * view["residual_std"]
+
+    # store × product promotion effects when known, dataset-wide otherwise
+    promotion = view.get("promotion")
+    holiday_impact = promotion if promotion else analytics["holiday_impact"]
+    promotion_uplift = promotion if promotion else analytics["promotion_uplift"]
+    competitor_alerts = [view["competitor_alert"]] if view.get("competitor_alert") else []
+    segment = view.get("segment") or {}
+
+    return generate_recommendations(
+        fc_total, safety, current_inventory, view["elasticity"],
+        competitor_alerts, analytics["region_growth"],
+        holiday_impact, promotion_uplift,
+        analytics["category_profitability"], analytics["region_volatility"],
+        analytics["region_efficiency"], view["seasonality_strength"],
+        analytics["long_trend"], view["demand_segment"],
+        segment.get("Demand Pattern"), segment.get("ABC")
+    )
+
+
+def run_model_comparison(model, X, y, scaler, demand):
+    """
+    LSTM vs ARIMA for the dashboard. ARIMA uses the fast least-squares
+    estimator; a statsmodels fit per render took longer than the LSTM.
+    """
+
+    try:
+        return compare_models(model, X[:-RESIDUAL_WINDOWS], y[:-RESIDUAL_WINDOWS],
+                              X[-RESIDUAL_WINDOWS:], y[-RESIDUAL_WINDOWS:], scaler, demand, fast=True)
+    except Exception:
+        return {}, "LSTM"
+
+
+@timed()
+def summary_section(df, store_id, product_id):
+    """
+    KPIs and recent demand history for one store × product (no model needed).
+    """
+
+    ts_df = filter_store_product(df, store_id, product_id)
+
+    return {
+        "kpis": sku_kpis(ts_df),
+        "history": ts_df["Units Sold"].values[-HISTORY_DAYS:]
+    }
+
+
+@timed()
+def forecast_section(df, model, store_id, product_id, forecast_days=7, window_size=30):
+    """
+    Recursive forecast and residual spread for one store × product.
+    """
+
+    ts_df = filter_store_product(df, store_id, product_id)
+    demand = ts_df["Units Sold"].values.reshape(-1, 1)
+
+    return forecast_with_uncertainty(model, demand, window_size, forecast_days, RESIDUAL_WINDOWS)
+
+
+@timed()
+def model_performance_section(df, model, store_id, product_id, window_size=30):
+
+    ts_df = filter_store_product(df, store_id, product_id)
+
+    demand = ts_df["Units Sold"].values.reshape(-1, 1)
+    scaled, scaler = scale_series(demand)
+    X, y = create_sequences(scaled, window_size)
+
+    model_results, best_model = run_model_comparison(model, X, y, scaler, demand)
+
+    return {"model_results": model_results, "best_model": best_model}
+
+
+@timed()
+def seasonality_section(df, store_id, product_id, rollup=None):
+    """
+    Category seasonality of a store × product; rollup (RollupCube) avoids
+    aggregating the raw rows of the whole category.
+    """
+
+    ts_df = filter_store_product(df, store_id, product_id)
+    category = ts_df["Category"].iloc[0]
+    source = df if rollup is None else rollup
+
+    return {
+        "category": category,
+        "seasonality_strength": float(seasonality_strength(category_decomposition(source, category)))
+    }
+
+
+@timed()
+def pricing_section(df, store_id, product_id):
+
+    ts_df = filter_store_product(df, store_id, product_id)
+
+    return {
+        "elasticity": float(estimate_price_elasticity(df, store_id, product_id)),
+        "avg_price": float(ts_df["Price"].mean()),
+        "avg_competitor_price": float(ts_df["Competitor Pricing"].mean()),
+        "avg_units": float(ts_df["Units Sold"].mean())
+    }
+
+
+@timed()
+def regional_section(df, product_id, rollup=None):
+
+    return {
+        "regional_profitability": region_profitability_analysis(df if rollup is None else rollup, product_id)
+    }
+
+
+@timed()
+def compute_dashboard_view(df, model, store_id, product_id,
+                           forecast_days=7, current_inventory=500,
+                           window_size=30, analytics=None):
+    """
+    Live computation of everything the dashboard shows for one store × product.
+    """
+
+    if analytics is None:
+        analytics = global_analytics(df)
+
+    view = summary_section(df, store_id, product_id)
+    view.update(forecast_section(df, model, store_id, product_id, forecast_days, window_size))
+    view.update(model_performance_section(df, model, store_id, product_id, window_size))
+    view.update(seasonality_section(df, store_id, product_id, analytics["rollup"]))
+    view.update(pricing_section(df, store_id, product_id))
+    view.update(regional_section(df, product_id, analytics["rollup"]))
+    view["monthly_pattern"] = analytics["monthly_pattern"]
+    view["demand_segment"] = demand_segment(analytics["segmentation"], product_id)
+    view.update(sku_context(analytics, store_id, product_id))
+    view["recommendations"] = view_recommendations(view, analytics, current_inventory)
+
+    return view
+
+
+# =========================================================
+# OFFLINE SNAPSHOT
+# =========================================================
+@timed()
+def build_dashboard_snapshot(df, model, window_size=30, horizon=30,
+                             include_model_comparison=True,
+                             default_inventory=500, default_forecast_days=7):
+    """
+    Precompute the dashboard for every store × product into one indexed bundle.
+    Forecasts and residuals are predicted in batches across all series
+    (one model.predict per horizon day plus one for the residual windows).
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    analytics = global_analytics(df)
+    rollup = analytics["rollup"]
+
+    category_strength = {
+        category: float(seasonality_strength(category_decomposition(rollup, category)))
+        for category in df["Category"].unique()
+    }
+
+    regional_profit = {
+        product_id: region_profitability_analysis(rollup, product_id)
+        for product_id in df["Product ID"].unique()
+    }
+
+    keys, rows, windows, residual_X, residual_y = [], [], [], [], []
+    scalers, histories, comparisons = [], [], []
+
+    for (store_id, product_id), ts_df in df.groupby(["Store ID", "Product ID"]):
+
+        ts_df = ts_df.sort_values("Date")
+
+        if len(ts_df) <= window_size + RESIDUAL_WINDOWS:
+            continue
+
+        demand = ts_df["Units Sold"].values.reshape(-1, 1)
+        scaled, scaler = scale_series(demand)
+        X, y = create_sequences(scaled, window_size)
+
+        category = ts_df["Category"].iloc[0]
+
+        row = {"Store ID": store_id, "Product ID": product_id, "Category": category}
+        row.update(sku_kpis(ts_df))
+        row["Elasticity"] = float(estimate_price_elasticity(ts_df.copy()))
+        row["Avg Price"] = float(ts_df["Price"].mean())
+        row["Competitor Price"] = float(ts_df["Competitor Pricing"].mean())
+        row["Avg Units"] = float(ts_df["Units Sold"].mean())
+        row["Seasonality Strength"] = category_strength[category]
+        row["Demand Segment"] = demand_segment(analytics["segmentation"], product_id)
+
+        keys.append((store_id, product_id))
+        rows.append(row)
+        windows.append(scaled[-window_size:, 0])
+        residual_X.append(X[-RESIDUAL_WINDOWS:])
+        residual_y.append(y[-RESIDUAL_WINDOWS:])
+        scalers.append(scaler)
+        histories.append(demand[-HISTORY_DAYS:, 0])
+
+        if include_model_comparison:
+            comparisons.append(run_model_comparison(model, X, y, scaler, demand))
+        else:
+            comparisons.append(({}, "LSTM"))
+
+    n_series = len(keys)
+
+    forecast_scaled = forecast_demand_batch(model, np.array(windows), horizon)
+    residual_std = residual_std_batch(model, residual_X, residual_y, scalers)
+
+    forecast = np.empty((n_series, horizon), dtype=np.float32)
+
+    for i, scaler in enumerate(scalers):
+        forecast[i] = scaler.inverse_transform(forecast_scaled[i].reshape(-1, 1)).flatten()
+
+    history = np.full((n_series, HISTORY_DAYS), np.nan, dtype=np.float32)
+    for i, h in enumerate(histories):
+        history[i, HISTORY_DAYS - len(h):] = h
+
+    stores = {}
+    for store_id, product_id in keys:
+        stores.setdefault(store_id, []).append(product_id)
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "window_size": window_size,
+        "horizon": horizon,
+        "index": {key: i for i, key in enumerate(keys)},
+        "stores": stores,
+        "kpis": pd.DataFrame(rows),
+        "forecast": forecast,
+        "history": history,
+        "residual_std": residual_std,
+        "model_results": [c[0] for c in comparisons],
+        "best_model": [c[1] for c in comparisons],
+        "regional_profitability": regional_profit,
+        "analytics": analytics,
+        "default_inputs": {
+            "forecast_days": default_forecast_days,
+            "current_inventory": default_inventory
+        }
+    }
+
+    snapshot["recommendation_table"] = catalog_recommendations(snapshot, default_forecast_days, default_inventory)
+    snapshot["recommendations"] = (
+        snapshot["recommendation_table"].groupby("Row")["Recommendation"].agg(list).tolist()
+    )
+
+    return snapshot
+
+
+@timed()
+def catalog_recommendations(snapshot, forecast_days=7, current_inventory=500):
+    """
+    Ranked recommendations for every store × product in the snapshot
+    from one rule-engine pass (recommendation_engine.evaluate_rules).
+    current_inventory: scalar or one value per series.
+    Returns one row per series × recommendation.
+    """
+
+    analytics = snapshot["analytics"]
+    kpis = snapshot["kpis"]
+    keys = list(zip(kpis["Store ID"], kpis["Product ID"]))
+
+    # per-series promotion effects, dataset-wide values where a series is missing
+    nodes = [("Store × Product", f"{store_id} / {product_id}") for store_id, product_id in keys]
+    promotion = analytics["promotion_table"].reindex(nodes)
+    holiday_impact = promotion["Holiday Impact %"].fillna(analytics["holiday_impact"]["Holiday Impact %"])
+    uplift = promotion["Uplift %"].fillna(analytics["promotion_uplift"]["Uplift %"])
+
+    alert_index = analytics["alert_index"]
+    segments = analytics["segment_table"].reindex(pd.MultiIndex.from_tuples(keys))
+
+    features = recommendation_features(
+        snapshot["forecast"][:, :forecast_days].sum(axis=1),
+        np.array([service_level_z(abc) for abc in segments["ABC"].astype(object)]) * snapshot["residual_std"],
+        current_inventory,
+        kpis["Elasticity"].values,
+        competitor_alert=np.array([alert_index.alert(*key) is not None for key in keys]),
+        region_growth_data=analytics["region_growth"],
+        holiday_impact=holiday_impact.values,
+        promotion_uplift=uplift.values,
+        category_profitability=analytics["category_profitability"],
+        region_volatility=analytics["region_volatility"],
+        region_efficiency=analytics["region_efficiency"],
+        seasonality_strength_score=kpis["Seasonality Strength"].values,
+        long_term_trend=analytics["long_trend"],
+        demand_segment=kpis["Demand Segment"].astype(object).values,
+        demand_pattern=segments["Demand Pattern"].astype(object).values,
+        abc_class=segments["ABC"].astype(object).values,
+        keys=keys
+    )
+
+    return evaluate_rules(features)
+
+
+def save_dashboard_snapshot(snapshot, path):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_dashboard_snapshot(path):
+    """
+    Load a snapshot bundle. Returns None when missing or built by another version.
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        snapshot = pickle.load(f)
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    return snapshot
+
+
+@timed()
+def snapshot_view(snapshot, store_id, product_id, forecast_days=7, current_inventory=500):
+    """
+    Dashboard view for one store × product served from the snapshot.
+    Returns None when the series is not in the snapshot or the requested
+    horizon exceeds the precomputed one (caller falls back to live mode).
+    Only what-if inputs (inventory) trigger a live recommendation pass.
+    """
+
+    i = snapshot["index"].get((store_id, product_id))
+
+    if i is None or forecast_days > snapshot["horizon"]:
+        return None
+
+    row = snapshot["kpis"].iloc[i]
+    history = snapshot["history"][i]
+
+    view = {
+        "kpis": {k: row[k] for k in ["Revenue", "Profit", "Margin %", "Growth %", "Volatility", "Efficiency"]},
+        "history": history[~np.isnan(history)],
+        "forecast": snapshot["forecast"][i, :forecast_days],
+        "residual_std": float(snapshot["residual_std"][i]),
+        "model_results": snapshot["model_results"][i],
+        "best_model": snapshot["best_model"][i],
+        "monthly_pattern": snapshot["analytics"]["monthly_pattern"],
+        "category": row["Category"],
+        "seasonality_strength": row["Seasonality Strength"],
+        "elasticity": row["Elasticity"],
+        "avg_price": row["Avg Price"],
+        "avg_competitor_price": row["Competitor Price"],
+        "avg_units": row["Avg Units"],
+        "regional_profitability": snapshot["regional_profitability"].get(product_id, pd.DataFrame()),
+        "demand_segment": row["Demand Segment"],
+        **sku_context(snapshot["analytics"], store_id, product_id)
+    }
+
+    if current_inventory is None:
+        return view
+
+    defaults = snapshot["default_inputs"]
+
+    if (forecast_days == defaults["forecast_days"] and
+            current_inventory == defaults["current_inventory"]):
+        view["recommendations"] = snapshot["recommendations"][i]
+    else:
+        view["recommendations"] = view_recommendations(view, snapshot["analytics"], current_inventory)
+
+    return view
@@ -1,13 +1,36 @@
+import os
 import pandas as pd
+
+from src.instrumentation import timed
+
+
+@timed("load")
 def load_data(path: str) -> pd.DataFrame:
     """
-    Load raw retail inventory dataset from disk.
+    Load raw retail inventory dataset from disk
+    (CSV, or the typed Parquet store written by src/ingest.py).
     """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
     return pd.read_csv(path)
 
 
+def file_version(path):
+    """
+    Lightweight version tag for a file on disk (modification time + size).
+    Used as a cache key instead of hashing the loaded contents.
+    Returns None when the file does not exist.
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    stat = os.stat(path)
+
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
 
 
+@timed("filter")
 def filter_store_product(df, store_id, product_id):
     """
     Filter dataset for selected store and product.
@@ -1,29 +1,146 @@
 import numpy as np
 
+from src.demand_segmentation import segment_lookup
+from src.instrumentation import record_nbytes, timed, timer
+from src.preprocessing import FLOAT_DTYPE, scale_series, create_sequences
 
-def generate_inventory_decision(model,
-                                scaled_demand,
-                                scaler,
-                                residual_std,
-                                window_size=30,
-                                forecast_days=7,
-                                current_inventory=500):
 
-    last_sequence = scaled_demand[-window_size:]
-    future_predictions = []
+def forecast_demand(model, scaled_demand, scaler, window_size=30, forecast_days=7):
+    """
+    Recursive multi-day LSTM forecast for a single series.
+    Returns future demand in original units, shape (forecast_days, 1),
+    in the dtype of scaled_demand.
+    """
 
-    for _ in range(forecast_days):
-        pred = model.predict(last_sequence.reshape(1, window_size, 1))
-        future_predictions.append(pred[0][0])
-        last_sequence = np.append(last_sequence[1:], pred)
+    # last window followed by the predictions; day d reads buffer[d:d + window_size]
+    buffer = np.empty(window_size + forecast_days, dtype=scaled_demand.dtype)
+    buffer[:window_size] = scaled_demand[-window_size:, 0]
 
-    future_predictions = np.array(future_predictions).reshape(-1, 1)
-    future_demand = scaler.inverse_transform(future_predictions)
+    for day in range(forecast_days):
+        with timer("predict"):
+            pred = model.predict(buffer[day:day + window_size].reshape(1, window_size, 1), verbose=0)
+        buffer[window_size + day] = pred[0, 0]
 
-    total_forecast = np.sum(future_demand)
+    future_predictions = buffer[window_size:].reshape(-1, 1)
+    record_nbytes("predict", future_predictions)
+
+    with timer("inverse_transform"):
+        future_demand = scaler.inverse_transform(future_predictions)
+
+    record_nbytes("inverse_transform", future_demand)
+    return future_demand
+
+
+def forecast_demand_batch(model, windows, forecast_days=7):
+    """
+    Recursive forecast for many series at once.
+    windows: scaled last windows, shape (n_series, window_size).
+    Issues one model.predict per forecast day for the whole batch
+    and returns scaled predictions of shape (n_series, forecast_days).
+    """
+
+    windows = np.asarray(windows, dtype=FLOAT_DTYPE)
+    n_series, window_size = windows.shape
+
+    # last windows followed by the predictions; day d reads buffer[:, d:d + window_size]
+    buffer = np.empty((n_series, window_size + forecast_days), dtype=FLOAT_DTYPE)
+    buffer[:, :window_size] = windows
+
+    for day in range(forecast_days):
+        # predict_on_batch skips predict()'s per-call setup, which dominates for small batches
+        batch = np.ascontiguousarray(buffer[:, day:day + window_size]).reshape(n_series, window_size, 1)
+        with timer("predict"):
+            buffer[:, window_size + day] = np.asarray(model.predict_on_batch(batch))[:, 0]
+
+    predictions = buffer[:, window_size:]
+    record_nbytes("predict", buffer)
+
+    return predictions
+
+
+def forecast_with_uncertainty(model, demand, window_size=30, forecast_days=7, residual_windows=50,
+                              dtype=FLOAT_DTYPE):
+    """
+    Forecast plus residual spread of the most recent one-step predictions.
+    demand: raw Units Sold, shape (n, 1). dtype: scaled data path
+    (float64 only as a precision reference).
+    """
+
+    scaled_demand, scaler = scale_series(demand, dtype)
+
+    future_demand = forecast_demand(model, scaled_demand, scaler, window_size, forecast_days)
+
+    # only the tail is needed for residuals; skip windowing the full history
+    X, y = create_sequences(scaled_demand[-(window_size + residual_windows):], window_size)
+    with timer("predict"):
+        y_pred = model.predict(X, verbose=0)
+
+    with timer("inverse_transform"):
+        y_pred = scaler.inverse_transform(y_pred)
+        y_actual = scaler.inverse_transform(y)
+
+    return {
+        "forecast": future_demand.flatten(),
+        "residual_std": float(np.std(y_actual - y_pred))
+    }
+
+
+def residual_std_batch(model, residual_X, residual_y, scalers):
+    """
+    Residual spread of recent one-step predictions for many series
+    from a single model call.
+    residual_X / residual_y / scalers: one entry per series,
+    as produced by create_sequences and scale_series.
+    """
 
-    Z = 1.96
-    safety_stock = Z * residual_std
+    counts = [len(X) for X in residual_X]
+    with timer("predict"):
+        preds = np.asarray(model.predict_on_batch(np.concatenate(residual_X).astype(FLOAT_DTYPE, copy=False)))[:, 0]
+
+    residual_std = np.empty(len(counts), dtype=np.float32)
+    start = 0
+
+    with timer("inverse_transform"):
+        for i, (count, y, scaler) in enumerate(zip(counts, residual_y, scalers)):
+            y_pred = scaler.inverse_transform(preds[start:start + count].reshape(-1, 1))
+            y_actual = scaler.inverse_transform(y)
+            residual_std[i] = np.std(y_actual - y_pred)
+            start += count
+
+    return residual_std
+
+
+# safety-stock z per ABC revenue class (A items get the highest service level)
+SERVICE_LEVEL_Z = {"A": 2.33, "B": 1.96, "C": 1.65}
+
+
+def service_level_z(abc_class=None):
+    """
+    z for a store × product's ABC class; 1.96 when unknown.
+    """
+
+    return SERVICE_LEVEL_Z.get(abc_class, 1.96)
+
+
+def sku_service_level_z(segment_table, store_id, product_id):
+    """
+    z for a store × product looked up in a segment_catalog table
+    (1.96 when the table or the series is missing).
+    """
+
+    segment = segment_lookup(segment_table, store_id, product_id)
+
+    return service_level_z(segment["ABC"] if segment else None)
+
+
+@timed("decision")
+def inventory_decision(total_forecast, residual_std, current_inventory=500, z=1.96):
+    """
+    Reorder decision from a total forecast and residual std.
+    z sets the service level (service_level_z for ABC-based levels).
+    """
+
+    safety_stock = z * residual_std
 
     reorder_point = total_forecast + safety_stock
 
@@ -41,3 +158,23 @@ def generate_inventory_decision(model,
         "reorder_quantity": float(reorder_quantity),
         "status": status
     }
+
+
+def generate_inventory_decision(model,
+                                scaled_demand,
+                                scaler,
+                                residual_std,
+                                window_size=30,
+                                forecast_days=7,
+                                current_inventory=500,
+                                abc_class=None):
+    """
+    Forecast, then reorder decision at the ABC service level
+    (service_level_z; 1.96 when abc_class is unknown).
+    """
+
+    future_demand = forecast_demand(model, scaled_demand, scaler, window_size, forecast_days)
+
+    total_forecast = np.sum(future_demand)
+
+    return inventory_decision(total_forecast, residual_std, current_inventory, z=service_level_z(abc_class))
@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
 
+from src.instrumentation import timed
 
+
+@timed()
 def product_volatility_classification(df):
     """
     Classify products based on demand volatility.
@@ -18,3 +22,127 @@ def product_volatility_classification(df):
     )
 
     return volatility
+
+
+@timed()
+def demand_intermittency(df):
+    """
+    Intermittency per store × product:
+    share of zero-demand days and average demand interval (ADI,
+    days per non-zero day).
+    """
+
+    stats = df.groupby(["Store ID", "Product ID"])["Units Sold"].agg(
+        Days="size",
+        Nonzero=lambda s: int((s > 0).sum())
+    ).reset_index()
+
+    stats["Zero Share"] = 1 - stats["Nonzero"] / stats["Days"]
+    stats["ADI"] = stats["Days"] / stats["Nonzero"].where(stats["Nonzero"] > 0)
+
+    return stats[["Store ID", "Product ID", "Zero Share", "ADI"]]
+
+
+# Syntetos-Boylan cut-offs for demand patterns
+ADI_CUTOFF = 1.32
+CV2_CUTOFF = 0.49
+ABC_CUTOFFS = (0.8, 0.95)   # cumulative revenue share closing classes A and B
+XYZ_CUTOFFS = (0.5, 1.0)    # coefficient of variation closing classes X and Y
+
+
+@timed()
+def demand_matrix(df):
+    """
+    Demand cube as arrays: Units Sold and revenue per store × product × day,
+    shape (n_series, n_days), missing days = 0.
+    Returns (keys, units, revenue).
+    """
+
+    cube = df.assign(Revenue=df["Units Sold"] * df["Price"]).pivot_table(
+        index=["Store ID", "Product ID"],
+        columns="Date",
+        values=["Units Sold", "Revenue"],
+        aggfunc="sum",
+        fill_value=0
+    )
+
+    return (
+        cube.index,
+        cube["Units Sold"].values.astype(np.float64),
+        cube["Revenue"].values.astype(np.float64)
+    )
+
+
+@timed()
+def segment_catalog(df):
+    """
+    Segmentation of every store × product in one vectorised pass:
+
+    CV              std / mean of daily demand
+    ADI             days per non-zero demand day
+    CV²             squared CV of non-zero demand sizes
+    Demand Pattern  Smooth / Erratic / Intermittent / Lumpy (ADI × CV²)
+    ABC             revenue class (A = top 80% of revenue)
+    XYZ             variability class (X = CV ≤ 0.5)
+
+    Returns a compact table indexed by (Store ID, Product ID).
+    """
+
+    keys, units, revenue = demand_matrix(df)
+
+    mean = units.mean(axis=1)
+    cv = units.std(axis=1) / np.where(mean > 0, mean, np.nan)
+
+    nonzero = units > 0
+    n_nonzero = nonzero.sum(axis=1)
+    adi = units.shape[1] / np.where(n_nonzero > 0, n_nonzero, np.nan)
+
+    sizes = np.where(nonzero, units, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        size_mean = np.nanmean(sizes, axis=1)
+        cv2 = (np.nanstd(sizes, axis=1) / size_mean) ** 2
+
+    pattern = np.select(
+        [(adi < ADI_CUTOFF) & (cv2 < CV2_CUTOFF), adi < ADI_CUTOFF, cv2 < CV2_CUTOFF],
+        ["Smooth", "Erratic", "Intermittent"],
+        "Lumpy"
+    )
+    pattern = np.where(n_nonzero > 0, pattern, "No Demand")
+
+    total_revenue = revenue.sum(axis=1)
+    order = np.argsort(-total_revenue, kind="stable")
+    share = np.empty_like(total_revenue)
+    # share of revenue up to and including the series before each one,
+    # so the series crossing a cut-off still belongs to the higher class
+    share[order] = (np.cumsum(total_revenue[order]) - total_revenue[order]) / max(total_revenue.sum(), 1e-12)
+    abc = np.select([share < ABC_CUTOFFS[0], share < ABC_CUTOFFS[1]], ["A", "B"], "C")
+
+    xyz = np.select([cv <= XYZ_CUTOFFS[0], cv <= XYZ_CUTOFFS[1]], ["X", "Y"], "Z")
+
+    table = pd.DataFrame({
+        "Revenue": total_revenue.astype(np.float32),
+        "Mean Demand": mean.astype(np.float32),
+        "CV": cv.astype(np.float32),
+        "ADI": adi.astype(np.float32),
+        "CV2": cv2.astype(np.float32),
+        "Demand Pattern": pd.Categorical(pattern, ["Smooth", "Erratic", "Intermittent", "Lumpy", "No Demand"]),
+        "ABC": pd.Categorical(abc, ["A", "B", "C"]),
+        "XYZ": pd.Categorical(xyz, ["X", "Y", "Z"])
+    }, index=keys)
+
+    table["Segment"] = pd.Categorical(table["ABC"].astype(str) + table["XYZ"].astype(str))
+
+    return table
+
+
+def segment_lookup(table, store_id, product_id):
+    """
+    Segment row of one store × product as a dict, or None.
+    """
+
+    key = (store_id, product_id)
+
+    if table is None or key not in table.index:
+        return None
+
+    return table.loc[key].to_dict()
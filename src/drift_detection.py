@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import scale_series, create_sequences
+
+
+RECENT_WINDOW = 30
+THRESHOLD = 1.3  # recent error 30% above historical
+
+
+def detect_drift(y_actual, y_pred, recent_window=RECENT_WINDOW, threshold=THRESHOLD):
+    """
+    Compare recent absolute error with the historical level.
+    Drift when recent MAE > threshold × historical MAE.
+    """
+
+    errors = np.abs(np.asarray(y_actual, dtype=float) - np.asarray(y_pred, dtype=float)).flatten()
+
+    historical_mae = float(errors.mean())
+    recent_mae = float(errors[-recent_window:].mean())
+
+    return {
+        "historical_mae": historical_mae,
+        "recent_mae": recent_mae,
+        "ratio": recent_mae / historical_mae if historical_mae else np.nan,
+        "drift": recent_mae > threshold * historical_mae
+    }
+
+
+def catalog_drift(df, model, window_size=30, eval_windows=120,
+                  recent_window=RECENT_WINDOW, threshold=THRESHOLD):
+    """
+    Drift check for every store × product.
+    One-step predictions over the last eval_windows windows of all series
+    come from a single batched model call.
+    Returns one row per series.
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values(["Store ID", "Product ID", "Date"])
+
+    keys, X_all, y_all, scalers = [], [], [], []
+
+    for key, group in df.groupby(["Store ID", "Product ID"], sort=False):
+
+        demand = group["Units Sold"].values.reshape(-1, 1)
+
+        if len(demand) < window_size + recent_window * 2:
+            continue
+
+        scaled, scaler = scale_series(demand)
+        X, y = create_sequences(scaled[-(window_size + eval_windows):], window_size)
+
+        keys.append(key)
+        X_all.append(X)
+        y_all.append(y)
+        scalers.append(scaler)
+
+    if not keys:
+        return pd.DataFrame(columns=["Store ID", "Product ID", "historical_mae", "recent_mae", "ratio", "drift"])
+
+    preds = np.asarray(model.predict_on_batch(np.concatenate(X_all).astype(np.float32)))
+
+    rows, start = [], 0
+
+    for (store_id, product_id), y, scaler in zip(keys, y_all, scalers):
+        y_pred = scaler.inverse_transform(preds[start:start + len(y)])
+        y_actual = scaler.inverse_transform(y)
+        start += len(y)
+
+        rows.append({"Store ID": store_id, "Product ID": product_id,
+                     **detect_drift(y_actual, y_pred, recent_window, threshold)})
+
+    return pd.DataFrame(rows)
+
+
+def drift_triggered(report, min_fraction=0.2):
+    """
+    Retraining trigger: at least min_fraction of series are drifting.
+    """
+
+    return bool(len(report)) and float(report["drift"].mean()) >= min_fraction
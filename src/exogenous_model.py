@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+
+from src.feature_builder import FEATURES, COVARIATES, catalog_features, feature_windows
+from src.model_registry import PROJECT_ROOT, REGISTRY_DIR, register_model
+
+
+EXOG_MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_exog_model.keras")
+EXOG_MODEL_NAME = "lstm_exog"
+
+
+# TRAINING
+# =========================================================
+def training_windows(catalog, window_size=30, test_ratio=0.2):
+    """
+    Train / test windows of every series (time split per series).
+    Windows are views until the final concatenation.
+    """
+
+    X_train, y_train, X_test, y_test = [], [], [], []
+
+    for scaled, _, _ in catalog.values():
+
+        if len(scaled) <= window_size + 1:
+            continue
+
+        X, y = feature_windows(scaled, window_size)
+        split = int(len(X) * (1 - test_ratio))
+
+        X_train.append(X[:split])
+        y_train.append(y[:split])
+        X_test.append(X[split:])
+        y_test.append(y[split:])
+
+    return (np.concatenate(X_train), np.concatenate(y_train),
+            np.concatenate(X_test), np.concatenate(y_test))
+
+
+def train_exogenous_model(df, window_size=30, epochs=10, batch_size=64,
+                          registry_dir=REGISTRY_DIR, export_path=EXOG_MODEL_PATH):
+    """
+    Train the multivariate LSTM (Units Sold + COVARIATES) on all series
+    and register it as "lstm_exog" (exported to export_path).
+    Returns (model, test MSE, registered version).
+    """
+
+    from src.lstm_model import build_lstm_model
+
+    X_train, y_train, X_test, y_test = training_windows(catalog_features(df), window_size)
+
+    model = build_lstm_model(window_size, n_features=len(FEATURES))
+    model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size,
+              validation_data=(X_test, y_test), verbose=0)
+
+    test_mse = float(np.mean((np.asarray(model.predict_on_batch(X_test)) - y_test) ** 2))
+
+    version = register_model(
+        model, name=EXOG_MODEL_NAME, registry_dir=registry_dir, window_size=window_size,
+        metrics={"test_mse": test_mse, "features": FEATURES}, export_path=export_path
+    )
+
+    return model, test_mse, version
+
+
+# FORECASTING
+# =========================================================
+def forecast_exogenous_batch(model, windows, future_covariates):
+    """
+    Recursive forecast for many series with known future covariates.
+    windows: scaled last windows, shape (n_series, window_size, n_features),
+    whose last row already carries the covariates of forecast day 1.
+    future_covariates: scaled, shape (n_series, forecast_days, n_covariates).
+    One model call per forecast day; returns scaled Units Sold,
+    shape (n_series, forecast_days).
+    """
+
+    sequences = np.array(windows, dtype=np.float32)
+    n_series, forecast_days, _ = future_covariates.shape
+    predictions = np.empty((n_series, forecast_days), dtype=np.float32)
+
+    for day in range(forecast_days):
+        pred = np.asarray(model.predict_on_batch(sequences))[:, 0]
+        predictions[:, day] = pred
+
+        if day + 1 < forecast_days:
+            step = np.empty((n_series, 1, sequences.shape[2]), dtype=np.float32)
+            step[:, 0, 0] = pred
+            step[:, 0, 1:] = future_covariates[:, day + 1]
+            sequences = np.concatenate([sequences[:, 1:], step], axis=1)
+
+    return predictions
+
+
+def scenario_forecast(model, catalog, keys, forecast_days=7, window_size=30, changes=None):
+    """
+    Forecast keys under a covariate scenario, all series in one batch.
+
+    Future covariates repeat the last observed values, with
+    changes = {covariate: multiplier} applied (e.g. {"Price": 1.1}
+    for a 10% price increase, {"Holiday/Promotion": 0} to drop a promotion
+    — a multiplier, so 0 switches a flag off).
+    Returns raw Units Sold, shape (len(keys), forecast_days).
+    """
+
+    changes = changes or {}
+    windows, futures, mins, ranges = [], [], [], []
+
+    for key in keys:
+        scaled, series_mins, series_ranges = catalog[key]
+
+        raw_future = scaled[-1, 1:] * series_ranges[1:] + series_mins[1:]
+        for name, factor in changes.items():
+            raw_future[COVARIATES.index(name)] *= factor
+
+        future = (raw_future - series_mins[1:]) / series_ranges[1:]
+
+        window = scaled[-window_size:].copy()
+        window[-1, 1:] = future
+
+        windows.append(window)
+        futures.append(np.repeat(future[None], forecast_days, axis=0))
+        mins.append(series_mins[0])
+        ranges.append(series_ranges[0])
+
+    scaled_pred = forecast_exogenous_batch(model, np.stack(windows), np.stack(futures))
+
+    return scaled_pred * np.array(ranges)[:, None] + np.array(mins)[:, None]
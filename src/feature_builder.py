@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from src.promotion_analysis import promotion_flag, HOLIDAY_VALUES
+
+
+TARGET = "Units Sold"
+COVARIATES = ["Price", "Discount", "Holiday/Promotion", "Competitor Pricing", "Inventory Level"]
+FEATURES = [TARGET] + COVARIATES
+
+
+def covariate_matrix(df, covariates=COVARIATES):
+    """
+    Covariates of one series as float32, shape (n_days, n_covariates).
+    """
+
+    columns = [
+        promotion_flag(df[name], HOLIDAY_VALUES) if name == "Holiday/Promotion" else df[name].values
+        for name in covariates
+    ]
+
+    return np.column_stack(columns).astype(np.float32)
+
+
+def series_features(demand, covariates):
+    """
+    One contiguous float32 matrix per series, shape (n_days, 1 + n_covariates).
+
+    Row i holds Units Sold of day i and the covariates of day i + 1,
+    so the window ending on day t already contains the price, discount,
+    promotion, ... of the day being forecast (known in advance).
+    The last row keeps the last observed covariates.
+    """
+
+    features = np.empty((len(demand), 1 + covariates.shape[1]), dtype=np.float32)
+    features[:, 0] = demand
+    features[:-1, 1:] = covariates[1:]
+    features[-1, 1:] = covariates[-1]
+
+    return features
+
+
+def scale_features(features):
+    """
+    Per-channel min/max scaling of one series (like scale_series).
+    Returns (scaled features, mins, ranges); constant channels get range 1.
+    """
+
+    mins = features.min(axis=0)
+    ranges = features.max(axis=0) - mins
+    ranges = np.where(ranges > 0, ranges, 1.0).astype(np.float32)
+
+    return (features - mins) / ranges, mins, ranges
+
+
+def feature_windows(features, window_size=30):
+    """
+    Model inputs / targets over a scaled feature matrix without copying:
+    X is a strided view of shape (n_windows, window_size, n_features),
+    y the Units Sold of the day after each window.
+    """
+
+    X = np.lib.stride_tricks.sliding_window_view(features, (window_size, features.shape[1]))[:-1, 0]
+    y = features[window_size:, :1]
+
+    return X, y
+
+
+def catalog_features(df, covariates=COVARIATES):
+    """
+    Scaled feature matrix of every store × product, built once.
+    Returns {(store, product): (scaled features, mins, ranges)}.
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values(["Store ID", "Product ID", "Date"])
+
+    catalog = {}
+
+    for key, group in df.groupby(["Store ID", "Product ID"], sort=False):
+        features = series_features(group[TARGET].values, covariate_matrix(group, covariates))
+        catalog[key] = scale_features(features)
+
+    return catalog
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import scale_series, create_sequences
+from src.drift_detection import catalog_drift, drift_triggered
+from src.model_registry import (
+    REGISTRY_DIR, MODEL_PATH, register_model, version_metadata
+)
+
+
+INITIAL_NEW_DAYS = 60
+HOLDOUT_DAYS = 7
+
+
+def incremental_windows(df, watermark, window_size=30, replay_fraction=0.2, seed=42,
+                        holdout_days=HOLDOUT_DAYS):
+    """
+    Training windows whose target day is after the watermark,
+    plus a random replay sample of older windows (replay_fraction × new)
+    so the model does not forget the rest of the history.
+    New windows targeting the last holdout_days days are kept out of
+    training and returned separately for the promotion check.
+    Returns (X, y, number of new windows, number of replay windows,
+    holdout X, holdout y, {(store, product): (scaler min, scaler range)}).
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values(["Store ID", "Product ID", "Date"])
+    watermark = pd.Timestamp(watermark)
+    holdout_start = (df["Date"].max() - pd.Timedelta(days=holdout_days)).to_datetime64()
+
+    new_X, new_y, old_X, old_y, holdout_X, holdout_y = [], [], [], [], [], []
+    scalers = {}
+
+    for key, group in df.groupby(["Store ID", "Product ID"], sort=False):
+
+        demand = group["Units Sold"].values.reshape(-1, 1)
+
+        if len(demand) <= window_size:
+            continue
+
+        scaled, scaler = scale_series(demand)
+        X, y = create_sequences(scaled, window_size)
+        scalers[key] = (float(scaler.data_min_[0]), float(scaler.data_range_[0]))
+
+        target_dates = group["Date"].values[window_size:]
+        is_new = target_dates > watermark.to_datetime64()
+        is_holdout = is_new & (target_dates > holdout_start)
+        is_train = is_new & ~is_holdout
+
+        new_X.append(X[is_train])
+        new_y.append(y[is_train])
+        holdout_X.append(X[is_holdout])
+        holdout_y.append(y[is_holdout])
+        old_X.append(X[~is_new])
+        old_y.append(y[~is_new])
+
+    if not new_X:
+        empty_X, empty_y = np.empty((0, window_size, 1), dtype=np.float32), np.empty((0, 1), dtype=np.float32)
+        return empty_X, empty_y, 0, 0, empty_X, empty_y, scalers
+
+    new_X, new_y = np.concatenate(new_X), np.concatenate(new_y)
+    old_X, old_y = np.concatenate(old_X), np.concatenate(old_y)
+    holdout_X, holdout_y = np.concatenate(holdout_X), np.concatenate(holdout_y)
+
+    n_replay = min(len(old_X), int(len(new_X) * replay_fraction))
+    replay = np.random.default_rng(seed).choice(len(old_X), size=n_replay, replace=False)
+
+    X = np.concatenate([new_X, old_X[replay]]).astype(np.float32)
+    y = np.concatenate([new_y, old_y[replay]]).astype(np.float32)
+
+    return X, y, len(new_X), n_replay, holdout_X, holdout_y, scalers
+
+
+def fine_tune(model, X, y, epochs=3, batch_size=32, learning_rate=1e-4):
+    """
+    Warm-start training of an already trained model: a few epochs
+    at a low learning rate so existing weights are adjusted, not relearned.
+    """
+
+    from tensorflow.keras.optimizers import Adam
+
+    model.compile(optimizer=Adam(learning_rate=learning_rate), loss="mse")
+
+    history = model.fit(X, y, epochs=epochs, batch_size=batch_size, shuffle=True, verbose=0)
+
+    return history.history["loss"]
+
+
+def run_fine_tuning_job(df, model_path=MODEL_PATH, registry_dir=REGISTRY_DIR, force=False,
+                        window_size=30, epochs=3, replay_fraction=0.2,
+                        min_drift_fraction=0.2, learning_rate=1e-4, holdout_days=HOLDOUT_DAYS):
+    """
+    Drift-triggered incremental update of the production LSTM.
+
+    1. Drift check on the current model (drift_detection.catalog_drift)
+    2. Windows added since the production version's training watermark
+       + replay sample; the last holdout_days days are held out
+    3. Warm-start fine-tuning from model_path
+    4. New version registered (model_registry); promoted and exported to
+       model_path only if it lowers the error on the held-out days
+
+    Returns a summary dict (status is "no drift", "no new data" or "updated";
+    "no new data" also when the new days do not cover both training and holdout).
+    """
+
+    from tensorflow.keras.models import load_model
+
+    # a fresh instance: the in-process cached model must not be trained in place
+    model = load_model(model_path)
+
+    production = version_metadata(registry_dir=registry_dir)
+
+    if production is None:
+        # first run: register the existing model as the baseline version
+        register_model(model, registry_dir=registry_dir, window_size=window_size,
+                       promote=True, export_path=None)
+        production = version_metadata(registry_dir=registry_dir)
+
+    report = catalog_drift(df, model, window_size)
+    drift_fraction = float(report["drift"].mean()) if len(report) else 0.0
+
+    summary = {"drift_fraction": drift_fraction, "watermark": production["watermark"]}
+
+    if not force and not drift_triggered(report, min_drift_fraction):
+        return {**summary, "status": "no drift"}
+
+    latest = pd.to_datetime(df["Date"]).max()
+
+    # no recorded watermark: treat the most recent days as new
+    watermark = production["watermark"] or str((latest - pd.Timedelta(days=INITIAL_NEW_DAYS)).date())
+
+    X, y, n_new, n_replay, holdout_X, holdout_y, scalers = incremental_windows(
+        df, watermark, window_size, replay_fraction, holdout_days=holdout_days
+    )
+
+    if n_new == 0 or len(holdout_X) == 0:
+        return {**summary, "status": "no new data"}
+
+    # out-of-sample: the held-out days are never trained on
+    mse_before = float(np.mean((np.asarray(model.predict_on_batch(holdout_X)) - holdout_y) ** 2))
+
+    losses = fine_tune(model, X, y, epochs=epochs, learning_rate=learning_rate)
+
+    mse_after = float(np.mean((np.asarray(model.predict_on_batch(holdout_X)) - holdout_y) ** 2))
+
+    promoted = mse_after < mse_before
+
+    version = register_model(
+        model, registry_dir=registry_dir, window_size=window_size, scalers=scalers,
+        watermark=str(latest.date()),
+        metrics={
+            "base_watermark": watermark,
+            "new_windows": n_new,
+            "replay_windows": n_replay,
+            "holdout_windows": len(holdout_X),
+            "epochs": epochs,
+            "mse_before": mse_before,
+            "mse_after": mse_after,
+            "drift_fraction": drift_fraction
+        },
+        promote=promoted, export_path=model_path
+    )
+
+    return {
+        **summary,
+        "status": "updated",
+        "version": version,
+        "new_windows": n_new,
+        "replay_windows": n_replay,
+        "holdout_windows": len(holdout_X),
+        "losses": losses,
+        "mse_before": mse_before,
+        "mse_after": mse_after,
+        "promoted": promoted
+    }
@@ -0,0 +1,175 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.data_utils import file_version
+from src.instrumentation import count
+
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+def forecast_key(store_id, product_id, horizon, model_path, data_path):
+    """
+    Cache key: (store, product, horizon, model version, data version).
+    Versions are file tags, so a retrained model or a new export
+    never serves stale forecasts.
+    """
+
+    return (store_id, product_id, horizon, file_version(model_path), file_version(data_path))
+
+
+def estimate_nbytes(value):
+    """
+    Approximate memory footprint of a cached value.
+    """
+
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+
+    return sys.getsizeof(value)
+
+
+class ForecastCache:
+    """
+    Thread-safe LRU cache for forecast results, bounded by memory.
+
+    Watched files (model, data) are checked on every access; when one
+    changes, every entry is dropped.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._watched = {}
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def watch(self, *paths):
+
+        with self._lock:
+            for path in paths:
+                self._watched.setdefault(path, file_version(path))
+
+    def get(self, key):
+
+        with self._lock:
+            self._check_watched()
+
+            if key not in self._entries:
+                self.misses += 1
+                count("forecast_cache.miss")
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            count("forecast_cache.hit")
+
+            return self._entries[key]
+
+    def put(self, key, value):
+
+        size = estimate_nbytes(value)
+
+        with self._lock:
+            self._check_watched()
+
+            if size > self.max_bytes:
+                return
+
+            if key in self._entries:
+                self.nbytes -= self._sizes[key]
+
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self.nbytes += size
+
+            while self.nbytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+
+        value = self.get(key)
+
+        if value is None:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def clear(self):
+
+        with self._lock:
+            self._clear()
+
+    def stats(self):
+
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+    def _check_watched(self):
+
+        changed = False
+
+        for path, version in self._watched.items():
+            current = file_version(path)
+            if current != version:
+                self._watched[path] = current
+                changed = True
+
+        if changed:
+            self._clear()
+            self.invalidations += 1
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_forecast_cache(*watch_paths):
+    """
+    Process-wide forecast cache shared by the dashboard and batch pipeline.
+    """
+
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ForecastCache()
+
+    _cache.watch(*watch_paths)
+
+    return _cache
@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import scale_series
+from src.decision_engine import forecast_demand_batch
+from src.baseline_models import BASELINES
+from src.demand_segmentation import product_volatility_classification, demand_intermittency
+
+
+# cheapest adequate model per demand segment
+ROUTES = {
+    "Stable": "Moving Average",
+    "Moderate": "Exponential Smoothing",
+    "Highly Volatile": "LSTM"
+}
+INTERMITTENT_ROUTE = "Croston"
+INTERMITTENCY_THRESHOLD = 0.3   # share of zero-demand days
+HISTORY_DAYS = 90
+
+
+def route_catalog(df, routes=ROUTES, intermittency_threshold=INTERMITTENCY_THRESHOLD):
+    """
+    Model route per store × product from its demand segment;
+    intermittent series go to Croston regardless of segment.
+    """
+
+    segments = product_volatility_classification(df)[["Product ID", "Demand Segment"]]
+    intermittency = demand_intermittency(df)
+
+    table = intermittency.merge(segments, on="Product ID", how="left")
+    table["Demand Segment"] = table["Demand Segment"].astype(str)
+    table["Route"] = table["Demand Segment"].map(routes).fillna("LSTM")
+    table.loc[table["Zero Share"] >= intermittency_threshold, "Route"] = INTERMITTENT_ROUTE
+
+    return table
+
+
+def forecast_routes(model, histories, routes, scales, horizon=7, window_size=30):
+    """
+    Forecast raw histories (n_series, history_days) with each series' route.
+    scales: (min, range) per series, as fitted by scale_series on the full
+    series, used for the LSTM route; a zero range (constant series) is
+    taken as 1, like scale_series' own scaler does.
+    Series sharing a route are forecast together in one batched call.
+    Returns (forecasts of shape (n_series, horizon), seconds per route).
+    """
+
+    forecasts = np.empty((len(histories), horizon), dtype=np.float32)
+    seconds = {}
+    routes = np.asarray(routes)
+
+    for route in np.unique(routes):
+        rows = np.flatnonzero(routes == route)
+        start = time.perf_counter()
+
+        if route == "LSTM":
+            mins, ranges = scales[rows, :1], scales[rows, 1:]
+            ranges = np.where(ranges > 0, ranges, 1.0).astype(ranges.dtype)
+            windows = ((histories[rows] - mins) / ranges)[:, -window_size:]
+            forecasts[rows] = forecast_demand_batch(model, windows, horizon) * ranges + mins
+        else:
+            point = BASELINES[route](histories[rows][:, :, None])
+            forecasts[rows] = np.repeat(point, horizon, axis=1)
+
+        seconds[route] = time.perf_counter() - start
+
+    return forecasts, seconds
+
+
+def _histories(df, keys, history_days, holdout=0):
+    """
+    Last history_days of each series before the holdout period,
+    the holdout actuals, and the (min, range) scaling of each series.
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    grouped = dict(list(df.sort_values("Date").groupby(["Store ID", "Product ID"])["Units Sold"]))
+
+    histories, actuals, scales = [], [], []
+
+    for key in keys:
+        values = grouped[key].values.astype(np.float32)
+        end = len(values) - holdout
+        _, scaler = scale_series(values[:end].reshape(-1, 1))
+
+        histories.append(values[end - history_days:end])
+        actuals.append(values[end:])
+        scales.append((scaler.data_min_[0], scaler.data_range_[0]))
+
+    return np.array(histories), np.array(actuals), np.array(scales, dtype=np.float32)
+
+
+def routed_forecast(df, model, horizon=7, window_size=30, history_days=HISTORY_DAYS, routes=ROUTES):
+    """
+    Forecast the whole catalog, each SKU with its routed model.
+    Returns (one row per SKU with route and Day 1..horizon, seconds per route).
+    """
+
+    table = route_catalog(df, routes)
+
+    lengths = df.groupby(["Store ID", "Product ID"]).size()
+    table = table[table.set_index(["Store ID", "Product ID"]).index.map(lengths) >= history_days]
+
+    keys = list(zip(table["Store ID"], table["Product ID"]))
+    histories, _, scales = _histories(df, keys, history_days)
+
+    forecasts, seconds = forecast_routes(model, histories, table["Route"].values, scales, horizon, window_size)
+
+    days = pd.DataFrame(forecasts, columns=[f"Day {d + 1}" for d in range(horizon)], index=table.index)
+
+    return pd.concat([table, days], axis=1).reset_index(drop=True), seconds
+
+
+def route_accuracy(df, model, horizon=7, window_size=30, history_days=HISTORY_DAYS, routes=ROUTES):
+    """
+    Hold out the last `horizon` days, forecast them with the router and
+    with the LSTM for every SKU, and compare accuracy and cost per route.
+    """
+
+    table = route_catalog(df, routes)
+
+    lengths = df.groupby(["Store ID", "Product ID"]).size()
+    table = table[table.set_index(["Store ID", "Product ID"]).index.map(lengths) >= history_days + horizon]
+
+    keys = list(zip(table["Store ID"], table["Product ID"]))
+    histories, actuals, scales = _histories(df, keys, history_days, holdout=horizon)
+
+    routed, routed_seconds = forecast_routes(model, histories, table["Route"].values, scales, horizon, window_size)
+    lstm_all, lstm_seconds = forecast_routes(model, histories, ["LSTM"] * len(keys), scales, horizon, window_size)
+
+    table = table.assign(
+        **{"Routed MAE": np.abs(routed - actuals).mean(axis=1),
+           "LSTM MAE": np.abs(lstm_all - actuals).mean(axis=1)}
+    )
+
+    report = table.groupby("Route").agg(
+        SKUs=("Route", "size"),
+        Routed_MAE=("Routed MAE", "mean"),
+        LSTM_MAE=("LSTM MAE", "mean")
+    ).rename(columns={"Routed_MAE": "Routed MAE", "LSTM_MAE": "LSTM MAE"})
+    report["Seconds"] = pd.Series(routed_seconds)
+
+    total = pd.DataFrame({
+        "SKUs": [len(table)],
+        "Routed MAE": [table["Routed MAE"].mean()],
+        "LSTM MAE": [table["LSTM MAE"].mean()],
+        "Seconds": [sum(routed_seconds.values())]
+    }, index=["All (routed)"])
+
+    report = pd.concat([report, total])
+    report.loc["All (LSTM only)", ["SKUs", "LSTM MAE", "Seconds"]] = [len(table), table["LSTM MAE"].mean(),
+                                                                       lstm_seconds["LSTM"]]
+
+    report["SKUs"] = report["SKUs"].astype(int)
+
+    return report.reset_index().rename(columns={"index": "Route"})
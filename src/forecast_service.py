@@ -0,0 +1,137 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import prepare_forecast_inputs
+from src.decision_engine import forecast_demand_batch, residual_std_batch, inventory_decision, service_level_z
+from src.pricing_engine import estimate_price_elasticity, suggest_optimal_price
+from src.price_alerts import build_alert_index
+from src.demand_segmentation import segment_catalog, segment_lookup
+from src.instrumentation import count, timed
+
+
+RESIDUAL_WINDOWS = 50
+MAX_FORECAST_DAYS = 30
+
+
+class ForecastService:
+    """
+    In-memory forecasting state behind the headless API (service.py).
+
+    Per-series scaling, last windows and residual spread are prepared once
+    at startup, so a request only runs the recursive LSTM forecast.
+    """
+
+    def __init__(self, df, model, window_size=30, residual_windows=RESIDUAL_WINDOWS):
+
+        df = df.copy()
+        df["Date"] = pd.to_datetime(df["Date"])
+
+        self.df = df
+        self.model = model
+        self.window_size = window_size
+        self.index = {}
+        self.stores = {}
+
+        series = []
+
+        for (store_id, product_id), ts_df in df.groupby(["Store ID", "Product ID"]):
+
+            if len(ts_df) <= window_size + residual_windows:
+                continue
+
+            self.index[(store_id, product_id)] = len(series)
+            self.stores.setdefault(store_id, []).append(product_id)
+            series.append(ts_df.sort_values("Date")["Units Sold"].values.reshape(-1, 1))
+
+        inputs = prepare_forecast_inputs(series, window_size, residual_windows)
+
+        self.windows = inputs["windows"]
+        self.mins = inputs["mins"]
+        self.ranges = inputs["ranges"]
+        self.residual_std = residual_std_batch(model, inputs["residual_X"], inputs["residual_y"], inputs["scalers"])
+
+        self._elasticity = {}
+        self._lock = threading.Lock()
+
+        # competitor price alerts; updated only from the event loop (single writer)
+        self.alerts = build_alert_index(df)
+
+        # ABC / XYZ / demand pattern per series (sets the service level)
+        self.segments = segment_catalog(df)
+
+    def has(self, store_id, product_id):
+        return (store_id, product_id) in self.index
+
+    @timed("service.forecast_batch")
+    def forecast_batch(self, requests):
+        """
+        Forecast many (store_id, product_id, forecast_days) requests
+        with one batched recursive forecast over the longest horizon.
+        """
+
+        rows = np.array([self.index[(store_id, product_id)] for store_id, product_id, _ in requests])
+        days = max(forecast_days for _, _, forecast_days in requests)
+        count("service.forecast_requests", len(requests))
+
+        scaled = forecast_demand_batch(self.model, self.windows[rows], days)
+
+        # MinMaxScaler inverse transform for all rows at once
+        forecast = scaled * self.ranges[rows, None] + self.mins[rows, None]
+
+        return [
+            {
+                "forecast": forecast[i, :forecast_days],
+                "residual_std": float(self.residual_std[row])
+            }
+            for i, ((_, _, forecast_days), row) in enumerate(zip(requests, rows))
+        ]
+
+    def segment(self, store_id, product_id):
+        """
+        ABC class, XYZ class and demand pattern of one store × product;
+        None for a series without a segment row (default service level).
+        """
+
+        row = segment_lookup(self.segments, store_id, product_id) or {}
+
+        return {"abc_class": row.get("ABC"), "xyz_class": row.get("XYZ"), "demand_pattern": row.get("Demand Pattern")}
+
+    def decision(self, result, current_inventory=500, abc_class=None):
+        return inventory_decision(np.sum(result["forecast"]), result["residual_std"], current_inventory,
+                                  z=service_level_z(abc_class))
+
+    def elasticity(self, store_id, product_id, current_price=None):
+        """
+        Price elasticity and pricing suggestion for one store × product.
+        Elasticity is estimated once per series and reused.
+        """
+
+        key = (store_id, product_id)
+
+        with self._lock:
+            cached = self._elasticity.get(key)
+
+        if cached is None:
+            ts_df = self.df[
+                (self.df["Store ID"] == store_id) &
+                (self.df["Product ID"] == product_id)
+            ].sort_values("Date")
+            cached = {
+                "elasticity": float(estimate_price_elasticity(ts_df.copy())),
+                "last_price": float(ts_df["Price"].iloc[-1]),
+                "competitor_price": float(ts_df["Competitor Pricing"].mean())
+            }
+            with self._lock:
+                self._elasticity[key] = cached
+
+        price = cached["last_price"] if current_price is None else current_price
+        recommendation = suggest_optimal_price(price, cached["elasticity"], cached["competitor_price"])
+
+        return {
+            "elasticity": cached["elasticity"],
+            "current_price": price,
+            "competitor_price": cached["competitor_price"],
+            "recommendation": {k: (float(v) if isinstance(v, (int, float)) else v) for k, v in recommendation.items()}
+        }
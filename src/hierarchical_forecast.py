@@ -0,0 +1,326 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.linalg import cho_factor, cho_solve
+
+from src.baseline_models import BASELINES
+from src.forecast_router import forecast_routes
+
+
+# aggregation levels, top to bottom; the last one is the forecast (bottom) level
+LEVELS = ["Total", "Region", "Category", "Store", "Product", "Store × Product"]
+METHODS = ["base", "bottom_up", "ols", "wls", "mint_shrink"]
+
+
+# HIERARCHY
+# =========================================================
+def hierarchy_table(df):
+    """
+    One row per store × product with its Region and Category
+    (the most recent value, should a series' labels ever change).
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    return (
+        df.sort_values("Date")
+        .groupby(["Store ID", "Product ID"])[["Region", "Category"]]
+        .last()
+        .reset_index()
+    )
+
+
+def summing_matrix(bottom):
+    """
+    Sparse summing matrix S (n_nodes × n_bottom) of the hierarchy:
+    every node's demand is S @ bottom demand.
+    Store and Product cross each other (grouped hierarchy),
+    which reconciliation handles the same way as a strict tree.
+    Returns (S in CSR format, node table with Level and Node).
+    """
+
+    n_bottom = len(bottom)
+    columns = np.arange(n_bottom)
+
+    labels = {
+        "Total": np.full(n_bottom, "Total", dtype=object),
+        "Region": bottom["Region"].values,
+        "Category": bottom["Category"].values,
+        "Store": bottom["Store ID"].values,
+        "Product": bottom["Product ID"].values,
+        "Store × Product": (bottom["Store ID"].astype(str) + " / " + bottom["Product ID"].astype(str)).values
+    }
+
+    blocks, nodes = [], []
+
+    for level in LEVELS:
+        # bottom nodes keep the column order of S
+        codes, names = pd.factorize(labels[level], sort=level != LEVELS[-1])
+
+        blocks.append(sp.csr_matrix(
+            (np.ones(n_bottom), (codes, columns)),
+            shape=(len(names), n_bottom)
+        ))
+        nodes.append(pd.DataFrame({"Level": level, "Node": names}))
+
+    return sp.vstack(blocks, format="csr"), pd.concat(nodes, ignore_index=True)
+
+
+def bottom_series(df, bottom):
+    """
+    Daily Units Sold of every bottom series, aligned on one date index
+    (missing days = 0). Returns (array of shape (n_bottom, n_days), dates).
+    """
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    pivot = df.pivot_table(
+        index="Date",
+        columns=["Store ID", "Product ID"],
+        values="Units Sold",
+        aggfunc="sum",
+        fill_value=0
+    )
+
+    pivot = pivot.reindex(columns=pd.MultiIndex.from_frame(bottom[["Store ID", "Product ID"]]), fill_value=0)
+
+    return pivot.values.T.astype(np.float32), pivot.index
+
+
+# BASE FORECASTS
+# =========================================================
+def _scales(histories):
+    """
+    Per-node (min, range) for min/max scaling, like scale_series.
+    """
+
+    mins = histories.min(axis=1)
+    ranges = histories.max(axis=1) - mins
+
+    return np.stack([mins, np.where(ranges > 0, ranges, 1.0)], axis=1).astype(np.float32)
+
+
+def one_step_residuals(model, histories, scales, base="LSTM", window_size=30, residual_windows=60):
+    """
+    In-sample one-step errors (actual - forecast) over the last
+    residual_windows days of every node, shape (n_nodes, residual_windows).
+    LSTM windows of all nodes go through a single model call.
+    """
+
+    n_nodes = len(histories)
+    recent = histories[:, -(window_size + residual_windows):]
+
+    windows = np.lib.stride_tricks.sliding_window_view(recent[:, :-1], window_size, axis=1)
+    actual = recent[:, window_size:]
+
+    if base == "LSTM":
+        mins, ranges = scales[:, :1, None], scales[:, 1:, None]
+        scaled = ((windows - mins) / ranges).reshape(-1, window_size, 1)
+        pred = np.asarray(model.predict_on_batch(scaled.astype(np.float32)))
+        pred = pred.reshape(n_nodes, -1) * scales[:, 1:] + scales[:, :1]
+    else:
+        pred = BASELINES[base](windows.reshape(-1, window_size, 1)).reshape(n_nodes, -1)
+
+    return actual - pred
+
+
+# RECONCILIATION
+# =========================================================
+def shrinkage_intensity(residuals):
+    """
+    Schäfer-Strimmer shrinkage intensity of the residual correlations
+    towards the identity, as in MinT-shrink.
+    residuals: shape (n_nodes, n_obs). Uses n_obs × n_obs Gram matrices
+    only (Σ_ij (X'X)²_ij = ‖XX'‖²), never an n_nodes × n_nodes one.
+    """
+
+    E = residuals.T.astype(np.float64)
+    n_obs = len(E)
+
+    std = np.sqrt(np.maximum((E ** 2).mean(axis=0), 1e-12))
+    xs = E / std
+    xs2 = xs ** 2
+
+    diagonal = ((xs2.sum(axis=0)) ** 2).sum()           # Σ_i (X'X)²_ii
+    cross = np.sum((xs @ xs.T) ** 2) - diagonal          # Σ_i≠j (X'X)²_ij
+    fourth = (xs2.sum(axis=1) ** 2).sum() - (xs2 ** 2).sum()   # Σ_i≠j (X²'X²)_ij
+
+    variance = (fourth - cross / n_obs) / (n_obs * (n_obs - 1))
+    off_diagonal = cross / n_obs ** 2
+
+    return float(np.clip(variance / max(off_diagonal, 1e-12), 0.0, 1.0))
+
+
+def shrink_covariance(residuals):
+    """
+    Residual covariance shrunk towards its diagonal
+    (Schäfer-Strimmer intensity, as in MinT-shrink), as a dense
+    n_nodes × n_nodes matrix. reconcile uses the low-rank form instead.
+    residuals: shape (n_nodes, n_obs).
+    """
+
+    E = residuals.T.astype(np.float64)
+    covariance = E.T @ E / len(E)
+    intensity = shrinkage_intensity(residuals)
+
+    shrunk = (1 - intensity) * covariance
+    shrunk[np.diag_indices_from(shrunk)] = np.maximum(np.diag(covariance), 1e-9)
+
+    return shrunk, intensity
+
+
+def _shrunk_inverse_factors(residuals):
+    """
+    W = D + U U' for the shrunk covariance: D diagonal, U = √((1-λ)/n_obs) E'
+    of rank n_obs. Returns (1 / D, D⁻¹U, Cholesky factor of I + U'D⁻¹U),
+    the pieces of the Woodbury identity
+    W⁻¹ = D⁻¹ - D⁻¹U (I + U'D⁻¹U)⁻¹ U'D⁻¹.
+    """
+
+    E = residuals.astype(np.float64)
+    n_obs = E.shape[1]
+    intensity = shrinkage_intensity(residuals)
+
+    variance = (E ** 2).mean(axis=1)
+    inv_d = 1.0 / np.maximum(np.maximum(variance, 1e-9) - (1 - intensity) * variance, 1e-9)
+
+    U = np.sqrt((1 - intensity) / n_obs) * E
+    DinvU = inv_d[:, None] * U
+
+    return inv_d, DinvU, cho_factor(np.eye(n_obs) + U.T @ DinvU)
+
+
+def reconcile(S, base_forecasts, method="mint_shrink", residuals=None):
+    """
+    Coherent forecasts for every node: S @ G @ base_forecasts with
+    G = (S' W⁻¹ S)⁻¹ S' W⁻¹, all nodes and horizon days in one solve.
+
+    bottom_up    only bottom-level base forecasts, summed up
+    ols          W = I
+    wls          W = diag(residual variance)
+    mint_shrink  W = shrunk residual covariance, applied through
+                 Woodbury (diagonal + rank n_obs), never as an
+                 n_nodes × n_nodes matrix
+
+    S' W⁻¹ S is dense (the Total row couples every pair of bottom
+    series), so it is built as a dense n_bottom × n_bottom matrix and
+    solved by Cholesky; S itself stays sparse in the products.
+
+    base_forecasts: shape (n_nodes, horizon), rows ordered like S.
+    """
+
+    n_nodes, n_bottom = S.shape
+
+    if method == "base":
+        return base_forecasts
+
+    if method == "bottom_up":
+        return S @ base_forecasts[-n_bottom:]
+
+    if method == "ols":
+        precision = np.ones(n_nodes)
+    elif method == "wls":
+        precision = 1.0 / np.maximum(residuals.var(axis=1), 1e-9)
+    elif method == "mint_shrink":
+        precision, DinvU, factor = _shrunk_inverse_factors(residuals)
+    else:
+        raise ValueError(f"Unknown reconciliation method: {method}")
+
+    WinvS = sp.diags(precision) @ S
+    normal = np.asarray((S.T @ WinvS).todense())
+    rhs = np.asarray(WinvS.T @ base_forecasts)
+
+    if method == "mint_shrink":
+        # Woodbury correction: S'D⁻¹U K⁻¹ U'D⁻¹ (S, ŷ), K = I + U'D⁻¹U
+        SDinvU = np.asarray(S.T @ DinvU)
+        normal -= SDinvU @ cho_solve(factor, SDinvU.T)
+        rhs -= SDinvU @ cho_solve(factor, DinvU.T @ base_forecasts)
+
+    bottom = cho_solve(cho_factor(normal), rhs)
+
+    return S @ bottom
+
+
+# PIPELINE
+# =========================================================
+def _prepare(df, model, horizon, window_size, base, holdout, residual_windows):
+    """
+    Hierarchy, node histories (S @ bottom), base forecasts and residuals.
+    """
+
+    bottom = hierarchy_table(df)
+    S, nodes = summing_matrix(bottom)
+
+    series, _ = bottom_series(df, bottom)
+    histories = np.asarray(S @ series, dtype=np.float32)
+
+    end = histories.shape[1] - holdout
+    train = histories[:, :end]
+    scales = _scales(train)
+
+    base_forecasts, _ = forecast_routes(model, train, [base] * len(train), scales, horizon, window_size)
+    residuals = one_step_residuals(model, train, scales, base, window_size, residual_windows)
+
+    return S, nodes, base_forecasts.astype(np.float64), residuals, histories[:, end:end + horizon]
+
+
+def hierarchical_forecast(df, model, horizon=7, window_size=30, method="mint_shrink",
+                          base="LSTM", residual_windows=60):
+    """
+    Coherent forecasts at every level (Total, Region, Category, Store,
+    Product, Store × Product): base forecasts for every node, then
+    one reconciliation step.
+    Returns one row per node with Day 1..horizon, Total Forecast
+    and the unreconciled Base Total.
+    """
+
+    S, nodes, base_forecasts, residuals, _ = _prepare(df, model, horizon, window_size,
+                                                      base, 0, residual_windows)
+
+    reconciled = reconcile(S, base_forecasts, method, residuals)
+
+    table = nodes.copy()
+    for day in range(horizon):
+        table[f"Day {day + 1}"] = reconciled[:, day]
+
+    table["Total Forecast"] = reconciled.sum(axis=1)
+    table["Base Total"] = base_forecasts.sum(axis=1)
+
+    return table
+
+
+def coherence_error(S, forecasts):
+    """
+    Largest gap between a node's forecast and the sum of its bottom series.
+    """
+
+    n_bottom = S.shape[1]
+
+    return float(np.abs(S @ forecasts[-n_bottom:] - forecasts).max())
+
+
+def hierarchy_accuracy(df, model, horizon=7, window_size=30, methods=METHODS,
+                       base="LSTM", residual_windows=60):
+    """
+    Hold out the last `horizon` days and compare reconciliation methods.
+    Base forecasts and residuals are computed once; each method is one solve.
+    Returns MAE per level (rows) × method (columns), plus the
+    coherence error of each method.
+    """
+
+    S, nodes, base_forecasts, residuals, actual = _prepare(df, model, horizon, window_size,
+                                                           base, horizon, residual_windows)
+
+    mae, coherence = {}, {}
+
+    for method in methods:
+        forecast = reconcile(S, base_forecasts, method, residuals)
+        mae[method] = pd.Series(np.abs(forecast - actual).mean(axis=1)).groupby(nodes["Level"]).mean()
+        coherence[method] = coherence_error(S, forecast)
+
+    report = pd.DataFrame(mae).reindex(LEVELS)
+    report.loc["Coherence Error"] = pd.Series(coherence)
+
+    return report.rename_axis("Level").reset_index()
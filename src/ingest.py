@@ -0,0 +1,234 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import peak_memory_mb
+from src.promotion_analysis import promotion_flag, HOLIDAY_VALUES
+
+
+# column → stored dtype; every column except Weather Condition and Seasonality is required
+SCHEMA = {
+    "Date": "datetime64[us]",
+    "Store ID": "category",
+    "Product ID": "category",
+    "Category": "category",
+    "Region": "category",
+    "Inventory Level": "int32",
+    "Units Sold": "int32",
+    "Units Ordered": "int32",
+    "Demand Forecast": "float32",
+    "Price": "float32",
+    "Discount": "float32",
+    "Weather Condition": "category",
+    "Holiday/Promotion": "int8",
+    "Competitor Pricing": "float32",
+    "Seasonality": "category",
+}
+
+OPTIONAL_COLUMNS = ["Weather Condition", "Seasonality"]
+COUNT_COLUMNS = ["Inventory Level", "Units Sold", "Units Ordered"]
+PRICE_COLUMNS = ["Price", "Competitor Pricing"]
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+# READ + VALIDATE
+# =========================================================
+def schema_columns(path):
+    """
+    SCHEMA columns present in the CSV header. Raises ValueError when
+    a required column is missing.
+    """
+
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [name for name in SCHEMA if name not in header and name not in OPTIONAL_COLUMNS]
+
+    if missing:
+        raise ValueError(f"{path} is missing required columns: {missing}")
+
+    return [name for name in SCHEMA if name in header]
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Raw CSV chunks of the SCHEMA columns. Text columns are read
+    straight into categoricals; numbers are parsed leniently and
+    typed after validation (a bad value rejects one row, not the file).
+    """
+
+    columns = schema_columns(path)
+    dtypes = {name: "category" for name in columns if SCHEMA[name] == "category"}
+
+    return pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunksize)
+
+
+def validate_chunk(chunk, date_format="ISO8601"):
+    """
+    Coerce a raw chunk to SCHEMA and split off invalid rows
+    (dates in date_format, ISO 8601 by default).
+    Returns (typed valid rows, rejected raw rows with a Reason column).
+    The first failing rule is reported per row.
+    """
+
+    chunk = chunk.reset_index(drop=True)
+    reason = pd.Series(None, index=chunk.index, dtype=object)
+
+    def reject(mask, message):
+        reason[mask & reason.isna()] = message
+
+    dates = pd.to_datetime(chunk["Date"], errors="coerce", format=date_format)
+    reject(dates.isna(), "invalid date")
+
+    numeric = {
+        name: pd.to_numeric(chunk[name], errors="coerce")
+        for name in chunk.columns
+        if SCHEMA[name] != "category" and name not in ("Date", "Holiday/Promotion")
+    }
+
+    for name in ["Store ID", "Product ID", "Category", "Region"]:
+        reject(chunk[name].isna(), f"missing {name}")
+
+    for name, values in numeric.items():
+        reject(values.isna(), f"missing or non-numeric {name}")
+
+    for name in COUNT_COLUMNS:
+        values = numeric[name]
+        reject(values < 0, f"negative {name}")
+        reject(values != np.round(values), f"non-integer {name}")
+
+    for name in PRICE_COLUMNS:
+        reject(numeric[name] <= 0, f"non-positive {name}")
+
+    reject((numeric["Discount"] < 0) | (numeric["Discount"] > 100), "Discount outside 0-100")
+
+    valid = reason.isna().values
+
+    typed = pd.DataFrame({"Date": dates[valid].astype(SCHEMA["Date"])})
+
+    for name in chunk.columns:
+        if name == "Date":
+            continue
+        if name == "Holiday/Promotion":
+            typed[name] = promotion_flag(chunk[name][valid], HOLIDAY_VALUES).astype(np.int8)
+        elif name in numeric:
+            typed[name] = numeric[name][valid].values.astype(SCHEMA[name])
+        else:
+            typed[name] = chunk[name][valid].values
+
+    rejected = chunk[~valid].assign(Reason=reason[~valid])
+
+    return typed.reset_index(drop=True), rejected
+
+
+# COLUMNAR STORE
+# =========================================================
+def arrow_schema(columns):
+    """
+    Fixed Arrow schema for the store: every row group gets the same
+    types whatever categories a chunk happens to contain.
+    """
+
+    import pyarrow as pa
+
+    types = {
+        "datetime64[us]": pa.timestamp("us"),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "int32": pa.int32(),
+        "int8": pa.int8(),
+        "float32": pa.float32(),
+    }
+
+    return pa.schema([(name, types[SCHEMA[name]]) for name in columns])
+
+
+class ParquetStoreWriter:
+    """
+    Appends typed chunks to one Parquet file, one row group per chunk
+    (columnar, dictionary-encoded categoricals, compressed).
+    """
+
+    def __init__(self, path, columns, compression="zstd"):
+
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.schema = arrow_schema(columns)
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self.rows = 0
+
+    def write(self, df):
+
+        import pyarrow as pa
+
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+        self.rows += len(df)
+
+    def close(self):
+        self._writer.close()
+
+
+# PIPELINE
+# =========================================================
+def ingest_csv(path, output, chunksize=DEFAULT_CHUNKSIZE, rejects_path=None, progress=None,
+               date_format="ISO8601"):
+    """
+    CSV → validated, typed Parquet store, one chunk in memory at a time.
+    Invalid rows are counted by reason and, with rejects_path,
+    written to a CSV. progress(report) is called after every chunk.
+    Returns a report (rows read / written / rejected, reasons,
+    seconds, rows per second, peak memory, file sizes).
+    """
+
+    columns = schema_columns(path)
+    writer = ParquetStoreWriter(output, columns)
+
+    report = {"chunks": 0, "rows_read": 0, "rows_written": 0, "rows_rejected": 0, "reasons": {}}
+    start = time.perf_counter()
+    first_reject = True
+
+    try:
+        for chunk in read_chunks(path, chunksize):
+
+            typed, rejected = validate_chunk(chunk, date_format)
+            writer.write(typed)
+
+            report["chunks"] += 1
+            report["rows_read"] += len(chunk)
+            report["rows_written"] += len(typed)
+            report["rows_rejected"] += len(rejected)
+
+            for reason, count in rejected["Reason"].value_counts().items():
+                report["reasons"][reason] = report["reasons"].get(reason, 0) + int(count)
+
+            if rejects_path and len(rejected):
+                rejected.to_csv(rejects_path, mode="w" if first_reject else "a", header=first_reject, index=False)
+                first_reject = False
+
+            if progress:
+                progress(report)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+
+    report.update({
+        "seconds": seconds,
+        "rows_per_second": report["rows_read"] / seconds if seconds else 0.0,
+        "peak_memory_mb": peak_memory_mb(),
+        "csv_mb": os.path.getsize(path) / 1e6,
+        "store_mb": os.path.getsize(output) / 1e6
+    })
+
+    return report
+
+
+def load_store(path, columns=None, filters=None):
+    """
+    Read the Parquet store (only the requested columns / row filters,
+    e.g. filters=[("Store ID", "==", "S001")]); dtypes follow SCHEMA.
+    """
+
+    return pd.read_parquet(path, columns=columns, filters=filters)
@@ -0,0 +1,245 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+# JSON-lines file for every observation (unset: in-memory only)
+METRICS_LOG_ENV = "PIPELINE_METRICS_LOG"
+RECENT = 1000   # durations kept per stage for percentiles
+
+
+class MetricsRegistry:
+    """
+    Process-wide stage timers and event counters.
+
+    timer(stage)                    context manager
+    timed(stage)                    decorator (default stage: "<module>.<function>")
+    count(event, n)                 counter
+    record_nbytes(stage, *arrays)   memory of the arrays a stage produced
+
+    Every stage keeps calls, total / max seconds, its last RECENT
+    durations (percentiles) and last / max output bytes. Thread-safe;
+    timings are inclusive, so a stage that calls other timed stages
+    contains their time.
+    """
+
+    def __init__(self, log_path=None, recent=RECENT):
+
+        self._lock = threading.Lock()
+        self.recent = recent
+        self.stages = {}     # stage → {"calls", "total", "max", "last", "recent", "bytes", "max_bytes"}
+        self.counters = {}   # event → count
+        self.log_path = log_path
+        self._log = None
+
+    def configure(self, log_path=None):
+        """
+        Start (or stop, with None) writing observations as JSON lines.
+        """
+
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self.log_path = log_path
+
+    def _emit(self, record):
+
+        if self.log_path is None:
+            return
+
+        if self._log is None:
+            self._log = open(self.log_path, "a", buffering=1, encoding="utf-8")
+
+        self._log.write(json.dumps(record) + "\n")
+
+    def _stats(self, stage):
+
+        stats = self.stages.get(stage)
+
+        if stats is None:
+            stats = self.stages[stage] = {
+                "calls": 0, "total": 0.0, "max": 0.0, "last": 0.0, "recent": deque(maxlen=self.recent),
+                "bytes": 0, "max_bytes": 0
+            }
+
+        return stats
+
+    def observe(self, stage, seconds):
+
+        with self._lock:
+            stats = self._stats(stage)
+
+            stats["calls"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["last"] = seconds
+            stats["recent"].append(seconds)
+
+            self._emit({"ts": time.time(), "type": "timer", "stage": stage, "seconds": seconds})
+
+    def count(self, event, value=1):
+
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + value
+            self._emit({"ts": time.time(), "type": "counter", "event": event, "value": value})
+
+    def record_nbytes(self, stage, *arrays):
+        """
+        Account the memory of arrays produced by a stage (last and max per stage).
+        """
+
+        nbytes = int(sum(getattr(array, "nbytes", 0) for array in arrays))
+
+        with self._lock:
+            stats = self._stats(stage)
+            stats["bytes"] = nbytes
+            stats["max_bytes"] = max(stats["max_bytes"], nbytes)
+            self._emit({"ts": time.time(), "type": "memory", "stage": stage, "bytes": nbytes})
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage=None):
+
+        def decorate(fn):
+            name = stage or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def reset(self):
+
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+
+    # EXPORT
+    # -----------------------------------------------------
+    def stage_table(self):
+        """
+        One row per stage: calls, total seconds, latency (ms) statistics
+        and output memory (MB, where recorded), slowest total first.
+        """
+
+        with self._lock:
+            rows = [
+                (stage, stats["calls"], stats["total"], stats["last"], stats["max"], np.array(stats["recent"]),
+                 stats["bytes"], stats["max_bytes"])
+                for stage, stats in self.stages.items()
+            ]
+
+        def percentile(recent, q):
+            return float(np.percentile(recent, q)) * 1000 if len(recent) else np.nan
+
+        table = pd.DataFrame([{
+            "Stage": stage,
+            "Calls": calls,
+            "Total s": total,
+            "Mean ms": total / calls * 1000 if calls else np.nan,
+            "P50 ms": percentile(recent, 50),
+            "P95 ms": percentile(recent, 95),
+            "Max ms": maximum * 1000,
+            "Last ms": last * 1000,
+            "Out MB": nbytes / 1e6,
+            "Max Out MB": max_bytes / 1e6
+        } for stage, calls, total, last, maximum, recent, nbytes, max_bytes in rows],
+            columns=["Stage", "Calls", "Total s", "Mean ms", "P50 ms", "P95 ms", "Max ms", "Last ms",
+                     "Out MB", "Max Out MB"])
+
+        return table.sort_values("Total s", ascending=False).reset_index(drop=True)
+
+    def to_prometheus(self, prefix="demand_forecast"):
+        """
+        Prometheus text exposition: one summary per stage
+        (labels stage=..., quantiles over the recent durations)
+        and one counter per event.
+        """
+
+        with self._lock:
+            stages = {stage: (stats["calls"], stats["total"], list(stats["recent"]))
+                      for stage, stats in self.stages.items() if stats["calls"]}
+            stage_bytes = {stage: stats["max_bytes"] for stage, stats in self.stages.items() if stats["max_bytes"]}
+            counters = dict(self.counters)
+
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds summary"
+        ]
+
+        for stage, (calls, total, recent) in sorted(stages.items()):
+            label = f'stage="{stage}"'
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'{prefix}_stage_seconds{{{label},quantile="{q}"}} {np.quantile(recent, q):.9f}')
+            lines.append(f"{prefix}_stage_seconds_sum{{{label}}} {total:.9f}")
+            lines.append(f"{prefix}_stage_seconds_count{{{label}}} {calls}")
+
+        lines += [
+            f"# HELP {prefix}_events_total Pipeline event counters.",
+            f"# TYPE {prefix}_events_total counter"
+        ]
+
+        for event, value in sorted(counters.items()):
+            lines.append(f'{prefix}_events_total{{event="{event}"}} {value}')
+
+        lines += [
+            f"# HELP {prefix}_stage_output_bytes Largest output of a pipeline stage.",
+            f"# TYPE {prefix}_stage_output_bytes gauge"
+        ]
+
+        for stage, nbytes in sorted(stage_bytes.items()):
+            lines.append(f'{prefix}_stage_output_bytes{{stage="{stage}"}} {nbytes}')
+
+        peak = peak_memory_mb()
+        if peak is not None:
+            lines += [
+                f"# HELP {prefix}_peak_rss_bytes Peak resident memory of the process.",
+                f"# TYPE {prefix}_peak_rss_bytes gauge",
+                f"{prefix}_peak_rss_bytes {int(peak * 1024 ** 2)}"
+            ]
+
+        return "\n".join(lines) + "\n"
+
+
+def peak_memory_mb():
+    """
+    Peak resident memory of this process in MB (None where the
+    resource module is unavailable, e.g. Windows).
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 ** 2 if os.uname().sysname == "Darwin" else 1024)
+
+
+METRICS = MetricsRegistry(os.environ.get(METRICS_LOG_ENV))
+
+timer = METRICS.timer
+timed = METRICS.timed
+count = METRICS.count
+record_nbytes = METRICS.record_nbytes
@@ -0,0 +1,23 @@
+def build_lstm_model(window_size=30, n_features=1, compile=True):
+    """
+    Stacked LSTM used across the project (same architecture as notebook 05):
+    LSTM(64) → Dropout → LSTM(32) → Dropout → Dense(1).
+    compile=False gives an inference-only graph (no optimizer state).
+    """
+
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Input, LSTM, Dense, Dropout
+
+    model = Sequential([
+        Input(shape=(window_size, n_features)),
+        LSTM(64, return_sequences=True),
+        Dropout(0.2),
+        LSTM(32),
+        Dropout(0.2),
+        Dense(1)
+    ])
+
+    if compile:
+        model.compile(optimizer="adam", loss="mse")
+
+    return model
@@ -0,0 +1,94 @@
+import asyncio
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into one batched call.
+
+    The first queued item opens a batch; items arriving within max_wait_ms
+    (up to max_batch_size) join it. batch_fn(items) runs in a worker thread
+    and must return one result per item, in order. While a batch is running,
+    new requests queue up and form the next one.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=64, max_wait_ms=5):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, item):
+        """
+        Queue one item and wait for its result.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+
+        return await future
+
+    def stats(self):
+
+        return {
+            "batches": self.batches,
+            "batched_items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0
+        }
+
+    async def _collect(self):
+
+        loop = asyncio.get_running_loop()
+
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+
+            try:
+                results = await loop.run_in_executor(None, self.batch_fn, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
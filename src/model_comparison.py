@@ -1,11 +1,15 @@
+import os
+import time
 import numpy as np
 import pandas as pd
-from sklearn.metrics import mean_absolute_error
-from sklearn.ensemble import RandomForestRegressor
-from statsmodels.tsa.arima.model import ARIMA
+
+from src.preprocessing import scale_series, create_sequences, time_series_split
+from src.baseline_models import BASELINES
 
 
 def evaluate_lstm(model, X_test, y_test, scaler):
+    from sklearn.metrics import mean_absolute_error
+
     y_pred_scaled = model.predict(X_test, verbose=0)
     y_pred = scaler.inverse_transform(y_pred_scaled)
     y_actual = scaler.inverse_transform(y_test)
@@ -15,6 +19,9 @@ def evaluate_lstm(model, X_test, y_test, scaler):
 
 
 def evaluate_random_forest(X_train, y_train, X_test, y_test):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error
+
     model = RandomForestRegressor(n_estimators=100)
     model.fit(X_train.reshape(X_train.shape[0], -1), y_train)
 
@@ -24,6 +31,9 @@ def evaluate_random_forest(X_train, y_train, X_test, y_test):
 
 
 def evaluate_arima(series):
+    from sklearn.metrics import mean_absolute_error
+    from statsmodels.tsa.arima.model import ARIMA
+
     model = ARIMA(series, order=(5,1,0))
     fitted = model.fit()
 
@@ -34,12 +44,269 @@ def evaluate_arima(series):
     return mae
 
 
-def compare_models(lstm_model, X_train, y_train, X_test, y_test, scaler, original_series):
+def fit_ar_differences(series, p=5, method="ols"):
+    """
+    AR(p) coefficients on first differences, i.e. ARIMA(p,1,0) without
+    constant, for many equal-length series at once.
+    series: shape (n_series, T). method: "ols" (conditional least squares,
+    close to statsmodels' MLE) or "yule_walker".
+    Returns coefficients of shape (n_series, p).
+    """
+
+    diffs = np.diff(np.atleast_2d(np.asarray(series, dtype=float)), axis=1)
+
+    if method == "yule_walker":
+        centered = diffs - diffs.mean(axis=1, keepdims=True)
+        m = centered.shape[1]
+        acov = np.stack(
+            [np.einsum("ij,ij->i", centered[:, k:], centered[:, :m - k]) / m for k in range(p + 1)],
+            axis=1
+        )
+        lhs = acov[:, np.abs(np.subtract.outer(np.arange(p), np.arange(p)))]
+        rhs = acov[:, 1:]
+    else:
+        # lags[:, j] = (d[j+p-1], ..., d[j]) predicts d[j+p]
+        lags = np.lib.stride_tricks.sliding_window_view(diffs, p, axis=1)[:, :-1, ::-1]
+        target = diffs[:, p:]
+        lhs = np.einsum("ntk,ntl->nkl", lags, lags)
+        rhs = np.einsum("ntk,nt->nk", lags, target)
+
+    # pinv: flat (constant) series give singular systems
+    return np.einsum("nkl,nl->nk", np.linalg.pinv(lhs), rhs)
+
+
+def predict_ar_differences(series, coef, start):
+    """
+    One-step-ahead level predictions for t in [start, T) from AR
+    coefficients on differences. start must be greater than p.
+    Returns shape (n_series, T - start).
+    """
+
+    series = np.atleast_2d(np.asarray(series, dtype=float))
+    p = coef.shape[1]
+    diffs = np.diff(series, axis=1)
+
+    lags = np.lib.stride_tricks.sliding_window_view(diffs, p, axis=1)[:, start - 1 - p:-1, ::-1]
+
+    return series[:, start - 1:-1] + np.einsum("ntk,nk->nt", lags, coef)
+
+
+def evaluate_arima_fast(series, p=5, test_size=30, method="ols"):
+    """
+    Batched stand-in for evaluate_arima: MAE of in-sample one-step
+    predictions over the last test_size days.
+    series: one series (T,) or equal-length series (n_series, T).
+    Returns a float for one series, else an array of MAEs.
+    """
+
+    series = np.asarray(series, dtype=float)
+    batch = np.atleast_2d(series)
+
+    coef = fit_ar_differences(batch, p, method)
+    preds = predict_ar_differences(batch, coef, batch.shape[1] - test_size)
+
+    mae = np.mean(np.abs(batch[:, -test_size:] - preds), axis=1)
+
+    return float(mae[0]) if series.ndim == 1 else mae
+
+
+def compare_models(lstm_model, X_train, y_train, X_test, y_test, scaler, original_series, fast=False):
+    """
+    fast=True replaces the statsmodels ARIMA fit with the
+    least-squares AR-on-differences estimator (evaluate_arima_fast).
+    """
+
     results = {}
 
     results["LSTM"] = evaluate_lstm(lstm_model, X_test, y_test, scaler)
-    results["ARIMA"] = evaluate_arima(original_series.flatten())
+
+    if fast:
+        results["ARIMA"] = evaluate_arima_fast(original_series.flatten())
+    else:
+        results["ARIMA"] = evaluate_arima(original_series.flatten())
 
     best_model = min(results, key=results.get)
 
     return results, best_model
+
+
+# CATALOG-WIDE COMPARISON
+# =========================================================
+ALL_MODELS = ["LSTM", "ARIMA", "Random Forest", "Naive", "Moving Average", "Seasonal Naive"]
+RESULT_COLUMNS = ["Store ID", "Product ID", "Model", "MAE", "RMSE", "MAPE", "Seconds", "Error"]
+
+# what a model fit is expected to raise on an unusable series
+# (singular / non-stationary ARIMA fits, too few or invalid values)
+FIT_ERRORS = (np.linalg.LinAlgError, ValueError)
+
+_worker_model = None
+
+
+def forecast_metrics(actual, predicted):
+    """
+    MAE, RMSE and MAPE (%) in original units. MAPE skips zero-demand days.
+    """
+
+    actual = np.asarray(actual, dtype=float).flatten()
+    predicted = np.asarray(predicted, dtype=float).flatten()
+    errors = actual - predicted
+    nonzero = actual != 0
+
+    return {
+        "MAE": float(np.mean(np.abs(errors))),
+        "RMSE": float(np.sqrt(np.mean(errors ** 2))),
+        "MAPE": float(np.mean(np.abs(errors[nonzero] / actual[nonzero])) * 100) if nonzero.any() else np.nan
+    }
+
+
+def arima_one_step_predictions(series, split, order=(5, 1, 0)):
+    """
+    Fit ARIMA on series[:split] and return one-step-ahead predictions
+    for series[split:] using the fitted parameters (no refit).
+    """
+
+    import warnings
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fitted = ARIMA(series[:split], order=order).fit()
+        return fitted.apply(series).predict(start=split, end=len(series) - 1)
+
+
+def evaluate_series(lstm_model, demand, window_size=30, train_ratio=0.8, models=ALL_MODELS):
+    """
+    Evaluate every requested model on one series (chronological split).
+    Returns one {"Model", "MAE", "RMSE", "MAPE", "Seconds", "Error"} row
+    per model; a model whose fit fails (FIT_ERRORS) gets NaN metrics and
+    the error message instead of being dropped.
+    """
+
+    scaled, scaler = scale_series(demand)
+    X, y = create_sequences(scaled, window_size)
+    X_train, X_test, y_train, y_test = time_series_split(X, y, train_ratio)
+
+    actual = scaler.inverse_transform(y_test)
+    test_start = window_size + len(X_train)
+
+    rows = []
+
+    for name in models:
+        start = time.perf_counter()
+
+        try:
+            if name == "LSTM":
+                predicted = scaler.inverse_transform(np.asarray(lstm_model.predict_on_batch(X_test)))
+            elif name == "ARIMA":
+                predicted = arima_one_step_predictions(demand.flatten().astype(float), test_start)
+            elif name == "Random Forest":
+                from sklearn.ensemble import RandomForestRegressor
+
+                forest = RandomForestRegressor(n_estimators=100, n_jobs=1, random_state=42)
+                forest.fit(X_train.reshape(len(X_train), -1), y_train.ravel())
+                predicted = scaler.inverse_transform(forest.predict(X_test.reshape(len(X_test), -1)).reshape(-1, 1))
+            else:
+                predicted = scaler.inverse_transform(BASELINES[name](X_test))
+        except FIT_ERRORS as e:
+            rows.append({"Model": name, "MAE": np.nan, "RMSE": np.nan, "MAPE": np.nan,
+                         "Seconds": time.perf_counter() - start, "Error": f"{type(e).__name__}: {e}"})
+            continue
+
+        row = {"Model": name}
+        row.update(forecast_metrics(actual, predicted))
+        row["Seconds"] = time.perf_counter() - start
+        row["Error"] = None
+        rows.append(row)
+
+    return rows
+
+
+def _init_worker(model_path):
+
+    global _worker_model
+
+    if model_path:
+        os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+        from tensorflow.keras.models import load_model
+        _worker_model = load_model(model_path)
+
+
+def _evaluate_task(task):
+
+    key, demand, window_size, train_ratio, models = task
+
+    return key, evaluate_series(_worker_model, demand, window_size, train_ratio, models)
+
+
+def compare_catalog(df, model_path=None, window_size=30, train_ratio=0.8,
+                    models=ALL_MODELS, sample_frac=1.0, workers=None, min_length=None, seed=42):
+    """
+    Evaluate models over every store × product in a process pool
+    (one series per task, so one ARIMA fit per task).
+    Each worker loads the LSTM once. sample_frac < 1 evaluates a random
+    subset of series for quick runs.
+    Returns (per-series results, leaderboard) as DataFrames.
+    """
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    models = [m for m in models if m != "LSTM" or model_path]
+    min_length = min_length or window_size * 3
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values(["Store ID", "Product ID", "Date"])
+
+    tasks = [
+        (key, group["Units Sold"].values.reshape(-1, 1), window_size, train_ratio, models)
+        for key, group in df.groupby(["Store ID", "Product ID"], sort=False)
+        if len(group) >= min_length
+    ]
+
+    if sample_frac < 1:
+        rng = np.random.default_rng(seed)
+        keep = rng.choice(len(tasks), size=max(1, int(round(len(tasks) * sample_frac))), replace=False)
+        tasks = [tasks[i] for i in sorted(keep)]
+
+    # spawn: TensorFlow is not fork-safe
+    context = multiprocessing.get_context("spawn")
+
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(model_path,)) as pool:
+        for (store_id, product_id), series_rows in pool.map(_evaluate_task, tasks):
+            for row in series_rows:
+                rows.append({"Store ID": store_id, "Product ID": product_id, **row})
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    return results, leaderboard(results)
+
+
+def leaderboard(results):
+    """
+    Mean error and time per model across the series it fitted, how often
+    each model had the lowest MAE, and how many series it failed on.
+    """
+
+    if results.empty:
+        return pd.DataFrame(columns=["Model", "MAE", "RMSE", "MAPE", "Seconds", "Series", "Failures", "Wins"])
+
+    failed = results["Error"].notna() if "Error" in results else pd.Series(False, index=results.index)
+
+    board = results.assign(Failed=failed).groupby("Model").agg(
+        MAE=("MAE", "mean"),
+        RMSE=("RMSE", "mean"),
+        MAPE=("MAPE", "mean"),
+        Seconds=("Seconds", "mean"),
+        Series=("Failed", lambda f: int((~f).sum())),
+        Failures=("Failed", "sum")
+    )
+
+    fitted = results[~failed & results["MAE"].notna()]
+    winners = fitted.loc[fitted.groupby(["Store ID", "Product ID"])["MAE"].idxmin(), "Model"]
+    board["Wins"] = winners.value_counts().reindex(board.index).fillna(0).astype(int)
+
+    return board.sort_values("MAE").reset_index()
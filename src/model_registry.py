@@ -0,0 +1,201 @@
+import os
+import json
+import pickle
+import shutil
+import threading
+from datetime import datetime
+
+from src.data_utils import file_version
+from src.instrumentation import timer
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REGISTRY_DIR = os.path.join(PROJECT_ROOT, "outputs", "registry")
+MODEL_PATH = os.path.join(PROJECT_ROOT, "outputs", "model", "lstm_model.keras")
+MANIFEST = "manifest.json"
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+# MANIFEST
+# =========================================================
+def load_manifest(registry_dir=REGISTRY_DIR):
+    """
+    {model name: {"production": version, "versions": {version: metadata}}}
+    """
+
+    path = os.path.join(registry_dir, MANIFEST)
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, registry_dir=REGISTRY_DIR):
+
+    os.makedirs(registry_dir, exist_ok=True)
+    tmp = os.path.join(registry_dir, MANIFEST + ".tmp")
+
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(tmp, os.path.join(registry_dir, MANIFEST))
+
+
+def production_version(name="lstm", registry_dir=REGISTRY_DIR):
+    return load_manifest(registry_dir).get(name, {}).get("production")
+
+
+def version_metadata(name="lstm", version=None, registry_dir=REGISTRY_DIR):
+    """
+    Metadata of a version (default: production), or None.
+    """
+
+    entry = load_manifest(registry_dir).get(name, {})
+    version = version or entry.get("production")
+
+    return entry.get("versions", {}).get(version)
+
+
+# REGISTRATION
+# =========================================================
+def register_model(model, name="lstm", registry_dir=REGISTRY_DIR, window_size=30,
+                   scalers=None, watermark=None, metrics=None, promote=True,
+                   export_path=MODEL_PATH):
+    """
+    Store a new model version:
+
+        <registry>/<name>/<version>/model.keras          full model
+        <registry>/<name>/<version>/model.weights.h5     weights only (fast load)
+        <registry>/<name>/<version>/scalers.pkl          {(store, product): (min, range)}
+
+    Metadata (window size, training watermark, metrics) goes to the manifest.
+    promote=True makes it the production version and exports it to
+    export_path, which the dashboard, service and pipeline load.
+    Returns the version id.
+    """
+
+    manifest = load_manifest(registry_dir)
+    entry = manifest.setdefault(name, {"production": None, "versions": {}})
+
+    version = f"v{len(entry['versions']) + 1}"
+    version_dir = os.path.join(registry_dir, name, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    model.save(os.path.join(version_dir, "model.keras"))
+    model.save_weights(os.path.join(version_dir, "model.weights.h5"))
+
+    if scalers is not None:
+        with open(os.path.join(version_dir, "scalers.pkl"), "wb") as f:
+            pickle.dump(scalers, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    entry["versions"][version] = {
+        "path": os.path.relpath(version_dir, registry_dir),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "window_size": window_size,
+        "watermark": watermark,
+        "metrics": metrics or {},
+        "has_scalers": scalers is not None
+    }
+
+    save_manifest(manifest, registry_dir)
+
+    if promote:
+        promote_version(name, version, registry_dir, export_path)
+
+    return version
+
+
+def promote_version(name, version, registry_dir=REGISTRY_DIR, export_path=MODEL_PATH):
+    """
+    Make version the production model (also used for rollback).
+    """
+
+    manifest = load_manifest(registry_dir)
+    entry = manifest[name]
+
+    if version not in entry["versions"]:
+        raise KeyError(f"Unknown version {name}/{version}")
+
+    entry["production"] = version
+    save_manifest(manifest, registry_dir)
+
+    if export_path:
+        os.makedirs(os.path.dirname(export_path), exist_ok=True)
+        src = os.path.join(registry_dir, entry["versions"][version]["path"], "model.keras")
+        tmp = export_path + ".tmp"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, export_path)
+
+
+def load_scalers(name="lstm", version=None, registry_dir=REGISTRY_DIR):
+
+    meta = version_metadata(name, version, registry_dir)
+
+    if not meta or not meta["has_scalers"]:
+        return None
+
+    with open(os.path.join(registry_dir, meta["path"], "scalers.pkl"), "rb") as f:
+        return pickle.load(f)
+
+
+# LOADING
+# =========================================================
+def load_model_cached(path=MODEL_PATH, weights_only=False, window_size=30):
+    """
+    In-process cache of loaded Keras models, keyed by path and file version,
+    so repeated calls (pipeline loops, jobs) load once and a changed file
+    is picked up. weights_only builds the known architecture
+    (lstm_model.build_lstm_model) and loads a .weights.h5 file into it,
+    skipping deserialisation of the saved config.
+    """
+
+    key = (os.path.abspath(path), file_version(path), weights_only)
+
+    with _models_lock:
+        model = _models.get(key)
+
+        if model is None:
+            with timer("model_load"):
+                if weights_only:
+                    from src.lstm_model import build_lstm_model
+
+                    model = build_lstm_model(window_size, compile=False)
+                    model.load_weights(path)
+                else:
+                    from tensorflow.keras.models import load_model
+
+                    model = load_model(path)
+
+            # drop entries for older versions of the same file
+            for old in [k for k in _models if k[0] == key[0] and k[2] == weights_only]:
+                del _models[old]
+
+            _models[key] = model
+
+    return model
+
+
+def load_registered_model(name="lstm", version=None, registry_dir=REGISTRY_DIR, weights_only=True):
+    """
+    Load a registered version (default: production), cached in-process.
+    Falls back to lstm_model.keras when the registry is empty.
+    """
+
+    meta = version_metadata(name, version, registry_dir)
+
+    if meta is None:
+        if version:
+            raise KeyError(f"Unknown version {name}/{version}")
+        return load_model_cached(MODEL_PATH)
+
+    version_dir = os.path.join(registry_dir, meta["path"])
+
+    if weights_only:
+        return load_model_cached(os.path.join(version_dir, "model.weights.h5"),
+                                 weights_only=True, window_size=meta["window_size"])
+
+    return load_model_cached(os.path.join(version_dir, "model.keras"))
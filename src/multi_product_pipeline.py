@@ -1,13 +1,33 @@
 import os
+import time
+import contextlib
 import numpy as np
-from tensorflow.keras.models import load_model
+import pandas as pd
 
 from src.data_utils import filter_store_product
-from src.preprocessing import scale_series, create_sequences, time_series_split
-from src.decision_engine import generate_inventory_decision
+from src.preprocessing import prepare_forecast_inputs
+from src.decision_engine import (
+    forecast_with_uncertainty, forecast_demand_batch, residual_std_batch, inventory_decision,
+    service_level_z, sku_service_level_z
+)
+from src.demand_segmentation import segment_catalog
+from src.forecast_cache import get_forecast_cache, forecast_key
+from src.instrumentation import timed
+from src.model_registry import MODEL_PATH, load_model_cached
 
 
-def run_pipeline_for_product(df, store_id, product_id, window_size=30):
+@timed("pipeline")
+def run_pipeline_for_product(df, store_id, product_id, window_size=30,
+                             forecast_days=7, current_inventory=500, data_path=None,
+                             segment_table=None):
+    """
+    Forecast and inventory decision for one store × product.
+    When data_path (the file df was loaded from) is given, forecasts are
+    served from / stored in the shared forecast cache.
+    The safety-stock z follows the series' ABC class in segment_table
+    (segment_catalog(df), computed here when not given; pass it when
+    looping over many products).
+    """
 
     # Filter data
     ts_df = filter_store_product(df, store_id, product_id)
@@ -18,30 +38,30 @@ def run_pipeline_for_product(df, store_id, product_id, window_size=30):
 
     demand = ts_df['Units Sold'].values.reshape(-1, 1)
 
-    # Preprocess
-    scaled_demand, scaler = scale_series(demand)
-    X, y = create_sequences(scaled_demand, window_size)
-    X_train, X_test, y_train, y_test = time_series_split(X, y)
+    cache = get_forecast_cache(MODEL_PATH, data_path) if data_path else None
+    key = forecast_key(store_id, product_id, forecast_days, MODEL_PATH, data_path) if cache else None
 
-    # Load pre-trained base model (or retrain if needed)
-    model = load_model("X:\\Data Science Project\\AI-Based-Demand-Forecasting-System-using-LSTM\\outputs\\lstm_model.keras")
+    result = cache.get(key) if cache else None
 
+    if result is None:
+        # Load pre-trained base model (loaded once per process, reloaded if the file changes)
+        model = load_model_cached(MODEL_PATH)
 
-    # Predict
-    y_pred_scaled = model.predict(X_test)
-    y_pred = scaler.inversef_transform(y_pred_scaled)
-    y_actual = scaler.inverse_transform(y_test)
+        # Forecast + residual std for uncertainty
+        result = forecast_with_uncertainty(model, demand, window_size, forecast_days)
 
-    # Compute residual std for uncertainty
-    residual_std = np.std(y_actual - y_pred)
+        if cache:
+            cache.put(key, result)
+
+    if segment_table is None:
+        segment_table = segment_catalog(df)
 
     # Generate decision
-    decision = generate_inventory_decision(
-        model=model,
-        scaled_demand=scaled_demand,
-        scaler=scaler,
-        residual_std=residual_std,
-        window_size=window_size
+    decision = inventory_decision(
+        total_forecast=np.sum(result["forecast"]),
+        residual_std=result["residual_std"],
+        current_inventory=current_inventory,
+        z=sku_service_level_z(segment_table, store_id, product_id)
     )
 
     return {
@@ -49,3 +69,58 @@ def run_pipeline_for_product(df, store_id, product_id, window_size=30):
         "product": product_id,
         "decision": decision
     }
+
+
+@timed("pipeline_batch")
+def run_pipeline_batch(model, keys, series, window_size=30, forecast_days=7,
+                       current_inventory=500, residual_windows=50, model_lock=None,
+                       abc_classes=None):
+    """
+    Scale → forecast → decision for a batch of store × product series,
+    with one batched model call per forecast day.
+    keys: (store_id, product_id) per series; series: raw Units Sold, shape (n, 1).
+    abc_classes: ABC class per series (segment_catalog) setting the
+    safety-stock z; unknown classes use 1.96.
+    model_lock serialises model calls when batches run on several threads
+    (concurrent Keras calls retrace and slow each other down), while
+    scaling and decisions still overlap.
+    Returns (one row per series as a DataFrame, seconds spent per stage).
+    """
+
+    model_lock = model_lock or contextlib.nullcontext()
+
+    timings = {}
+
+    start = time.perf_counter()
+    inputs = prepare_forecast_inputs(series, window_size, residual_windows)
+    timings["scale"] = time.perf_counter() - start
+
+    with model_lock:
+        start = time.perf_counter()
+        scaled = forecast_demand_batch(model, inputs["windows"], forecast_days)
+        forecast = scaled * inputs["ranges"][:, None] + inputs["mins"][:, None]
+        timings["forecast"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        residual_std = residual_std_batch(model, inputs["residual_X"], inputs["residual_y"], inputs["scalers"])
+        timings["uncertainty"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = []
+
+    abc_classes = [None] * len(keys) if abc_classes is None else abc_classes
+
+    for (store_id, product_id), future, std, abc_class in zip(keys, forecast, residual_std, abc_classes):
+        z = service_level_z(abc_class)
+        decision = inventory_decision(np.sum(future), std, current_inventory, z=z)
+
+        row = {"Store ID": store_id, "Product ID": product_id, "ABC": abc_class, "Service Level Z": z}
+        row.update({f"Day {day + 1}": float(value) for day, value in enumerate(future)})
+        row["Total Forecast"] = decision.pop("forecast_7_days")
+        row["Residual Std"] = float(std)
+        row.update(decision)
+        rows.append(row)
+
+    timings["decision"] = time.perf_counter() - start
+
+    return pd.DataFrame(rows), timings
@@ -1,20 +1,88 @@
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
 
-def scale_series(series):
+from src.instrumentation import record_nbytes, timed
+
+
+# dtype of the scaled data path (scaling → windows → prediction → inverse transform);
+# Keras computes in float32, so float64 only doubles memory and adds casts
+FLOAT_DTYPE = np.float32
+
+
+@timed("scale")
+def scale_series(series, dtype=FLOAT_DTYPE):
+    """
+    Min-max scale a series of shape (n, 1) to [0, 1].
+    Scaled values and the fitted scaler (and its inverse_transform) keep dtype.
+    """
+
+    from sklearn.preprocessing import MinMaxScaler
+
     scaler = MinMaxScaler()
-    scaled = scaler.fit_transform(series)
+    scaled = scaler.fit_transform(np.asarray(series, dtype=dtype))
+    record_nbytes("scale", scaled)
     return scaled, scaler
 
 
+@timed("sequence_build")
 def create_sequences(data, window_size):
-    X, y = [], []
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(data[i + window_size])
-    return np.array(X), np.array(y)
+    """
+    Sliding windows X[i] = data[i:i + window_size] and targets
+    y[i] = data[i + window_size], in the dtype of data.
+    """
+
+    data = np.asarray(data)
+    n = len(data) - window_size
+
+    if n <= 0:
+        features = data.shape[1:]
+        return np.empty((0, window_size) + features, dtype=data.dtype), np.empty((0,) + features, dtype=data.dtype)
+
+    # (n, features, window) view → (n, window, features) copy
+    windows = np.lib.stride_tricks.sliding_window_view(data[:-1], window_size, axis=0)
+    X = np.ascontiguousarray(np.moveaxis(windows, -1, 1))
+    y = data[window_size:].copy()
+
+    record_nbytes("sequence_build", X, y)
+    return X, y
 
 
 def time_series_split(X, y, train_ratio=0.8):
     split = int(len(X) * train_ratio)
     return X[:split], X[split:], y[:split], y[split:]
+
+
+def prepare_forecast_inputs(series_list, window_size=30, residual_windows=50, dtype=FLOAT_DTYPE):
+    """
+    Scale many demand series and collect what a batched forecast needs:
+    last windows, scaler min / range, and the most recent (X, y) pairs
+    for residual estimation. series_list: raw Units Sold arrays, shape (n, 1).
+    """
+
+    windows, mins, ranges = [], [], []
+    residual_X, residual_y, scalers = [], [], []
+
+    for demand in series_list:
+        scaled, scaler = scale_series(demand, dtype)
+
+        # only the tail is needed for residuals; skip windowing the full history
+        X, y = create_sequences(scaled[-(window_size + residual_windows):], window_size)
+
+        windows.append(scaled[-window_size:, 0])
+        mins.append(scaler.data_min_[0])
+        ranges.append(scaler.data_range_[0])
+        residual_X.append(X)
+        residual_y.append(y)
+        scalers.append(scaler)
+
+    inputs = {
+        "windows": np.array(windows, dtype=dtype),
+        "mins": np.array(mins, dtype=dtype),
+        "ranges": np.array(ranges, dtype=dtype),
+        "residual_X": residual_X,
+        "residual_y": residual_y,
+        "scalers": scalers
+    }
+
+    record_nbytes("forecast_inputs", inputs["windows"], inputs["mins"], inputs["ranges"], *residual_X, *residual_y)
+
+    return inputs
@@ -0,0 +1,177 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed
+
+
+DEFAULT_THRESHOLD = 5.0   # alert when competitor is this % below our price
+MAX_EVENTS = 1000
+
+
+def price_gap_percent(price, competitor_price):
+    """
+    (Competitor - own) / own price × 100; negative = competitor cheaper.
+    """
+
+    price = np.asarray(price, dtype=float)
+
+    return (np.asarray(competitor_price, dtype=float) - price) / np.where(price > 0, price, np.nan) * 100
+
+
+class CompetitorAlertIndex:
+    """
+    Latest competitor price gap per store × product, with the set of
+    series currently below their threshold indexed by store.
+
+    ingest() takes new rows (any batch, e.g. one day of data) and emits
+    events only when a series crosses its threshold ("alert") or
+    recovers ("cleared"); unchanged states produce nothing.
+    Thresholds can be set per category. Not thread-safe: use one writer.
+    """
+
+    def __init__(self, threshold_percent=DEFAULT_THRESHOLD, category_thresholds=None, max_events=MAX_EVENTS):
+
+        self.threshold_percent = threshold_percent
+        self.category_thresholds = dict(category_thresholds or {})
+
+        self.latest = {}      # (store, product) → latest observation
+        self.by_store = {}    # store → {product: active alert}
+        self.n_active = 0
+
+        self.events = deque(maxlen=max_events)
+        self.sequence = 0
+
+    def threshold(self, category):
+        return self.category_thresholds.get(category, self.threshold_percent)
+
+    def ingest(self, df):
+        """
+        Update the index from new rows (Date, Store ID, Product ID,
+        Category, Price, Competitor Pricing). Rows older than the
+        stored observation of a series are ignored.
+        Returns the new events.
+        """
+
+        if df.empty:
+            return []
+
+        latest = df.assign(Date=pd.to_datetime(df["Date"])).sort_values("Date")
+        latest = latest.drop_duplicates(["Store ID", "Product ID"], keep="last")
+
+        gaps = price_gap_percent(latest["Price"].values, latest["Competitor Pricing"].values)
+        thresholds = latest["Category"].map(self.threshold).values.astype(float)
+        below = gaps < -thresholds
+
+        new_events = []
+
+        for store_id, product_id, category, date, price, competitor, gap, threshold, is_below in zip(
+                latest["Store ID"].values, latest["Product ID"].values, latest["Category"].values,
+                latest["Date"].values, latest["Price"].values, latest["Competitor Pricing"].values,
+                gaps, thresholds, below):
+
+            key = (store_id, product_id)
+            previous = self.latest.get(key)
+            date = pd.Timestamp(date)
+
+            if previous is not None and date < previous["Date"]:
+                continue
+
+            observation = {
+                "Store ID": store_id,
+                "Product ID": product_id,
+                "Category": category,
+                "Date": date,
+                "Price": float(price),
+                "Competitor Pricing": float(competitor),
+                "Price Gap %": float(gap),
+                "Threshold %": float(threshold)
+            }
+            self.latest[key] = observation
+
+            store_alerts = self.by_store.setdefault(store_id, {})
+            was_active = product_id in store_alerts
+
+            if is_below:
+                store_alerts[product_id] = observation
+            elif was_active:
+                del store_alerts[product_id]
+
+            if is_below != was_active:
+                self.n_active += 1 if is_below else -1
+                new_events.append(self._event("alert" if is_below else "cleared", observation))
+
+        return new_events
+
+    def _event(self, kind, observation):
+
+        self.sequence += 1
+        event = {"Sequence": self.sequence, "Event": kind, **observation}
+        self.events.append(event)
+
+        return event
+
+    def set_threshold(self, threshold_percent, category=None):
+        """
+        Change the default or one category's threshold and re-evaluate
+        the latest observations (emits events for series that cross).
+        """
+
+        if category is None:
+            self.threshold_percent = threshold_percent
+        else:
+            self.category_thresholds[category] = threshold_percent
+
+        if not self.latest:
+            return []
+
+        return self.ingest(pd.DataFrame(list(self.latest.values())))
+
+    def current_alerts(self, store_id):
+        """
+        Active alerts of one store (dict lookup, independent of catalog size).
+        """
+
+        return list(self.by_store.get(store_id, {}).values())
+
+    def alert(self, store_id, product_id):
+        """
+        Active alert of one store × product, or None.
+        """
+
+        return self.by_store.get(store_id, {}).get(product_id)
+
+    def has_alerts(self):
+        return self.n_active > 0
+
+    def events_after(self, sequence=0):
+        """
+        Events with a sequence number above `sequence` still in the buffer
+        (for polling consumers).
+        """
+
+        return [event for event in self.events if event["Sequence"] > sequence]
+
+    def alerts_frame(self):
+        """
+        All active alerts as a DataFrame (largest undercut first).
+        """
+
+        rows = [alert for store_alerts in self.by_store.values() for alert in store_alerts.values()]
+        columns = ["Store ID", "Product ID", "Category", "Date", "Price",
+                   "Competitor Pricing", "Price Gap %", "Threshold %"]
+
+        return pd.DataFrame(rows, columns=columns).sort_values("Price Gap %").reset_index(drop=True)
+
+
+@timed()
+def build_alert_index(df, threshold_percent=DEFAULT_THRESHOLD, category_thresholds=None):
+    """
+    Alert index over the latest observation of every series in df.
+    """
+
+    index = CompetitorAlertIndex(threshold_percent, category_thresholds)
+    index.ingest(df[["Date", "Store ID", "Product ID", "Category", "Price", "Competitor Pricing"]])
+
+    return index
@@ -1,13 +1,17 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
+from src.instrumentation import timed
 
+
+@timed()
 def estimate_price_elasticity(df, store_id=None, product_id=None):
     """
     Estimate price elasticity using log-log regression.
     """
 
+    from sklearn.linear_model import LinearRegression
+
     if store_id and product_id:
         df = df[
             (df["Store ID"] == store_id) &
@@ -62,6 +66,7 @@ def suggest_optimal_price(current_price, elasticity, competitor_price=None):
 
 
 
+@timed()
 def competitor_price_alert(df, threshold_percent=5):
     """
     Alert when competitor price drops significantly.
@@ -1,20 +1,48 @@
 import pandas as pd
 import numpy as np
 
+from src.instrumentation import timed
 
-def promotion_uplift_analysis(df):
+
+# string values that mark a promotion day; holiday impact also counts "holiday"
+PROMOTION_VALUES = ["yes", "1", "true"]
+HOLIDAY_VALUES = ["yes", "holiday", "1", "true"]
+PROMOTION_LEVELS = {
+    "Total": [],
+    "Region": ["Region"],
+    "Category": ["Category"],
+    "Store": ["Store ID"],
+    "Product": ["Product ID"],
+    "Store × Product": ["Store ID", "Product ID"]
+}
+
+
+def promotion_flag(values, flag_values=PROMOTION_VALUES):
     """
-    Compare average demand during promotion vs non-promotion.
+    Holiday/Promotion as a boolean array, normalised once:
+    True for the (lower-case) strings in flag_values.
+    Numeric columns (0/1) skip the string conversion.
     """
 
-    df["Holiday/Promotion"] = df["Holiday/Promotion"].astype(str)
+    values = pd.Series(values)
 
-    promo_data = df[df["Holiday/Promotion"].astype(str).str.lower().isin(["yes", "1", "true"])]
-    non_promo_data = df[~df.index.isin(promo_data.index)]
+    if pd.api.types.is_numeric_dtype(values):
+        return (values != 0).values
+
+    return values.astype(str).str.lower().isin(flag_values).values
+
+
+@timed()
+def promotion_uplift_analysis(df):
+    """
+    Compare average demand during promotion vs non-promotion.
+    """
 
+    promo = promotion_flag(df["Holiday/Promotion"])
+    units = df["Units Sold"].values
 
-    promo_avg = promo_data["Units Sold"].mean()
-    non_promo_avg = non_promo_data["Units Sold"].mean()
+    promo_avg = units[promo].mean() if promo.any() else np.nan
+    non_promo_avg = units[~promo].mean() if (~promo).any() else np.nan
 
     uplift = ((promo_avg - non_promo_avg) / non_promo_avg) * 100
 
@@ -27,18 +55,17 @@ def promotion_uplift_analysis(df):
 
 
 
+@timed()
 def promotion_effectiveness_score(df):
     """
     Measure how promotions performed vs forecast.
     """
 
-    promo_df = df[df["Holiday/Promotion"] == "Yes"]
+    promo = promotion_flag(df["Holiday/Promotion"])
 
-    promo_df["Forecast Error"] = (
-        promo_df["Units Sold"] - promo_df["Demand Forecast"]
-    )
+    forecast_error = df["Units Sold"].values[promo] - df["Demand Forecast"].values[promo]
 
-    avg_error = promo_df["Forecast Error"].mean()
+    avg_error = forecast_error.mean() if promo.any() else np.nan
 
     return {
         "Average Forecast Error During Promotion": avg_error
@@ -47,24 +74,22 @@ def promotion_effectiveness_score(df):
 
 
 
+@timed()
 def holiday_impact_analysis(df):
     """
     Analyze demand during holiday periods.
     """
 
-    # Detect holiday rows dynamically
-    holiday_df = df[df["Holiday/Promotion"].astype(str).str.lower().isin(
-        ["yes", "holiday", "1", "true"]
-    )]
+    holiday = promotion_flag(df["Holiday/Promotion"], HOLIDAY_VALUES)
 
-    if holiday_df.empty:
+    if not holiday.any():
         return {
             "Holiday Avg Sales": 0,
             "Overall Avg Sales": df["Units Sold"].mean(),
             "Holiday Impact %": 0
         }
 
-    holiday_avg = holiday_df["Units Sold"].mean()
+    holiday_avg = df["Units Sold"].values[holiday].mean()
     overall_avg = df["Units Sold"].mean()
 
     impact_percent = ((holiday_avg - overall_avg) / overall_avg) * 100
@@ -75,3 +100,81 @@ def holiday_impact_analysis(df):
         "Holiday Impact %": impact_percent
     }
 
+
+
+
+@timed()
+def promotion_uplift_table(df, levels=PROMOTION_LEVELS):
+    """
+    Uplift %, holiday impact % and promotion forecast error for every
+    store, product, category, region and store × product.
+
+    One grouped aggregation (units, days and forecast error in total,
+    on promotion days and on holiday days) at the finest level; coarser
+    levels are sums of it.
+    Returns one row per Level × Node, indexed for lookup.
+    """
+
+    promo = promotion_flag(df["Holiday/Promotion"])
+    holiday = promotion_flag(df["Holiday/Promotion"], HOLIDAY_VALUES)
+    units = df["Units Sold"].values
+    error = (units - df["Demand Forecast"].values) if "Demand Forecast" in df else np.zeros(len(df))
+
+    keys = ["Region", "Category", "Store ID", "Product ID"]
+
+    stats = (
+        df[keys]
+        .assign(Units=units, Days=1,
+                PromoUnits=np.where(promo, units, 0), PromoDays=promo.astype(int),
+                PromoError=np.where(promo, error, 0),
+                HolidayUnits=np.where(holiday, units, 0), HolidayDays=holiday.astype(int))
+        .groupby(keys)
+        .sum()
+    )
+
+    frames = []
+
+    for level, columns in levels.items():
+
+        if columns:
+            grouped = stats.groupby(level=columns).sum()
+            nodes = grouped.index.map(" / ".join) if len(columns) > 1 else grouped.index
+        else:
+            grouped = stats.sum().to_frame().T
+            nodes = ["Total"]
+
+        promo_days = grouped["PromoDays"]
+        promo_avg = grouped["PromoUnits"] / promo_days.replace(0, np.nan)
+        non_promo_avg = (grouped["Units"] - grouped["PromoUnits"]) / (grouped["Days"] - promo_days).replace(0, np.nan)
+        holiday_avg = grouped["HolidayUnits"] / grouped["HolidayDays"].replace(0, np.nan)
+        overall_avg = grouped["Units"] / grouped["Days"]
+
+        frames.append(pd.DataFrame({
+            "Level": level,
+            "Node": np.asarray(nodes),
+            "Promotion Avg Sales": promo_avg.values,
+            "Non-Promotion Avg Sales": non_promo_avg.values,
+            "Uplift %": ((promo_avg - non_promo_avg) / non_promo_avg * 100).values,
+            "Holiday Impact %": ((holiday_avg - overall_avg) / overall_avg * 100).values,
+            "Promotion Forecast Error": (grouped["PromoError"] / promo_days.replace(0, np.nan)).values,
+            "Promotion Days": promo_days.values.astype(int)
+        }))
+
+    return pd.concat(frames, ignore_index=True).set_index(["Level", "Node"])
+
+
+
+
+def promotion_lookup(table, store_id, product_id):
+    """
+    Promotion row of one store × product as a dict
+    (same keys as promotion_uplift_analysis / holiday_impact_analysis),
+    or None when the series is not in the table.
+    """
+
+    key = ("Store × Product", f"{store_id} / {product_id}")
+
+    if table is None or key not in table.index:
+        return None
+
+    return table.loc[key].to_dict()
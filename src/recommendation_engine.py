@@ -1,147 +1,257 @@
+import operator
+
 import numpy as np
+import pandas as pd
 
+from src.instrumentation import timed
 
-def generate_recommendations(
+
+# Declarative rules, evaluated as boolean masks over a feature table
+# (one row per SKU). "when" conditions are ANDed; "value" fills the {}
+# in the message. Lower priority = more urgent. Priorities follow the
+# order of the original if-chain (stock, price, competitor, regions,
+# holiday, promotion, categories, seasonality, trend); the segment and
+# demand-pattern rules come last.
+RULES = [
+    {"id": "stockout", "priority": 1,
+     "when": [("Inventory Gap", ">", 0)],
+     "message": "Increase inventory by {} units to avoid stockout.", "value": "Inventory Gap"},
+    {"id": "a_class_stockout", "priority": 1,
+     "when": [("ABC Class", "==", "A"), ("Inventory Gap", ">", 0)],
+     "message": "Top-revenue item (class A) is below its reorder point. Prioritise its replenishment."},
+    {"id": "elastic_demand", "priority": 2,
+     "when": [("Elasticity", "<", -1)],
+     "message": "Demand is highly price sensitive. Consider reducing price slightly to increase volume."},
+    {"id": "inelastic_demand", "priority": 2,
+     "when": [("Elasticity", ">", -1), ("Elasticity", "<", 0)],
+     "message": "Demand is relatively inelastic. Consider small price increase to improve margins."},
+    {"id": "competitor_undercut", "priority": 3,
+     "when": [("Competitor Alert", "==", True)],
+     "message": "Competitor undercut detected. Review pricing strategy immediately."},
+    {"id": "declining_regions", "priority": 4,
+     "when": [("Declining Regions", ">", 0)],
+     "message": "Some regions show declining growth. Consider targeted regional campaigns."},
+    {"id": "holiday_impact", "priority": 5,
+     "when": [("Holiday Impact %", ">", 15)],
+     "message": "Holiday demand impact is strong. Increase stock before major holidays."},
+    {"id": "promotion_uplift", "priority": 6,
+     "when": [("Uplift %", ">", 10)],
+     "message": "Promotions significantly boost demand. Plan strategic future campaigns."},
+    {"id": "low_margin_categories", "priority": 7,
+     "when": [("Low Margin Categories", ">", 0)],
+     "message": "Some categories have low margins. Consider price optimization or cost reduction."},
+    {"id": "volatile_regions", "priority": 8,
+     "when": [("Volatile Regions", ">", 0)],
+     "message": "High demand volatility detected in some regions. Maintain higher safety stock."},
+    {"id": "low_efficiency_regions", "priority": 9,
+     "when": [("Low Efficiency Regions", ">", 0)],
+     "message": "Low stock efficiency observed. Consider redistributing inventory."},
+    {"id": "seasonality", "priority": 10,
+     "when": [("Seasonality Strength", ">", 0.3)],
+     "message": "Strong seasonality detected. Align inventory and promotions with seasonal peaks."},
+    {"id": "trend_up", "priority": 11,
+     "when": [("Long-Term Trend", "==", "up")],
+     "message": "Long-term demand trend is upward. Consider expansion strategy."},
+    {"id": "trend_down", "priority": 11,
+     "when": [("Long-Term Trend", "==", "down")],
+     "message": "Long-term demand trend is weakening. Monitor demand carefully."},
+    {"id": "volatile_segment", "priority": 12,
+     "when": [("Demand Segment", "==", "Highly Volatile")],
+     "message": "Product demand is highly volatile. Maintain higher safety stock and avoid aggressive pricing."},
+    {"id": "intermittent_demand", "priority": 12,
+     "when": [("Demand Pattern", "in", ["Intermittent", "Lumpy"])],
+     "message": "Demand is intermittent. Plan stock per demand occurrence (Croston) rather than daily averages."},
+    {"id": "stable_segment", "priority": 13,
+     "when": [("Demand Segment", "==", "Stable")],
+     "message": "Product demand is stable. Consider lean inventory strategy and margin optimization."},
+    {"id": "c_class_erratic", "priority": 13,
+     "when": [("ABC Class", "==", "C"), ("Demand Pattern", "in", ["Erratic", "Lumpy"])],
+     "message": "Low-revenue item with erratic demand. Consider order-on-demand or assortment review."},
+]
+
+FALLBACK = "System stable. No immediate action required."
+
+OPERATORS = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt,
+    "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+    "in": lambda column, values: column.isin(values)
+}
+CATEGORICAL_FEATURES = ["Demand Segment", "Demand Pattern", "ABC Class"]
+
+
+@timed()
+def recommendation_features(
     forecast_total,
     safety_stock,
     current_inventory,
     elasticity,
-    competitor_alerts,
-    region_growth_data,
-    holiday_impact,
-    promotion_uplift,
+    competitor_alert=False,
+    region_growth_data=None,
+    holiday_impact=np.nan,
+    promotion_uplift=np.nan,
     category_profitability=None,
     region_volatility=None,
     region_efficiency=None,
-    seasonality_strength_score=None,
+    seasonality_strength_score=np.nan,
     long_term_trend=None,
-    demand_segment=None
+    demand_segment=None,
+    demand_pattern=None,
+    abc_class=None,
+    keys=None
 ):
+    """
+    Feature table the rules run on, one row per SKU.
+    Per-SKU inputs are scalars or arrays (broadcast together);
+    dataset-wide tables (regions, categories, trend) are reduced once
+    to counts shared by every row.
+    """
+
+    columns = {
+        "Forecast Total": forecast_total,
+        "Safety Stock": safety_stock,
+        "Current Inventory": current_inventory,
+        "Elasticity": elasticity,
+        "Competitor Alert": competitor_alert,
+        "Holiday Impact %": holiday_impact,
+        "Uplift %": promotion_uplift,
+        "Seasonality Strength": seasonality_strength_score,
+        "Demand Segment": demand_segment,
+        "Demand Pattern": demand_pattern,
+        "ABC Class": abc_class,
+    }
+
+    n_rows = len(keys) if keys is not None else max(np.size(v) for v in columns.values())
+    features = pd.DataFrame({
+        name: np.broadcast_to(np.asarray(value, dtype=object if name in CATEGORICAL_FEATURES else None), (n_rows,))
+        for name, value in columns.items()
+    })
+
+    if keys is not None:
+        features.insert(0, "Store ID", [k[0] for k in keys])
+        features.insert(1, "Product ID", [k[1] for k in keys])
+
+    features["Inventory Gap"] = (
+        features["Forecast Total"] + features["Safety Stock"] - features["Current Inventory"]
+    ).astype(float)
 
+    features["Declining Regions"] = (
+        int((region_growth_data["Growth Rate %"] < 0).sum()) if region_growth_data is not None else 0
+    )
+    features["Low Margin Categories"] = (
+        int((category_profitability["Profit Margin %"] < 10).sum()) if category_profitability is not None else 0
+    )
+    features["Volatile Regions"] = (
+        int((region_volatility["Demand Volatility"] > region_volatility["Demand Volatility"].mean()).sum())
+        if region_volatility is not None else 0
+    )
+    features["Low Efficiency Regions"] = (
+        int((region_efficiency["Stock Efficiency"] < region_efficiency["Stock Efficiency"].mean()).sum())
+        if region_efficiency is not None else 0
+    )
+
+    if long_term_trend is None:
+        features["Long-Term Trend"] = None
+    else:
+        features["Long-Term Trend"] = "up" if long_term_trend.iloc[-1] > long_term_trend.mean() else "down"
+
+    return features
+
+
+@timed()
+def evaluate_rules(features, rules=RULES):
     """
-    Generate AI-driven strategic recommendations using multi-level intelligence.
+    Evaluate every rule over all rows at once (one boolean mask per rule).
+    Returns one row per SKU × fired rule, ranked by priority within the SKU;
+    rows with no fired rule get the fallback message.
     """
 
-    recommendations = []
-
-    # ---------------- Inventory Logic ----------------
-    reorder_point = forecast_total + safety_stock
-
-    if current_inventory < reorder_point:
-        recommendations.append(
-            f"Increase inventory by {int(reorder_point - current_inventory)} units to avoid stockout."
-        )
-
-    # ---------------- Pricing Logic ----------------
-    if elasticity < -1:
-        recommendations.append(
-            "Demand is highly price sensitive. Consider reducing price slightly to increase volume."
-        )
-    elif -1 < elasticity < 0:
-        recommendations.append(
-            "Demand is relatively inelastic. Consider small price increase to improve margins."
-        )
-
-    # ---------------- Competitor Monitoring ----------------
-    if competitor_alerts is not None and len(competitor_alerts) > 0:
-        recommendations.append(
-            "Competitor undercut detected. Review pricing strategy immediately."
-        )
-
-    # ---------------- Regional Growth ----------------
-    if region_growth_data is not None:
-        declining_regions = region_growth_data[
-            region_growth_data["Growth Rate %"] < 0
-        ]
-
-        if len(declining_regions) > 0:
-            recommendations.append(
-                "Some regions show declining growth. Consider targeted regional campaigns."
-            )
-
-    # ---------------- Holiday Impact ----------------
-    if holiday_impact and holiday_impact.get("Holiday Impact %", 0) > 15:
-        recommendations.append(
-            "Holiday demand impact is strong. Increase stock before major holidays."
-        )
-
-    # ---------------- Promotion Uplift ----------------
-    if promotion_uplift and promotion_uplift.get("Uplift %", 0) > 10:
-        recommendations.append(
-            "Promotions significantly boost demand. Plan strategic future campaigns."
-        )
-
-    # ---------------- Category Profitability ----------------
-    if category_profitability is not None:
-        low_margin_categories = category_profitability[
-            category_profitability["Profit Margin %"] < 10
-        ]
-
-        if len(low_margin_categories) > 0:
-            recommendations.append(
-                "Some categories have low margins. Consider price optimization or cost reduction."
-            )
-
-    # ---------------- Region Volatility ----------------
-    if region_volatility is not None:
-        high_vol_regions = region_volatility[
-            region_volatility["Demand Volatility"] >
-            region_volatility["Demand Volatility"].mean()
-        ]
-
-        if len(high_vol_regions) > 0:
-            recommendations.append(
-                "High demand volatility detected in some regions. Maintain higher safety stock."
-            )
-
-    # ---------------- Stock Efficiency ----------------
-    if region_efficiency is not None:
-        low_eff_regions = region_efficiency[
-            region_efficiency["Stock Efficiency"] <
-            region_efficiency["Stock Efficiency"].mean()
-        ]
-
-        if len(low_eff_regions) > 0:
-            recommendations.append(
-                "Low stock efficiency observed. Consider redistributing inventory."
-            )
-
-    # ---------------- Seasonality Strength ----------------
-    if seasonality_strength_score is not None and seasonality_strength_score > 0.3:
-        recommendations.append(
-            "Strong seasonality detected. Align inventory and promotions with seasonal peaks."
-        )
-
-    # ---------------- Long-Term Trend ----------------
-    if long_term_trend is not None:
-        if long_term_trend.iloc[-1] > long_term_trend.mean():
-            recommendations.append(
-                "Long-term demand trend is upward. Consider expansion strategy."
-            )
+    fired = []
+
+    for order, rule in enumerate(rules):
+
+        mask = np.ones(len(features), dtype=bool)
+        for column, op, value in rule["when"]:
+            mask &= np.asarray(OPERATORS[op](features[column], value).fillna(False), dtype=bool)
+
+        rows = np.flatnonzero(mask)
+
+        if len(rows) == 0:
+            continue
+
+        if "value" in rule:
+            prefix, suffix = rule["message"].split("{}")
+            values = features[rule["value"]].values[rows].astype(float).astype(int).astype(str)
+            messages = prefix + pd.Series(values, dtype=object) + suffix
         else:
-            recommendations.append(
-                "Long-term demand trend is weakening. Monitor demand carefully."
-            )
+            messages = pd.Series(rule["message"], index=range(len(rows)))
 
-    if len(recommendations) == 0:
-        recommendations.append("System stable. No immediate action required.")
+        fired.append(pd.DataFrame({
+            "Row": rows,
+            "Priority": rule["priority"],
+            "Order": order,
+            "Rule": rule["id"],
+            "Recommendation": messages.values
+        }))
 
-    return recommendations
+    columns = ["Row", "Priority", "Order", "Rule", "Recommendation"]
+    table = pd.concat(fired, ignore_index=True) if fired else pd.DataFrame(columns=columns)
 
+    silent = np.setdiff1d(np.arange(len(features)), table["Row"].values)
+    fallback = pd.DataFrame({"Row": silent, "Priority": 99, "Order": len(rules),
+                             "Rule": "stable", "Recommendation": FALLBACK})
 
+    table = pd.concat([table, fallback], ignore_index=True).sort_values(["Row", "Priority", "Order"])
+    table["Rank"] = table.groupby("Row").cumcount() + 1
 
-    # ---------------- Demand Segmentation Logic ----------------
+    keys = [c for c in ("Store ID", "Product ID") if c in features]
+    table = pd.concat([
+        features[keys].iloc[table["Row"].values].reset_index(drop=True),
+        table[["Row", "Rank", "Priority", "Rule", "Recommendation"]].reset_index(drop=True)
+    ], axis=1)
 
-    if demand_segment == "Highly Volatile":
-        recommendations.append(
-            "Product demand is highly volatile. Maintain higher safety stock and avoid aggressive pricing."
-        )
+    return table
 
-    elif demand_segment == "Stable":
-        recommendations.append(
-            "Product demand is stable. Consider lean inventory strategy and margin optimization."
-        )
 
+@timed()
+def generate_recommendations(
+    forecast_total,
+    safety_stock,
+    current_inventory,
+    elasticity,
+    competitor_alerts,
+    region_growth_data,
+    holiday_impact,
+    promotion_uplift,
+    category_profitability=None,
+    region_volatility=None,
+    region_efficiency=None,
+    seasonality_strength_score=None,
+    long_term_trend=None,
+    demand_segment=None,
+    demand_pattern=None,
+    abc_class=None
+):
 
+    """
+    Generate AI-driven strategic recommendations using multi-level intelligence.
+    Single-product entry point of the rule engine (one-row feature table);
+    returns the messages in rank order.
+    """
 
+    features = recommendation_features(
+        forecast_total, safety_stock, current_inventory, elasticity,
+        competitor_alert=competitor_alerts is not None and len(competitor_alerts) > 0,
+        region_growth_data=region_growth_data,
+        holiday_impact=(holiday_impact or {}).get("Holiday Impact %", np.nan),
+        promotion_uplift=(promotion_uplift or {}).get("Uplift %", np.nan),
+        category_profitability=category_profitability,
+        region_volatility=region_volatility,
+        region_efficiency=region_efficiency,
+        seasonality_strength_score=np.nan if seasonality_strength_score is None else seasonality_strength_score,
+        long_term_trend=long_term_trend,
+        demand_segment=demand_segment,
+        demand_pattern=demand_pattern,
+        abc_class=abc_class
+    )
 
+    return evaluate_rules(features)["Recommendation"].tolist()
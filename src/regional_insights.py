@@ -1,37 +1,63 @@
 import pandas as pd
-import numpy as np
 
+from src.rollup_cube import rollup_table, rollup_totals, rollup_std
+from src.sketches import AnalyticsSketch
+from src.instrumentation import timed
 
+
+# All functions take raw rows or a RollupCube (rollup_cube.build_rollup_cube);
+# with a cube they only read its small Region tables.
+# region_demand_volatility also takes an AnalyticsSketch (approximate mode, src/sketches.py).
+
+
+def _monthly_growth(df, growth_column):
+    """
+    Monthly Units Sold per region with month-over-month growth.
+    """
+
+    monthly_sales = rollup_table(df, ("Region",), "M")["Units Sold"].reset_index()
+    monthly_sales.insert(1, "YearMonth", monthly_sales.pop("Date").dt.to_period("M"))
+
+    monthly_sales[growth_column] = (
+        monthly_sales.groupby("Region")["Units Sold"]
+        .pct_change() * 100
+    )
+
+    return monthly_sales
+
+
+@timed()
 def region_store_summary(df):
     """
     Aggregate performance metrics by Region and Store.
     """
 
-    summary = df.groupby(["Region", "Store ID"]).agg({
-        "Units Sold": "sum",
-        "Inventory Level": "mean",
-        "Price": "mean",
-        "Discount": "mean"
-    }).reset_index()
+    totals = rollup_totals(df, ("Region", "Store ID"))
+
+    summary = totals[["Region", "Store ID", "Units Sold"]].copy()
+
+    for column in ["Inventory Level", "Price", "Discount"]:
+        summary[column] = totals[column] / totals["Rows"]
 
     return summary
 
 
+@timed()
 def region_demand_heatmap(df):
     """
     Create pivot table for heatmap visualization.
     """
 
-    pivot = df.pivot_table(
-        values="Units Sold",
+    pivot = rollup_totals(df, ("Region", "Category")).pivot(
         index="Region",
         columns="Category",
-        aggfunc="sum"
+        values="Units Sold"
     )
 
     return pivot
 
 
+@timed()
 def suggest_inventory_redistribution(df):
     """
     Suggest stock transfer from overstocked stores to understocked stores.
@@ -39,10 +65,9 @@ def suggest_inventory_redistribution(df):
 
     redistribution_plan = []
 
-    region_groups = df.groupby(["Region", "Store ID"]).agg({
-        "Inventory Level": "mean",
-        "Units Sold": "mean"
-    }).reset_index()
+    region_groups = rollup_totals(df, ("Region", "Store ID"))
+    region_groups["Inventory Level"] = region_groups["Inventory Level"] / region_groups["Rows"]
+    region_groups["Units Sold"] = region_groups["Units Sold"] / region_groups["Rows"]
 
     region_groups["Stock Ratio"] = (
         region_groups["Inventory Level"] /
@@ -70,47 +95,31 @@ def suggest_inventory_redistribution(df):
 
 
 
+@timed()
 def region_growth_analysis(df):
     """
     Compute month-over-month growth rate for each region.
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["YearMonth"] = df["Date"].dt.to_period("M")
+    return _monthly_growth(df, "Growth Rate %")
 
-    monthly_sales = df.groupby(["Region", "YearMonth"])["Units Sold"].sum().reset_index()
 
-    monthly_sales["Growth Rate %"] = (
-        monthly_sales.groupby("Region")["Units Sold"]
-        .pct_change() * 100
-    )
 
-    return monthly_sales
-
-
-
-def region_profitability_analysis(df):
+@timed()
+def region_profitability_analysis(df, product_id=None):
     """
-    Estimate profitability by region.
+    Estimate profitability by region
+    (revenue after discount, cost = 60% of the list price).
+    product_id: restrict to one product (Product × Region rollup).
     """
 
-    # Effective selling price after discount
-    df["Effective Price"] = df["Price"] * (1 - df["Discount"] / 100)
-
-    # Revenue
-    df["Revenue"] = df["Units Sold"] * df["Effective Price"]
+    if product_id is None:
+        region_profit = rollup_totals(df, ("Region",))
+    else:
+        region_profit = rollup_totals(df, ("Product ID", "Region"))
+        region_profit = region_profit[region_profit["Product ID"] == product_id].reset_index(drop=True)
 
-    # Approx cost assumption (60% of original price)
-    df["Estimated Cost"] = df["Units Sold"] * (df["Price"] * 0.6)
-
-    # Profit
-    df["Estimated Profit"] = df["Revenue"] - df["Estimated Cost"]
-
-    region_profit = df.groupby("Region").agg({
-        "Revenue": "sum",
-        "Estimated Profit": "sum",
-        "Units Sold": "sum"
-    }).reset_index()
+    region_profit = region_profit[["Region", "Revenue", "Estimated Profit", "Units Sold"]]
 
     region_profit["Profit Margin %"] = (
         region_profit["Estimated Profit"] /
@@ -123,14 +132,22 @@ def region_profitability_analysis(df):
 
 
 
+@timed()
 def region_demand_volatility(df):
     """
     Measure demand volatility per region.
     Volatility = Standard deviation of Units Sold.
     """
 
-    volatility = df.groupby("Region")["Units Sold"].std().reset_index()
-    volatility.columns = ["Region", "Demand Volatility"]
+    if isinstance(df, AnalyticsSketch):
+        return df.region_demand_volatility()
+
+    totals = rollup_totals(df, ("Region",))
+
+    volatility = pd.DataFrame({
+        "Region": totals["Region"],
+        "Demand Volatility": rollup_std(totals)
+    })
 
     return volatility
 
@@ -139,16 +156,14 @@ def region_demand_volatility(df):
 
 
 
+@timed()
 def region_stock_efficiency(df):
     """
     Measure stock utilization efficiency per region.
     Efficiency = Total Units Sold / Total Inventory Level
     """
 
-    region_eff = df.groupby("Region").agg({
-        "Units Sold": "sum",
-        "Inventory Level": "sum"
-    }).reset_index()
+    region_eff = rollup_totals(df, ("Region",))[["Region", "Units Sold", "Inventory Level"]]
 
     region_eff["Stock Efficiency"] = (
         region_eff["Units Sold"] /
@@ -160,36 +175,32 @@ def region_stock_efficiency(df):
 
 
 
+@timed()
 def region_category_matrix(df):
     """
     Create Region × Category demand matrix.
     Shows total demand per category in each region.
     """
 
-    matrix = df.pivot_table(
-        values="Units Sold",
-        index="Region",
-        columns="Category",
-        aggfunc="sum"
-    )
-
-    return matrix
+    return region_demand_heatmap(df)
 
 
 
+@timed()
 def region_seasonal_index(df):
     """
     Compute monthly seasonal index per region.
     Seasonal Index = Monthly Avg / Overall Avg
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.month
+    monthly = rollup_table(df, ("Region",), "M").reset_index()
+    monthly["Month"] = monthly["Date"].dt.month
 
-    overall_avg = df.groupby("Region")["Units Sold"].mean().reset_index()
-    overall_avg.columns = ["Region", "Overall Avg"]
+    totals = monthly.groupby("Region")[["Units Sold", "Rows"]].sum()
+    overall_avg = (totals["Units Sold"] / totals["Rows"]).rename("Overall Avg").reset_index()
 
-    monthly_avg = df.groupby(["Region", "Month"])["Units Sold"].mean().reset_index()
+    month_totals = monthly.groupby(["Region", "Month"])[["Units Sold", "Rows"]].sum()
+    monthly_avg = (month_totals["Units Sold"] / month_totals["Rows"]).rename("Units Sold").reset_index()
 
     seasonal_index = monthly_avg.merge(overall_avg, on="Region")
 
@@ -203,21 +214,14 @@ def region_seasonal_index(df):
 
 
 
+@timed()
 def region_growth_momentum(df):
     """
     Compute average monthly growth per region.
     Indicates overall growth direction.
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["YearMonth"] = df["Date"].dt.to_period("M")
-
-    monthly_sales = df.groupby(["Region", "YearMonth"])["Units Sold"].sum().reset_index()
-
-    monthly_sales["Growth %"] = (
-        monthly_sales.groupby("Region")["Units Sold"]
-        .pct_change() * 100
-    )
+    monthly_sales = _monthly_growth(df, "Growth %")
 
     momentum = monthly_sales.groupby("Region")["Growth %"].mean().reset_index()
     momentum.columns = ["Region", "Average Growth %"]
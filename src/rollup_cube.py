@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed
+
+
+# dimension combinations kept in the cube ({dims: frequencies}); () is the dataset total.
+# The finest combinations are only queried as totals, so they are kept monthly.
+GROUPINGS = {
+    (): ["D", "M"],
+    ("Category",): ["D", "M"],
+    ("Region",): ["D", "M"],
+    ("Store ID",): ["D", "M"],
+    ("Region", "Category"): ["D", "M"],
+    ("Region", "Store ID"): ["D", "M"],
+    ("Store ID", "Category"): ["M"],
+    ("Product ID", "Region"): ["M"],   # regional view of one product
+}
+
+# finest level without products; every grouping except Product × Region rolls up from it
+BASE = ("Region", "Store ID", "Category")
+
+# additive measures: means and standard deviations are derived from sums and Rows
+MEASURES = ["Units Sold", "Units Squared", "Revenue", "Estimated Profit",
+            "Inventory Level", "Price", "Discount", "Rows"]
+
+
+def row_measures(df):
+    """
+    Additive measures of raw rows: Date (day), the dimension columns
+    and MEASURES (revenue after discount, profit at a 60% cost price).
+    """
+
+    units = df["Units Sold"].values.astype(np.float64)
+    price = df["Price"].values.astype(np.float64)
+    revenue = units * price * (1 - df["Discount"].values / 100)
+
+    rows = pd.DataFrame({
+        "Date": pd.to_datetime(df["Date"]).dt.normalize().values,
+        **{name: df[name].values for name in ["Region", "Store ID", "Category", "Product ID"] if name in df},
+        "Units Sold": units,
+        "Units Squared": units ** 2,
+        "Revenue": revenue,
+        "Estimated Profit": revenue - units * price * 0.6,
+        "Inventory Level": df["Inventory Level"].values.astype(np.float64),
+        "Price": price,
+        "Discount": df["Discount"].values.astype(np.float64),
+        "Rows": 1.0
+    })
+
+    return rows
+
+
+def aggregate(rows, dims, freq="D"):
+    """
+    Sum MEASURES of rows (raw measures or a finer rollup table)
+    per dims × day ("D") or month ("M", dated on the 1st).
+    Index: dims + Date.
+    """
+
+    rows = rows.reset_index() if "Date" not in rows else rows
+    dates = rows["Date"]
+    if freq == "M":
+        dates = pd.Series(dates.values.astype("datetime64[M]").astype("datetime64[ns]"), index=rows.index, name="Date")
+
+    return rows.groupby([rows[dim] for dim in dims] + [dates], sort=True)[MEASURES].sum()
+
+
+def _merge(table, new):
+
+    if table is None:
+        return new
+
+    return table.add(new, fill_value=0).sort_index()
+
+
+class RollupCube:
+    """
+    Daily and monthly aggregates of the sales data per GROUPINGS
+    (a small OLAP cube). Category / region / store analytics read
+    these tables instead of grouping raw rows.
+
+    ingest() adds new rows (e.g. one day of data) to every table;
+    all measures are sums, so updates never touch raw history.
+    Rows must not be ingested twice.
+    """
+
+    def __init__(self, groupings=GROUPINGS):
+
+        self.groupings = {tuple(dims): list(freqs) for dims, freqs in groupings.items()}
+        self.tables = {}     # (dims, freq) → DataFrame indexed by dims + Date
+        self.n_rows = 0
+        self.last_date = None
+
+    def ingest(self, df):
+        """
+        Aggregate new raw rows into every table. Returns the number of rows added.
+        """
+
+        if df.empty:
+            return 0
+
+        rows = row_measures(df)
+        base = aggregate(rows, BASE, "D").reset_index()
+
+        for dims, freqs in self.groupings.items():
+
+            source = base if set(dims) <= set(BASE) else rows
+
+            for freq in freqs:
+                self.tables[dims, freq] = _merge(self.tables.get((dims, freq)), aggregate(source, dims, freq))
+
+        self.n_rows += len(df)
+        last_date = rows["Date"].max()
+        self.last_date = last_date if self.last_date is None else max(self.last_date, last_date)
+
+        return len(df)
+
+    def table(self, dims=(), freq="D"):
+        """
+        Aggregates of one grouping, indexed by dims + Date.
+        """
+
+        return self.tables[tuple(dims), freq]
+
+    def series(self, dims, node, measure="Units Sold", freq="D"):
+        """
+        One node's measure over time, e.g.
+        series(("Category",), "Toys") → daily Units Sold of Toys.
+        """
+
+        node = node if isinstance(node, tuple) else (node,)
+        table = self.table(dims, freq)
+
+        return table.xs(node, level=list(range(len(dims))))[measure] if dims else table[measure]
+
+    def nbytes(self):
+        return int(sum(table.memory_usage(index=True, deep=True).sum() for table in self.tables.values()))
+
+
+@timed()
+def build_rollup_cube(df, groupings=GROUPINGS):
+
+    cube = RollupCube(groupings)
+    cube.ingest(df)
+
+    return cube
+
+
+def rollup_table(source, dims=(), freq="D"):
+    """
+    Aggregates per dims × Date from a RollupCube, or from raw rows
+    (one groupby, for callers without a cube).
+    """
+
+    if isinstance(source, RollupCube):
+        return source.table(dims, freq)
+
+    return aggregate(row_measures(source), dims, freq)
+
+
+def rollup_totals(source, dims):
+    """
+    Whole-period sums per dims (Date summed out), dims as columns.
+    """
+
+    return rollup_table(source, dims, "M").groupby(list(dims), sort=True).sum().reset_index()
+
+
+def rollup_std(table, measure="Units Sold", squares="Units Squared"):
+    """
+    Sample standard deviation of the underlying rows from sums.
+    """
+
+    n = table["Rows"]
+    variance = (table[squares] - table[measure] ** 2 / n) / (n - 1)
+
+    return np.sqrt(variance.clip(lower=0)).where(n > 1)
@@ -1,10 +1,15 @@
 import pandas as pd
-import numpy as np
-from statsmodels.tsa.seasonal import seasonal_decompose
 
+from src.rollup_cube import RollupCube, rollup_table
+from src.sketches import AnalyticsSketch
+from src.instrumentation import timed
 
+
+@timed()
 def time_series_decomposition(df, store_id=None, product_id=None):
 
+    from statsmodels.tsa.seasonal import seasonal_decompose
+
     df["Date"] = pd.to_datetime(df["Date"])
 
     if store_id and product_id:
@@ -25,22 +30,32 @@ def time_series_decomposition(df, store_id=None, product_id=None):
     return decomposition
 
 
+@timed()
 def monthly_seasonal_pattern(df):
+    """
+    Average Units Sold per row for each calendar month
+    (df, RollupCube or AnalyticsSketch).
+    """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.month
+    if isinstance(df, AnalyticsSketch):
+        return df.monthly_seasonal_pattern()
+
+    monthly = rollup_table(df, (), "M").reset_index()
+    monthly["Month"] = monthly["Date"].dt.month
 
-    monthly_pattern = df.groupby("Month")["Units Sold"].mean().reset_index()
+    totals = monthly.groupby("Month")[["Units Sold", "Rows"]].sum()
+    monthly_pattern = (totals["Units Sold"] / totals["Rows"]).rename("Units Sold").reset_index()
 
     return monthly_pattern
 
 
+@timed()
 def quarterly_trend_analysis(df):
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Quarter"] = df["Date"].dt.to_period("Q")
+    monthly = rollup_table(df, (), "M").reset_index()
+    monthly["Quarter"] = monthly["Date"].dt.to_period("Q")
 
-    quarterly_sales = df.groupby("Quarter")["Units Sold"].sum().reset_index()
+    quarterly_sales = monthly.groupby("Quarter")["Units Sold"].sum().reset_index()
     quarterly_sales["Growth %"] = quarterly_sales["Units Sold"].pct_change() * 100
 
     return quarterly_sales
@@ -61,15 +76,14 @@ def seasonality_strength(decomposition):
 
 
 
-def category_decomposition(df, category):
+def _decompose_node(df, dims, node):
     """
-    Perform seasonal decomposition for a specific category.
+    Seasonal decomposition of one node's daily Units Sold total
+    (one value per day; days without sales = 0).
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    cat_df = df[df["Category"] == category].sort_values("Date")
-
-    ts = cat_df.set_index("Date")["Units Sold"]
+    ts = rollup_table(df, dims, "D")["Units Sold"].xs(node, level=dims[0])
+    ts = ts.asfreq("D", fill_value=0)
 
     from statsmodels.tsa.seasonal import seasonal_decompose
 
@@ -82,47 +96,52 @@ def category_decomposition(df, category):
     return decomposition
 
 
-
-
-def region_decomposition(df, region):
+@timed()
+def category_decomposition(df, category):
     """
-    Perform seasonal decomposition for a specific region.
+    Perform seasonal decomposition for a specific category
+    (daily category totals from df or a RollupCube).
     """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    reg_df = df[df["Region"] == region].sort_values("Date")
+    return _decompose_node(df, ("Category",), category)
 
-    ts = reg_df.set_index("Date")["Units Sold"]
 
-    from statsmodels.tsa.seasonal import seasonal_decompose
 
-    decomposition = seasonal_decompose(
-        ts,
-        model="additive",
-        period=30
-    )
 
-    return decomposition
+@timed()
+def region_decomposition(df, region):
+    """
+    Perform seasonal decomposition for a specific region
+    (daily region totals from df or a RollupCube).
+    """
 
+    return _decompose_node(df, ("Region",), region)
 
 
 
 
+
+@timed()
 def long_cycle_trend(df, window=90):
     """
     Detect long-term demand cycles using rolling mean.
-    """
 
-    df["Date"] = pd.to_datetime(df["Date"])
-    df = df.sort_values("Date")
+    Raw rows: rolling mean over `window` rows in date order, as the
+    trend recommendation has always used it. RollupCube: rolling mean
+    over `window` days of the daily average Units Sold per row (one
+    point per day; not the same series, and its direction can differ).
+    """
 
-    ts = df.set_index("Date")["Units Sold"]
+    if isinstance(df, RollupCube):
+        daily = rollup_table(df, (), "D")
+        ts = daily["Units Sold"] / daily["Rows"]
+    else:
+        ts = (
+            df.assign(Date=pd.to_datetime(df["Date"]))
+            .sort_values("Date")
+            .set_index("Date")["Units Sold"]
+        )
 
     long_trend = ts.rolling(window=window).mean()
 
     return long_trend
-
-
-
-
-
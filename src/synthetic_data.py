@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+
+CATEGORIES = ["Groceries", "Toys", "Electronics", "Furniture", "Clothing"]
+REGIONS = ["North", "South", "East", "West"]
+WEATHER = ["Sunny", "Rainy", "Cloudy", "Snowy"]
+SEASONS = np.array(["Winter", "Winter", "Spring", "Spring", "Spring", "Summer",
+                    "Summer", "Summer", "Autumn", "Autumn", "Autumn", "Winter"])
+
+INTERMITTENT_SHARE = 0.1   # series with mostly zero-demand days
+
+
+def generate_retail_data(n_stores=5, n_products=20, n_days=730, start="2022-01-01", seed=0):
+    """
+    Synthetic dataset with the retail_store_inventory.csv schema:
+    n_stores × n_products series over n_days, sorted by Date, Store ID, Product ID.
+
+    Each store has one region and each product one category; demand has a
+    yearly cycle (phase per category), a weekly cycle, a price response,
+    promotion uplift and noise, and a share of series is intermittent.
+    The same arguments always give the same rows.
+    """
+
+    rng = np.random.default_rng(seed)
+    n_series = n_stores * n_products
+    shape = (n_days, n_series)
+
+    dates = pd.date_range(start, periods=n_days, freq="D")
+    stores = np.array([f"S{i + 1:03d}" for i in range(n_stores)])
+    products = np.array([f"P{i + 1:04d}" for i in range(n_products)])
+
+    store_index = np.repeat(np.arange(n_stores), n_products)
+    product_index = np.tile(np.arange(n_products), n_stores)
+    category_index = product_index % len(CATEGORIES)
+
+    # per-series parameters
+    level = rng.lognormal(4.3, 0.5, n_series)
+    base_price = rng.uniform(10, 100, n_series)
+    elasticity = rng.uniform(-1.8, -0.4, n_series)
+    phase = (category_index / len(CATEGORIES) * 2 * np.pi)
+
+    day = np.arange(n_days)[:, None]
+    yearly = 1 + 0.3 * np.sin(2 * np.pi * day / 365.25 + phase)
+    weekly = 1 + 0.1 * np.sin(2 * np.pi * day / 7)
+
+    discount = rng.choice([0, 5, 10, 15, 20], size=shape)
+    promotion = (rng.random(shape) < 0.15).astype(np.int8)
+    price = base_price * (1 + rng.normal(0, 0.05, shape)) * (1 - discount / 100)
+    competitor = price * rng.uniform(0.85, 1.15, shape)
+
+    expected = level * yearly * weekly * (price / base_price) ** elasticity * (1 + 0.25 * promotion)
+    units = rng.poisson(expected)
+
+    intermittent = rng.random(n_series) < INTERMITTENT_SHARE
+    units[:, intermittent] *= rng.random((n_days, intermittent.sum())) < 0.3
+
+    inventory = np.round(expected * rng.uniform(1.0, 5.0, shape)).astype(np.int64)
+
+    months = dates.month.values - 1
+
+    return pd.DataFrame({
+        "Date": np.repeat(dates.strftime("%Y-%m-%d"), n_series),
+        "Store ID": np.tile(stores[store_index], n_days),
+        "Product ID": np.tile(products[product_index], n_days),
+        "Category": np.tile(np.array(CATEGORIES)[category_index], n_days),
+        "Region": np.tile(np.array(REGIONS)[store_index % len(REGIONS)], n_days),
+        "Inventory Level": inventory.ravel(),
+        "Units Sold": units.ravel(),
+        "Units Ordered": rng.integers(20, 200, shape).ravel(),
+        "Demand Forecast": np.round(expected * rng.normal(1, 0.05, shape), 2).ravel(),
+        "Price": np.round(price, 2).ravel(),
+        "Discount": discount.ravel(),
+        "Weather Condition": rng.choice(WEATHER, size=shape).ravel(),
+        "Holiday/Promotion": promotion.ravel(),
+        "Competitor Pricing": np.round(competitor, 2).ravel(),
+        "Seasonality": np.repeat(SEASONS[months], n_series),
+    })
+
+
+def write_synthetic_csv(path, n_stores=5, n_products=20, n_days=730, start="2022-01-01", seed=0):
+    """
+    Generate and save a synthetic CSV; returns the number of rows written.
+    """
+
+    df = generate_retail_data(n_stores, n_products, n_days, start, seed)
+    df.to_csv(path, index=False)
+
+    return len(df)
@@ -13,3 +13,34 @@ def simulate_price_change(current_price, elasticity, change_percent):
         "Estimated Demand Change %": demand_change_percent
     }
 
+
+
+def simulate_price_change_model(model, df, store_id, product_id, change_percent,
+                                forecast_days=7, window_size=30):
+    """
+    Simulate demand impact through the exogenous-feature LSTM:
+    forecast with current covariates vs. with the price changed,
+    instead of applying a fixed elasticity.
+    """
+
+    from src.feature_builder import catalog_features
+    from src.exogenous_model import scenario_forecast
+
+    series = df[(df["Store ID"] == store_id) & (df["Product ID"] == product_id)]
+    catalog = catalog_features(series)
+    key = (store_id, product_id)
+
+    price_factor = 1 + (change_percent / 100)
+
+    baseline = scenario_forecast(model, catalog, [key], forecast_days, window_size)[0]
+    scenario = scenario_forecast(model, catalog, [key], forecast_days, window_size,
+                                 changes={"Price": price_factor})[0]
+
+    current_price = float(series.sort_values("Date")["Price"].iloc[-1])
+
+    return {
+        "New Price": current_price * price_factor,
+        "Estimated Demand Change %": (scenario.sum() / baseline.sum() - 1) * 100,
+        "Baseline Forecast": baseline,
+        "Scenario Forecast": scenario
+    }